@@ -0,0 +1,197 @@
+"""Offline benchmarks for listing, refreshing and bulk branch operations.
+
+Runs the real code paths against synthetic ``gh`` and ``git`` executables
+(see :mod:`fake_cli`) put first on ``PATH``, with ``HOME`` pointed at a
+scratch directory so no real caches are touched. Results are written as
+JSON with median and percentile timings so two runs can be compared::
+
+    python benchmarks/bench.py --output bench_output.txt
+    git checkout other-commit
+    python benchmarks/bench.py --output other.json --compare bench_output.txt
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+ROOT = HERE.parent
+
+
+def _commit() -> str:
+    result = subprocess.run(
+        ["git", "-C", str(ROOT), "rev-parse", "--short", "HEAD"], capture_output=True, text=True
+    )
+    return result.stdout.strip() or "unknown"
+
+
+def _install_shims(directory: Path) -> None:
+    for tool in ("gh", "git"):
+        path = directory / tool
+        path.write_text(
+            f"#!{sys.executable}\n"
+            "import sys\n"
+            f"sys.path.insert(0, {str(HERE)!r})\n"
+            "from fake_cli import main\n"
+            f"sys.exit(main({tool!r}))\n"
+        )
+        path.chmod(0o755)
+
+
+def summarize(samples: list[float]) -> dict[str, float]:
+    """Return median, p90, p99, mean, min and max of ``samples`` (seconds)."""
+    ordered = sorted(samples)
+
+    def percentile(p: float) -> float:
+        index = min(len(ordered) - 1, max(0, round(p / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+    return {
+        "runs": len(ordered),
+        "median": statistics.median(ordered),
+        "p90": percentile(90),
+        "p99": percentile(99),
+        "mean": statistics.fmean(ordered),
+        "min": ordered[0],
+        "max": ordered[-1],
+    }
+
+
+def _time(fn, runs: int) -> dict[str, float]:
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+
+def run_benchmarks(args: argparse.Namespace) -> dict:
+    """Run every benchmark and return the report."""
+    sys.path.insert(0, str(ROOT / "src"))
+    from gh_pr_manager import branch_info, github_client, rate_limit, repo_cache
+    from gh_pr_manager.branch_ops import delete_remote_branches, land_branches
+    from gh_pr_manager.branches import parse_ls_remote
+    from gh_pr_manager.refresh import RefreshPipeline
+
+    github_client.configure_response_cache(enabled=False)
+    # Measure our code, not GitHub's pacing rules.
+    rate_limit.scheduler = rate_limit.RateLimitScheduler(rate=1e9, burst=10**9, write_interval=0)
+    repo = "bench-org/repo-00000"
+    branch_names = [f"feature/topic-{n:05d}" for n in range(1, args.bulk + 1)]
+    ls_remote_output = "".join(
+        f"{n:040x}\trefs/heads/branch-{n}\n" for n in range(args.branches)
+    )
+
+    benchmarks = {
+        "get_repos.parallel": lambda: github_client.get_repos("bench-org"),
+        "get_repos.sequential": lambda: github_client.get_repos("bench-org", max_workers=1),
+        "refresh.ls_remote": lambda: RefreshPipeline(repo).run(),
+        "parse.ls_remote": lambda: parse_ls_remote(ls_remote_output),
+    }
+    results = {name: _time(fn, args.runs) for name, fn in benchmarks.items()}
+
+    clone = repo_cache.clone_path(repo)
+    clone.mkdir(parents=True, exist_ok=True)
+    branch_info.git_supports_ahead_behind.cache_clear()
+    results["refresh.cached_clone"] = _time(lambda: RefreshPipeline(repo).run(), args.runs)
+
+    def count_branches(git_version: str):
+        os.environ["BENCH_GIT_VERSION"] = git_version
+        branch_info.git_supports_ahead_behind.cache_clear()
+        (clone / branch_info._CACHE_FILE).unlink(missing_ok=True)
+        return branch_info.scan_branches(clone, "main")
+
+    results["branches.counts"] = _time(lambda: count_branches("2.45.0"), args.runs)
+    # Before git 2.41 there is no ahead-behind atom; exercise the fallback.
+    results["branches.counts_git_2.39"] = _time(lambda: count_branches("2.39.0"), args.runs)
+    os.environ.pop("BENCH_GIT_VERSION")
+    branch_info.git_supports_ahead_behind.cache_clear()
+    results["bulk.delete"] = _time(lambda: delete_remote_branches(clone, branch_names), args.runs)
+    results["bulk.land"] = _time(lambda: land_branches(branch_names, repo=repo, path=clone), args.runs)
+
+    return {
+        "meta": {
+            "commit": args.commit,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "params": {
+                "repos": args.repos,
+                "branches": args.branches,
+                "history": args.history,
+                "bulk": args.bulk,
+                "latency_ms": args.latency_ms,
+                "runs": args.runs,
+            },
+        },
+        "results": results,
+    }
+
+
+def compare(report: dict, baseline: dict) -> str:
+    """Return a table of median changes of ``report`` relative to ``baseline``."""
+    lines = [f"{'benchmark':<24}{'baseline':>12}{'current':>12}{'change':>10}"]
+    for name, current in report["results"].items():
+        before = baseline.get("results", {}).get(name)
+        if before is None:
+            lines.append(f"{name:<24}{'-':>12}{current['median'] * 1000:>10.1f}ms{'new':>10}")
+            continue
+        change = (current["median"] - before["median"]) / before["median"] * 100 if before["median"] else 0.0
+        lines.append(
+            f"{name:<24}{before['median'] * 1000:>10.1f}ms{current['median'] * 1000:>10.1f}ms{change:>+9.1f}%"
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repos", type=int, default=2000, help="repositories per owner")
+    parser.add_argument("--branches", type=int, default=20000, help="branches per repository")
+    parser.add_argument("--history", type=int, default=10000, help="commits on the default branch")
+    parser.add_argument("--bulk", type=int, default=300, help="branches per bulk operation")
+    parser.add_argument("--latency-ms", type=int, default=20, help="simulated network latency")
+    parser.add_argument("--runs", type=int, default=5, help="repetitions per benchmark")
+    parser.add_argument("--output", default="bench_output.txt", help="where to write the JSON report")
+    parser.add_argument("--compare", help="earlier report to compare medians against")
+    args = parser.parse_args(argv)
+    args.commit = _commit()
+
+    with tempfile.TemporaryDirectory(prefix="gh-pr-bench-") as scratch:
+        scratch_path = Path(scratch)
+        shims = scratch_path / "bin"
+        shims.mkdir()
+        _install_shims(shims)
+        os.environ.update({
+            "HOME": str(scratch_path / "home"),
+            "PATH": f"{shims}{os.pathsep}{os.environ.get('PATH', '')}",
+            "BENCH_REPOS": str(args.repos),
+            "BENCH_BRANCHES": str(args.branches),
+            "BENCH_HISTORY": str(args.history),
+            "BENCH_LATENCY_MS": str(args.latency_ms),
+        })
+        for name in ("GH_TOKEN", "GITHUB_TOKEN"):
+            os.environ.pop(name, None)
+        report = run_benchmarks(args)
+
+    Path(args.output).write_text(json.dumps(report, indent=2) + "\n")
+    for name, stats in report["results"].items():
+        print(
+            f"{name:<24} median {stats['median'] * 1000:8.1f}ms  "
+            f"p90 {stats['p90'] * 1000:8.1f}ms  p99 {stats['p99'] * 1000:8.1f}ms"
+        )
+    if args.compare:
+        print()
+        print(compare(report, json.loads(Path(args.compare).read_text())))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,219 @@
+"""Synthetic ``gh`` and ``git`` used by the benchmarks.
+
+:mod:`bench` writes small ``gh`` and ``git`` executables that call
+:func:`main`. Data sizes and latency come from the environment:
+
+``BENCH_REPOS``
+    repositories per owner (default 2000)
+``BENCH_BRANCHES``
+    branches per repository (default 20000)
+``BENCH_HISTORY``
+    commits on ``main`` (default 10000)
+``BENCH_LATENCY_MS``
+    delay added to every command that would touch the network (default 0)
+``BENCH_GIT_VERSION``
+    version reported by ``git version`` (default 2.45.0)
+"""
+
+import json
+import os
+import re
+import sys
+import time
+
+PER_PAGE = 100
+
+
+def _env_int(name, default):
+    return int(os.environ.get(name, default))
+
+
+def _network_delay():
+    latency = _env_int("BENCH_LATENCY_MS", 0)
+    if latency:
+        time.sleep(latency / 1000)
+
+
+def _sha(n):
+    return f"{n:040x}"
+
+
+def _branch(n):
+    return "main" if n == 0 else f"feature/topic-{n:05d}"
+
+
+# -- history ----------------------------------------------------------------
+#
+# ``main`` is a chain of BENCH_HISTORY commits whose head is _sha(1). Branch n
+# forks off it at a depth that varies with n and adds 1 to 5 commits, the
+# last one being its head _sha(n + 1). Other commits get SHAs in two ranges
+# above every head so they can be decoded again.
+
+_MAIN = 1 << 100
+_TOPIC = 2 << 100
+
+
+def _main_commit(depth):
+    return _sha(1) if depth == 0 else _sha(_MAIN + depth)
+
+
+def _fork_depth(n):
+    return n * 7919 % _env_int("BENCH_HISTORY", 10000)
+
+
+def _topic_commits(n):
+    """Commits of branch ``n``, head first."""
+    return [_sha(n + 1)] + [_sha(_TOPIC + n * 8 + i) for i in range(1, 1 + n % 5)]
+
+
+def _depth(sha):
+    """Return the depth on ``main`` where ``sha`` joins it."""
+    value = int(sha, 16)
+    if value >= _MAIN:
+        return value - _MAIN if value < _TOPIC else _fork_depth((value - _TOPIC) // 8)
+    return 0 if value == 1 else _fork_depth(value - 1)
+
+
+def _rev_list(tips, stop):
+    """Print the commits of ``tips`` above ``stop`` with parents, children first."""
+    history = _env_int("BENCH_HISTORY", 10000)
+    bottom = min([history, *(_depth(sha) for sha in stop)])
+    lines = []
+    for sha in tips:
+        n = int(sha, 16) - 1
+        if 0 < n < _MAIN:
+            commits = _topic_commits(n) + [_main_commit(_fork_depth(n))]
+            lines += [f"{c} {p}" for c, p in zip(commits, commits[1:])]
+    for depth in range(min(_depth(sha) for sha in tips), bottom):
+        parent = f" {_main_commit(depth + 1)}" if depth + 1 < history else ""
+        lines.append(_main_commit(depth) + parent)
+    sys.stdout.write("".join(line + "\n" for line in lines))
+
+
+# -- gh ---------------------------------------------------------------------
+
+
+def _include(body, headers=(), status="200 OK"):
+    lines = [f"HTTP/2.0 {status}", "Content-Type: application/json"]
+    lines += [f"{name}: {value}" for name, value in headers]
+    lines += [
+        "X-Ratelimit-Limit: 5000",
+        "X-Ratelimit-Remaining: 4999",
+        f"X-Ratelimit-Reset: {int(time.time()) + 3600}",
+    ]
+    return "\r\n".join(lines) + "\r\n\r\n" + json.dumps(body)
+
+
+def _gh_api(args):
+    # The path is the first argument that is neither a flag nor a flag's value.
+    values = {i + 1 for i, a in enumerate(args) if a in ("-f", "-F", "-H", "--method", "-X")}
+    path = next(a for i, a in enumerate(args) if not a.startswith("-") and i not in values)
+    repos = _env_int("BENCH_REPOS", 2000)
+    if path == "graphql":
+        return _include({"data": {"repository": {"pullRequests": {
+            "pageInfo": {"hasNextPage": False, "endCursor": None}, "nodes": []}}}})
+    if path == "user":
+        return _include({"login": "bench", "public_repos": repos, "owned_private_repos": 0})
+    if path == "user/orgs":
+        return _include([{"login": "bench-org"}])
+    match = re.match(r"(?:user|users/([^/?]+))/repos\?per_page=100&page=(\d+)", path)
+    if match:
+        owner = match.group(1) or "bench"
+        page = int(match.group(2))
+        last = max(1, -(-repos // PER_PAGE))
+        start = (page - 1) * PER_PAGE
+        names = [f"{owner}/repo-{i:05d}" for i in range(start, min(start + PER_PAGE, repos))]
+        link = f'<https://api.github.com/{path.split("?")[0]}?per_page=100&page={last}>; rel="last"'
+        return _include([{"full_name": name} for name in names], [("Link", link)])
+    if path.startswith("users/"):
+        return _include({"login": path.split("/")[1], "public_repos": repos})
+    return None
+
+
+def gh(args):
+    if args[:2] == ["auth", "token"]:
+        print("bench-token")
+        return 0
+    _network_delay()
+    if args[:1] == ["api"]:
+        output = _gh_api(args[1:])
+        if output is None:
+            sys.stderr.write("gh: Not Found (HTTP 404)\n")
+            return 1
+        sys.stdout.write(output)
+        return 0
+    if args[:2] in (["pr", "create"], ["pr", "merge"]):
+        return 0
+    sys.stderr.write(f"fake gh: unsupported {args}\n")
+    return 1
+
+
+# -- git --------------------------------------------------------------------
+
+
+def _for_each_ref(fmt):
+    count = _env_int("BENCH_BRANCHES", 20000)
+    now = int(time.time())
+    fmt = fmt.replace("%09", "\t")
+    lines = []
+    for n in range(count):
+        fields = {
+            "objectname": _sha(n + 1),
+            "refname:lstrip=3": _branch(n),
+            "committerdate:unix": str(now - n * 3600),
+            "authorname": f"Author {n % 50}",
+        }
+        line = re.sub(r"%\(ahead-behind:[^)]*\)", f"{n % 7} {n % 11}", fmt)
+        line = re.sub(r"%\(([^)]+)\)", lambda m: fields.get(m.group(1), ""), line)
+        lines.append(line)
+    return "\n".join(lines) + "\n"
+
+
+def git(args):
+    while args[:1] == ["-c"]:
+        args = args[2:]
+    if args[:1] == ["-C"]:
+        args = args[2:]
+    command = args[0] if args else ""
+    if command == "version":
+        print(f"git version {os.environ.get('BENCH_GIT_VERSION', '2.45.0')}")
+        return 0
+    if command == "ls-remote":
+        _network_delay()
+        count = _env_int("BENCH_BRANCHES", 20000)
+        sys.stdout.write("".join(f"{_sha(n + 1)}\trefs/heads/{_branch(n)}\n" for n in range(count)))
+        return 0
+    if command in ("fetch", "init", "remote", "config", "update-ref"):
+        if command == "fetch":
+            _network_delay()
+        return 0
+    if command == "for-each-ref":
+        fmt = next(a.split("=", 1)[1] for a in args if a.startswith("--format="))
+        merged = any(a.startswith("--merged") for a in args)
+        output = _for_each_ref(fmt)
+        if merged:
+            output = "".join(line + "\n" for i, line in enumerate(output.splitlines()) if i % 3 == 0)
+        sys.stdout.write(output)
+        return 0
+    if command == "merge-base":
+        # Every branch forks off main, so the oldest fork point is common to all.
+        print(_main_commit(max(_depth(sha) for sha in args[1:] if not sha.startswith("-"))))
+        return 0
+    if command == "rev-list":
+        revs = [a for a in args[1:] if not a.startswith("-")]
+        if "--stdin" in args:
+            revs += sys.stdin.read().split()
+        tips = [r for r in revs if not r.startswith("^")]
+        _rev_list(tips, [r[1:] for r in revs if r.startswith("^")])
+        return 0
+    if command == "push":
+        _network_delay()
+        branches = args[args.index("--delete") + 1:]
+        sys.stderr.write("".join(f" - [deleted]         {b}\n" for b in branches))
+        return 0
+    sys.stderr.write(f"fake git: unsupported {args}\n")
+    return 1
+
+
+def main(tool):
+    return {"gh": gh, "git": git}[tool](sys.argv[1:])
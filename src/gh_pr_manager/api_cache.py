@@ -0,0 +1,116 @@
+"""Persistent on-disk cache of GitHub REST responses keyed by API path.
+
+Entries keep the ``ETag``/``Last-Modified`` validators of the original
+response so callers can replay them as conditional request headers. A
+``304 Not Modified`` answer does not count against the GitHub rate limit.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Optional, Union
+
+#: Entries older than this many seconds are dropped instead of revalidated.
+DEFAULT_MAX_AGE = 7 * 24 * 60 * 60
+#: Total size of the cache directory before least recently used entries go.
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+
+
+def default_cache_dir() -> Path:
+    """Return the default directory for cached API responses."""
+    return Path.home() / ".cache" / "gh_pr_manager" / "api"
+
+
+@dataclass
+class CachedResponse:
+    """A stored API response body together with its validators."""
+
+    body: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    link: Optional[str] = None
+    stored_at: float = 0.0
+
+    def conditional_headers(self) -> list[str]:
+        """Return ``Name: value`` headers that revalidate this entry."""
+        if self.etag:
+            return [f"If-None-Match: {self.etag}"]
+        if self.last_modified:
+            return [f"If-Modified-Since: {self.last_modified}"]
+        return []
+
+
+class ResponseCache:
+    """Size-bounded directory of :class:`CachedResponse` JSON files."""
+
+    def __init__(
+        self,
+        directory: Union[str, Path, None] = None,
+        max_age: float = DEFAULT_MAX_AGE,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        self.directory = Path(directory) if directory else default_cache_dir()
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+
+    def _file(self, path: str) -> Path:
+        digest = hashlib.sha256(path.encode()).hexdigest()
+        return self.directory / f"{digest}.json"
+
+    def get(self, path: str) -> Optional[CachedResponse]:
+        """Return the entry for ``path`` or ``None`` if missing or expired."""
+        file = self._file(path)
+        try:
+            entry = CachedResponse(**json.loads(file.read_text()))
+        except (OSError, ValueError, TypeError):
+            return None
+        if time.time() - entry.stored_at > self.max_age:
+            file.unlink(missing_ok=True)
+            return None
+        try:
+            os.utime(file)  # mark as recently used for eviction
+        except OSError:
+            pass
+        return entry
+
+    def put(self, path: str, entry: CachedResponse) -> None:
+        """Store ``entry`` for ``path`` and evict old entries if over budget."""
+        entry.stored_at = time.time()
+        file = self._file(path)
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp = file.with_suffix(".tmp")
+            tmp.write_text(json.dumps(asdict(entry)))
+            os.replace(tmp, file)
+        except OSError:
+            return
+        self.evict()
+
+    def touch(self, path: str, entry: CachedResponse) -> None:
+        """Record that ``entry`` was just revalidated by a 304 response."""
+        self.put(path, entry)
+
+    def evict(self) -> None:
+        """Delete least recently used entries until under ``max_bytes``."""
+        try:
+            files = [(f, f.stat()) for f in self.directory.glob("*.json")]
+        except OSError:
+            return
+        total = sum(st.st_size for _, st in files)
+        if total <= self.max_bytes:
+            return
+        for file, st in sorted(files, key=lambda item: item[1].st_mtime):
+            if total <= self.max_bytes:
+                break
+            file.unlink(missing_ok=True)
+            total -= st.st_size
+
+    def clear(self) -> None:
+        """Remove every cached entry."""
+        for file in self.directory.glob("*.json"):
+            file.unlink(missing_ok=True)
@@ -0,0 +1,233 @@
+"""Per-branch metadata read from a cached clone in one ``for-each-ref`` pass.
+
+Commit date and author come straight from format atoms. Ahead/behind counts
+against the default branch use ``%(ahead-behind:...)`` where git supports it
+(2.41+). Older versions count the branches whose head is not in the cache
+yet in one batched pass: a single ``git rev-list --parents`` lists the
+commits above their common ancestor and one walk over that listing counts
+all branches at once.
+Counts are cached per (branch sha, base sha) in the clone, so unchanged
+branches are never recomputed.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, Optional, Union
+
+from . import tracing, utils
+
+#: Sort orders understood by :func:`sort_branches`, in cycling order.
+SORT_KEYS = ("name", "date", "ahead", "behind")
+
+_FIELDS = "%(objectname)%09%(refname:lstrip=3)%09%(committerdate:unix)%09%(authorname)"
+_CACHE_FILE = "gh_pr_manager-ahead-behind.json"
+
+
+@dataclass(frozen=True)
+class BranchInfo:
+    """Last commit and divergence from the default branch of one branch."""
+
+    name: str
+    sha: str
+    committed_at: int = 0
+    author: str = ""
+    ahead: Optional[int] = None
+    behind: Optional[int] = None
+
+    def describe(self) -> str:
+        """Return e.g. ``"2025-01-31 Jane Doe +3/-12"``."""
+        date = datetime.fromtimestamp(self.committed_at, timezone.utc).strftime("%Y-%m-%d")
+        text = f"{date} {self.author}"
+        if self.ahead is not None and self.behind is not None:
+            text += f" +{self.ahead}/-{self.behind}"
+        return text
+
+
+@lru_cache(maxsize=1)
+def git_supports_ahead_behind() -> bool:
+    """Whether the installed git has the ``%(ahead-behind:...)`` atom."""
+    success, output = utils.run_cmd(["git", "version"])
+    match = re.search(r"(\d+)\.(\d+)", output) if success else None
+    return bool(match) and (int(match.group(1)), int(match.group(2))) >= (2, 41)
+
+
+def _load_cache(path: Path) -> dict[str, list[int]]:
+    try:
+        return json.loads((path / _CACHE_FILE).read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_cache(path: Path, cache: dict[str, list[int]]) -> None:
+    try:
+        tmp = path / f"{_CACHE_FILE}.tmp"
+        tmp.write_text(json.dumps(cache))
+        os.replace(tmp, path / _CACHE_FILE)
+    except OSError:
+        pass
+
+
+def default_base(names: Iterable[str]) -> Optional[str]:
+    """Guess the default branch when GitHub did not tell us."""
+    names = set(names)
+    return next((name for name in ("main", "master") if name in names), None)
+
+
+def _find_default_base(path: Path) -> Optional[str]:
+    """Return ``main`` or ``master`` if the clone has that remote branch."""
+    success, output = utils.run_cmd(
+        [
+            "git", "-C", str(path), "for-each-ref", "--format=%(refname:lstrip=3)",
+            "refs/remotes/origin/main", "refs/remotes/origin/master",
+        ]
+    )
+    return default_base(output.split()) if success else None
+
+
+#: Heads per ``git merge-base --octopus`` call, keeping the command line short.
+MERGE_BASE_CHUNK = 500
+
+
+def _common_ancestors(path: Path, base_sha: str, shas: list[str]) -> list[str]:
+    """Return commits that ``base_sha`` and every head in ``shas`` contain.
+
+    Heads are folded in chunks, so the result may lie below the true
+    octopus merge base, which is still safe to stop at. Returns ``[]`` when
+    there is no common ancestor or git failed.
+    """
+    stop = [base_sha]
+    for start in range(0, len(shas), MERGE_BASE_CHUNK):
+        chunk = shas[start:start + MERGE_BASE_CHUNK]
+        success, output = utils.run_cmd(["git", "-C", str(path), "merge-base", "--octopus", *stop, *chunk])
+        stop = output.split() if success else []
+        if not stop:
+            return []
+    return stop
+
+
+@tracing.traced("branches.count", "path")
+def _count_batched(path: Path, base_sha: str, shas: Iterable[str]) -> dict[str, list[int]]:
+    """Return ``{sha: [ahead, behind]}`` against ``base_sha`` in one graph pass.
+
+    ``git rev-list --topo-order`` lists every commit before its parents, so
+    the set of heads containing a commit (a Python int used as a bitset, bit
+    0 for the base) is final when the commit is reached and can be passed on
+    to its parents. Heads are read from stdin rather than the command line.
+    Commits below the common ancestor of all heads are on every side, so
+    they are left out of the listing without changing any count.
+    """
+    shas = sorted(set(shas))
+    if not shas:
+        return {}
+    stop = _common_ancestors(path, base_sha, shas)
+    revs = "\n".join([base_sha, *shas, *(f"^{sha}" for sha in stop)]) + "\n"
+    success, output = utils.run_cmd(
+        ["git", "-C", str(path), "rev-list", "--topo-order", "--parents", "--stdin"], input=revs
+    )
+    if not success:
+        return {}
+    masks = {base_sha: 1}
+    for bit, sha in enumerate(shas, 1):
+        masks[sha] = masks.get(sha, 0) | 1 << bit
+    ahead = [0] * (len(shas) + 1)
+    shared = [0] * (len(shas) + 1)
+    on_base = 0
+    for line in output.splitlines():
+        commit, *parents = line.split()
+        mask = masks.pop(commit, 0)
+        for parent in parents:
+            masks[parent] = masks.get(parent, 0) | mask
+        # Count commits on the base and, per head, those also on or off it.
+        counts = shared if mask & 1 else ahead
+        on_base += mask & 1
+        rest = mask >> 1
+        while rest:
+            low = rest & -rest
+            counts[low.bit_length()] += 1
+            rest ^= low
+    return {sha: [ahead[bit], on_base - shared[bit]] for bit, sha in enumerate(shas, 1)}
+
+
+@tracing.traced("branches.scan", "path", "base")
+def scan_branches(
+    path: Union[str, Path], base: Optional[str] = None, with_counts: bool = True
+) -> Optional[list[BranchInfo]]:
+    """Return :class:`BranchInfo` for every remote branch of the clone at ``path``.
+
+    ``base`` defaults to ``main`` or ``master``. With ``with_counts=False``
+    ahead/behind are left as ``None`` and the call is a single
+    ``for-each-ref``. Returns ``None`` if the ref listing failed.
+    """
+    path = Path(path)
+    atom = with_counts and git_supports_ahead_behind()
+    if atom and base is None:
+        # Resolve the base first so the counts still come from one pass.
+        base = _find_default_base(path)
+        atom = base is not None
+    fmt = _FIELDS + (f"%09%(ahead-behind:refs/remotes/origin/{base})" if atom else "")
+    success, output = utils.run_cmd(
+        ["git", "-C", str(path), "for-each-ref", f"--format={fmt}", "refs/remotes/origin/"]
+    )
+    if not success:
+        return None
+    rows = [line.split("\t") for line in output.splitlines()]
+    rows = [row for row in rows if len(row) >= 4 and row[1] != "HEAD"]
+    base = base or default_base(row[1] for row in rows)
+    base_sha = next((row[0] for row in rows if row[1] == base), None) if with_counts else None
+
+    cache = _load_cache(path) if base_sha is not None else {}
+    computed: dict[str, list[int]] = {}
+    if base_sha is not None and not atom:
+        missing = (row[0] for row in rows if row[0] != base_sha and f"{row[0]}:{base_sha}" not in cache)
+        computed = _count_batched(path, base_sha, missing)
+    fresh: dict[str, list[int]] = {}
+    infos: list[BranchInfo] = []
+    for row in rows:
+        sha, name, date, author = row[:4]
+        counts: Optional[list[int]] = None
+        if base_sha is not None:
+            key = f"{sha}:{base_sha}"
+            if sha == base_sha:
+                counts = [0, 0]
+            elif atom and len(row) > 4:
+                counts = [int(n) for n in row[4].split()]
+            else:
+                counts = cache.get(key) or computed.get(sha)
+            if counts is not None:
+                fresh[key] = counts
+        infos.append(
+            BranchInfo(
+                name=name,
+                sha=sha,
+                committed_at=int(date or 0),
+                author=author,
+                ahead=counts[0] if counts else None,
+                behind=counts[1] if counts else None,
+            )
+        )
+    if with_counts and fresh != cache:
+        # Only keep entries for current heads so the file cannot grow forever.
+        _save_cache(path, fresh)
+    return infos
+
+
+def sort_branches(names: Iterable[str], info: dict[str, BranchInfo], key: str = "name") -> list[str]:
+    """Order ``names`` by ``key``; branches without metadata go last."""
+    names = sorted(names)
+    if key == "name":
+        return names
+    attr = {"date": "committed_at", "ahead": "ahead", "behind": "behind"}[key]
+
+    def value(name: str):
+        meta = info.get(name)
+        number = getattr(meta, attr) if meta else None
+        return (number is None, -(number or 0))
+
+    return sorted(names, key=value)
@@ -0,0 +1,177 @@
+"""Bulk operations on the remote branches of a repository."""
+
+from __future__ import annotations
+
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterable, Optional, Union
+
+from . import rate_limit, tracing, utils
+
+#: Branches removed per ``git push --delete`` invocation.
+DELETE_BATCH_SIZE = 100
+#: Branches landed concurrently by :func:`land_branches`.
+PR_WORKERS = 4
+
+_DELETED_RE = re.compile(r"^\s*-\s+\[deleted\]\s+(\S+)", re.MULTILINE)
+_REJECTED_RE = re.compile(r"^\s*!\s+\[[^\]]+\]\s+(\S+)\s*\((.*)\)", re.MULTILINE)
+_MISSING_RE = re.compile(r"unable to delete '([^']+)': (.*)")
+
+
+@dataclass(frozen=True)
+class BranchResult:
+    """Outcome of an operation on one branch."""
+
+    branch: str
+    ok: bool
+    message: str = ""
+
+
+def parse_push_delete(output: str) -> dict[str, BranchResult]:
+    """Return the per-branch results reported by ``git push --delete``."""
+    results: dict[str, BranchResult] = {}
+    for name in _DELETED_RE.findall(output):
+        results[name] = BranchResult(name, True)
+    for name, reason in _REJECTED_RE.findall(output):
+        results[name] = BranchResult(name, False, reason)
+    for name, reason in _MISSING_RE.findall(output):
+        results[name] = BranchResult(name, False, reason)
+    return results
+
+
+def _delete_batch(path: str, batch: list[str]) -> dict[str, BranchResult]:
+    success, output = utils.run_cmd(["git", "-C", path, "push", "origin", "--delete", *batch])
+    if success:
+        return {name: BranchResult(name, True) for name in batch}
+    results = parse_push_delete(output)
+    missing = {name for name, _ in _MISSING_RE.findall(output)}
+    if missing:
+        # git refuses the whole push when a ref is already gone, so retry
+        # without those branches.
+        rest = [name for name in batch if name not in missing]
+        if rest:
+            results.update(_delete_batch(path, rest))
+    for name in batch:
+        results.setdefault(name, BranchResult(name, False, output))
+    return results
+
+
+@tracing.traced("branch_ops.delete", "path")
+def delete_remote_branches(
+    path: Union[str, Path], branches: Iterable[str], batch_size: int = DELETE_BATCH_SIZE
+) -> list[BranchResult]:
+    """Delete ``branches`` from ``origin`` of the clone at ``path``.
+
+    Branches are removed ``batch_size`` at a time with one ``git push``
+    each. Results are returned in the order of ``branches``.
+    """
+    names = list(dict.fromkeys(branches))
+    results: dict[str, BranchResult] = {}
+    for start in range(0, len(names), batch_size):
+        results.update(_delete_batch(str(path), names[start : start + batch_size]))
+    return [results[name] for name in names]
+
+
+def summarize(results: list[BranchResult], verb: str = "Deleted") -> str:
+    """Return a one-line report such as ``"Deleted 3; 1 failed: x (reason)"``."""
+    done = [r.branch for r in results if r.ok]
+    failed = [r for r in results if not r.ok]
+    if len(results) == 1:
+        r = results[0]
+        return f"{verb} {r.branch}" if r.ok else f"{verb} failed for {r.branch}: {r.message}"
+    text = f"{verb} {len(done)} branch(es)"
+    if failed:
+        details = ", ".join(f"{r.branch} ({r.message})" for r in failed[:5])
+        more = f" and {len(failed) - 5} more" if len(failed) > 5 else ""
+        text += f"; {len(failed)} failed: {details}{more}"
+    return text
+
+
+def _gh_pr(args: list[str], repo: Optional[str], cwd) -> tuple[bool, str]:
+    cmd = ["gh", "pr", *args]
+    if repo:
+        cmd += ["--repo", repo]
+    # Creating and merging PRs are writes, which GitHub wants spaced out.
+    return rate_limit.scheduler.call(lambda: utils.run_cmd(cmd, cwd=cwd), "graphql", write=True)
+
+
+@tracing.traced("branch_ops.land", "branch", "repo")
+def land_branch(
+    branch: str,
+    repo: Optional[str] = None,
+    path: Union[str, Path, None] = None,
+    base: Optional[str] = None,
+    merge_lock: Optional[threading.Lock] = None,
+    progress: Optional[Callable[[str, str], None]] = None,
+) -> BranchResult:
+    """Open a PR for ``branch``, merge it and delete the branch.
+
+    ``repo`` is ``owner/name``; without it ``gh`` infers the repository
+    from ``path``. Title and body come from the commits when there is a
+    clone at ``path``, else they are set explicitly. ``merge_lock``
+    serializes merges into the same base.
+    ``progress(branch, stage)`` is called as the chain advances.
+    """
+    report = progress or (lambda branch, stage: None)
+    report(branch, "creating PR")
+    args = ["create", "--head", branch]
+    # --fill reads the commits from a local checkout, which we may not have.
+    args += ["--fill"] if path is not None else ["--title", branch, "--body", "Automated PR"]
+    args += ["--base", base] if base else []
+    success, output = _gh_pr(args, repo, path)
+    if not success and "already exists" not in output:
+        report(branch, "create failed")
+        return BranchResult(branch, False, f"create: {output}")
+
+    report(branch, "waiting to merge" if merge_lock else "merging")
+    with merge_lock or nullcontext():
+        report(branch, "merging")
+        success, output = _gh_pr(["merge", branch, "--merge", "--delete-branch"], repo, path)
+    if not success:
+        report(branch, "merge failed")
+        return BranchResult(branch, False, f"merge: {output}")
+
+    if path is not None:
+        # The branch is gone on GitHub; drop its remote-tracking ref too.
+        report(branch, "cleaning up")
+        success, output = utils.run_cmd(
+            ["git", "-C", str(path), "update-ref", "-d", f"refs/remotes/origin/{branch}"]
+        )
+        if not success:
+            report(branch, "cleanup failed")
+            return BranchResult(branch, False, f"cleanup: {output}")
+    report(branch, "merged")
+    return BranchResult(branch, True)
+
+
+@tracing.traced("branch_ops.land_all", "repo")
+def land_branches(
+    branches: Iterable[str],
+    repo: Optional[str] = None,
+    path: Union[str, Path, None] = None,
+    base: Optional[str] = None,
+    max_workers: int = PR_WORKERS,
+    progress: Optional[Callable[[str, str], None]] = None,
+) -> list[BranchResult]:
+    """Run :func:`land_branch` for every branch with bounded concurrency.
+
+    PRs are created in parallel while their merges into ``base`` (default:
+    the repository default branch) run one at a time.
+    A failing branch does not stop the others. Results keep the order of
+    ``branches``.
+    """
+    names = list(dict.fromkeys(branches))
+    merge_lock = threading.Lock()
+
+    def land(name: str) -> BranchResult:
+        try:
+            return land_branch(name, repo, path, base, merge_lock, progress)
+        except Exception as exc:  # keep going past unexpected errors
+            return BranchResult(name, False, str(exc))
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(names) or 1))) as pool:
+        return list(pool.map(tracing.propagate(land), names))
@@ -0,0 +1,61 @@
+"""Listing the branches of a GitHub repository without a local clone."""
+
+from __future__ import annotations
+
+from typing import Optional
+
+from . import rate_limit, tracing, utils
+from .repo_cache import GH_CREDENTIAL_ARGS, remote_url
+
+#: Backends understood by :func:`list_remote_branches`, tried in order.
+BACKENDS = ("ls-remote", "api")
+
+
+def parse_ls_remote(output: str) -> dict[str, str]:
+    """Parse ``git ls-remote --heads`` output into ``{branch: sha}``."""
+    heads: dict[str, str] = {}
+    for line in output.splitlines():
+        sha, _, ref = line.strip().partition("\t")
+        if ref.startswith("refs/heads/"):
+            heads[ref[len("refs/heads/"):]] = sha
+    return heads
+
+
+def _list_with_ls_remote(repo: str) -> Optional[dict[str, str]]:
+    # Let gh supply credentials so private repositories work without
+    # 'gh auth setup-git' having been run.
+    cmd = ["git", *GH_CREDENTIAL_ARGS, "ls-remote", "--heads", remote_url(repo)]
+    success, output = utils.run_cmd(cmd)
+    return parse_ls_remote(output) if success else None
+
+
+def _list_with_api(repo: str) -> Optional[dict[str, str]]:
+    cmd = [
+        "gh", "api", "--paginate", f"repos/{repo}/branches?per_page=100",
+        "--jq", '.[] | "\\(.commit.sha)\\t\\(.name)"',
+    ]
+    success, output = rate_limit.scheduler.call(lambda: utils.run_cmd(cmd))
+    if not success:
+        return None
+    heads: dict[str, str] = {}
+    for line in output.splitlines():
+        sha, _, name = line.strip().partition("\t")
+        if name:
+            heads[name] = sha
+    return heads
+
+
+@tracing.traced("branches.list_remote", "repo", "backend")
+def list_remote_branches(repo: str, backend: Optional[str] = None) -> Optional[dict[str, str]]:
+    """Return ``{branch: head sha}`` for ``repo`` without cloning it.
+
+    ``backend`` is ``"ls-remote"`` or ``"api"``; by default each of
+    :data:`BACKENDS` is tried until one succeeds. Returns ``None`` if every
+    backend failed.
+    """
+    listers = {"ls-remote": _list_with_ls_remote, "api": _list_with_api}
+    for name in (backend,) if backend else BACKENDS:
+        heads = listers[name](repo)
+        if heads is not None:
+            return heads
+    return None
@@ -1,56 +1,523 @@
+"""Utilities for interacting with GitHub via the ``gh`` CLI."""
+
 from __future__ import annotations
 
-"""Utilities for interacting with GitHub via the ``gh`` CLI."""
+import json
+import logging
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Iterator, Optional
+from . import rate_limit, tracing
+from .api_cache import CachedResponse, ResponseCache
+from .http_backend import HTTPBackend
+from .session import GitHubSession, SessionState
+from .utils import run_cmd_combined
+
+_NOT_MODIFIED_RE = re.compile(r"HTTP\S*\s+304\b")
+#: Failures meaning GitHub refused the token rather than being unreachable.
+_REJECTED_RE = re.compile(r"Bad credentials|HTTP 401|gh auth login|not logged in", re.IGNORECASE)
+_LAST_PAGE_RE = re.compile(r"[?&]page=(\d+)[^>]*>;\s*rel=\"last\"")
+
+#: Default number of threads :func:`get_repos` uses to fetch pages.
+PAGE_WORKERS = 4
+
+_REPOS_QUERY = """
+query($owner: String!, $cursor: String) {
+  repositoryOwner(login: $owner) {
+    repositories(first: 100, after: $cursor, orderBy: {field: PUSHED_AT, direction: DESC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        nameWithOwner
+        name
+        isArchived
+        pushedAt
+        defaultBranchRef { name }
+        pullRequests(states: OPEN) { totalCount }
+      }
+    }
+  }
+}
+"""
+
+
+_PULLS_QUERY = """
+query($owner: String!, $name: String!, $cursor: String) {
+  repository(owner: $owner, name: $name) {
+    pullRequests(first: 100, after: $cursor, states: OPEN) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        number
+        headRefName
+        isCrossRepository
+        state
+        isDraft
+        reviewDecision
+        commits(last: 1) { nodes { commit { statusCheckRollup { state } } } }
+      }
+    }
+  }
+}
+"""
+
+_MERGED_PULLS_QUERY = """
+query($owner: String!, $name: String!, $cursor: String) {
+  repository(owner: $owner, name: $name) {
+    pullRequests(first: 100, after: $cursor, states: MERGED, orderBy: {field: UPDATED_AT, direction: DESC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes { headRefName headRefOid isCrossRepository updatedAt }
+    }
+  }
+}
+"""
+
+_CHECK_TEXT = {
+    "SUCCESS": "checks passing",
+    "FAILURE": "checks failing",
+    "ERROR": "checks failing",
+    "PENDING": "checks running",
+    "EXPECTED": "checks running",
+}
+_REVIEW_TEXT = {
+    "APPROVED": "approved",
+    "CHANGES_REQUESTED": "changes requested",
+    "REVIEW_REQUIRED": "review required",
+}
+
+
+@dataclass(frozen=True)
+class RepoRecord:
+    """Summary of a repository as returned by :func:`get_repo_records`."""
+
+    full_name: str
+    name: str
+    default_branch: Optional[str] = None
+    pushed_at: Optional[str] = None
+    open_pr_count: int = 0
+    archived: bool = False
+
+    @classmethod
+    def from_node(cls, node: dict[str, Any]) -> "RepoRecord":
+        """Build a record from a GraphQL ``Repository`` node."""
+        default_ref = node.get("defaultBranchRef") or {}
+        pull_requests = node.get("pullRequests") or {}
+        return cls(
+            full_name=node["nameWithOwner"],
+            name=node["name"],
+            default_branch=default_ref.get("name"),
+            pushed_at=node.get("pushedAt"),
+            open_pr_count=pull_requests.get("totalCount", 0),
+            archived=bool(node.get("isArchived")),
+        )
+
+
+@dataclass(frozen=True)
+class PullStatus:
+    """State of the open pull request for a branch."""
+
+    branch: str
+    number: int
+    state: str = "OPEN"
+    review_decision: Optional[str] = None
+    checks: Optional[str] = None
+    draft: bool = False
+
+    @classmethod
+    def from_node(cls, node: dict[str, Any]) -> "PullStatus":
+        """Build a status from a GraphQL ``PullRequest`` node."""
+        commits = (node.get("commits") or {}).get("nodes") or []
+        rollup = (commits[-1].get("commit") or {}).get("statusCheckRollup") if commits else None
+        return cls(
+            branch=node["headRefName"],
+            number=node["number"],
+            state=node.get("state") or "OPEN",
+            review_decision=node.get("reviewDecision"),
+            checks=(rollup or {}).get("state"),
+            draft=bool(node.get("isDraft")),
+        )
+
+    @property
+    def pending(self) -> bool:
+        """Whether checks are still running."""
+        return self.checks in ("PENDING", "EXPECTED")
+
+    def describe(self) -> str:
+        """Return e.g. ``"#12 checks passing, approved"``."""
+        label = f"#{self.number}" + (" draft" if self.draft else "")
+        details = ", ".join(
+            filter(None, (_CHECK_TEXT.get(self.checks or ""), _REVIEW_TEXT.get(self.review_decision or "")))
+        )
+        return f"{label} {details}" if details else label
+
+
+#: Shared response cache; ``None`` disables conditional requests.
+response_cache: Optional[ResponseCache] = ResponseCache()
+
+#: Per repository, the merged PR heads seen so far and the newest ``updatedAt``.
+_merged_heads: dict[str, tuple[str, dict[str, set[str]]]] = {}
+_merged_heads_lock = threading.Lock()
+
+
+def configure_response_cache(
+    enabled: bool = True,
+    max_age: Optional[float] = None,
+    max_bytes: Optional[int] = None,
+    directory: Optional[str] = None,
+) -> None:
+    """Enable, disable or resize the on-disk API response cache."""
+    global response_cache
+    if not enabled:
+        response_cache = None
+        return
+    cache = ResponseCache(directory) if directory else (response_cache or ResponseCache())
+    if max_age is not None:
+        cache.max_age = max_age
+    if max_bytes is not None:
+        cache.max_bytes = max_bytes
+    response_cache = cache
+
+
+#: Backends understood by :func:`configure_backend`.
+BACKENDS = ("gh", "http")
+
+#: Native HTTP backend; ``None`` means requests spawn ``gh api``.
+http_backend: Optional[HTTPBackend] = None
+
+
+def configure_backend(name: str = "gh", **options: Any) -> None:
+    """Select how API requests are sent.
+
+    ``"gh"`` (the default) runs ``gh api`` per request; ``"http"`` uses a
+    pooled keep-alive :class:`HTTPBackend`, to which ``options`` are passed.
+    """
+    global http_backend
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown API backend: {name}")
+    if http_backend is not None:
+        http_backend.close()
+    http_backend = HTTPBackend(**options) if name == "http" else None
+
+
+def _parse_include(output: str) -> tuple[int, dict[str, str], str]:
+    """Split ``gh api --include`` output into status, headers and body."""
+    text = output.replace("\r\n", "\n")
+    head, _, body = text.partition("\n\n")
+    lines = head.splitlines()
+    status = 0
+    if lines:
+        parts = lines[0].split()
+        if len(parts) > 1 and parts[1].isdigit():
+            status = int(parts[1])
+    headers: dict[str, str] = {}
+    for line in lines[1:]:
+        name, sep, value = line.partition(":")
+        if sep:
+            headers[name.strip().lower()] = value.strip()
+    return status, headers, body
+
+
+def _status_and_headers(output: str) -> tuple[int, dict[str, str]]:
+    """Return status and headers of ``--include`` output, if it has them."""
+    if not output.startswith("HTTP/"):
+        return 0, {}
+    status, headers, _ = _parse_include(output)
+    return status, headers
+
+
+def _run_api(cmd: list[str], resource: str = "core", request: Optional[dict[str, Any]] = None) -> tuple[bool, str]:
+    """Send a request through the rate limit scheduler.
+
+    ``cmd`` is the ``gh api`` invocation; ``request`` holds the equivalent
+    :meth:`HTTPBackend.request` arguments used when that backend is active.
+    """
+    if http_backend is not None and request is not None:
+        run = partial(http_backend.request, **request)
+    else:
+        # Keep the status line and headers of failed --include calls.
+        run = partial(run_cmd_combined, cmd)
+    return rate_limit.scheduler.call(run, resource, parse=_status_and_headers)
+
+
+@tracing.traced("github.get", "path")
+def _api_get(path: str) -> Optional[CachedResponse]:
+    """GET ``path`` through ``gh api``, revalidating any cached copy.
+
+    Returns ``None`` when the request fails and nothing usable is cached.
+    """
+    return _api_fetch(path)[0]
+
+
+def _api_fetch(path: str) -> tuple[Optional[CachedResponse], str]:
+    """Like :func:`_api_get`, but also return the error output of a failure."""
+    cache = response_cache
+    cached = cache.get(path) if cache else None
+    cmd = ["gh", "api", "--include", path]
+    headers: dict[str, str] = {}
+    for header in cached.conditional_headers() if cached else []:
+        cmd += ["-H", header]
+        name, _, value = header.partition(":")
+        headers[name] = value.strip()
+    success, output = _run_api(cmd, request={"method": "GET", "path": path, "headers": headers})
+    if not success:
+        if cached and _NOT_MODIFIED_RE.search(output):
+            cache.touch(path, cached)
+            return cached, ""
+        return None, output
+    status, headers, body = _parse_include(output)
+    if status == 304 and cached:
+        cache.touch(path, cached)
+        return cached, ""
+    response = CachedResponse(
+        body=body,
+        etag=headers.get("etag"),
+        last_modified=headers.get("last-modified"),
+        link=headers.get("link"),
+    )
+    if cache and (response.etag or response.last_modified):
+        cache.put(path, response)
+    return response, ""
 
-from typing import Optional
-from .utils import run_cmd
+
+def _decode(response: Optional[CachedResponse]) -> Optional[Any]:
+    """Return the decoded JSON body of ``response``, or ``None``."""
+    if response is None:
+        return None
+    try:
+        return json.loads(response.body)
+    except ValueError:
+        return None
+
+
+def _api_get_json(path: str) -> Optional[Any]:
+    """Return the decoded JSON body of ``path``, or ``None`` on error."""
+    return _decode(_api_get(path))
+
+
+@tracing.traced("github.graphql")
+def _graphql(query: str, **variables: Optional[str]) -> Optional[dict[str, Any]]:
+    """Run a GraphQL query through ``gh api graphql`` and return its ``data``.
+
+    ``None`` variables are omitted so they reach the query as ``null``.
+    """
+    cmd = ["gh", "api", "graphql", "--include", "-f", f"query={query}"]
+    for name, value in variables.items():
+        if value is not None:
+            cmd += ["-f", f"{name}={value}"]
+    body = {"query": query, "variables": {k: v for k, v in variables.items() if v is not None}}
+    success, output = _run_api(cmd, "graphql", {"method": "POST", "path": "graphql", "body": body})
+    if not success:
+        return None
+    if output.startswith("HTTP/"):
+        output = _parse_include(output)[2]
+    try:
+        payload = json.loads(output)
+    except ValueError:
+        return None
+    if payload.get("errors") or not isinstance(payload.get("data"), dict):
+        return None
+    return payload["data"]
+
+
+def _resolve_session() -> SessionState:
+    """Query GitHub for the identity cached in :data:`session`.
+
+    A successful ``user`` request proves the token is valid, so no separate
+    ``gh auth status`` round trip is needed. A 401 or a missing login marks
+    the state ``rejected``; other failures may be a flaky network.
+    """
+    response, error = _api_fetch("user")
+    user = _decode(response)
+    if not isinstance(user, dict) or not user.get("login"):
+        rejected = _status_and_headers(error)[0] == 401 or bool(_REJECTED_RE.search(error))
+        return SessionState(rejected=rejected)
+    orgs = _api_get_json("user/orgs")
+    if not isinstance(orgs, list):
+        orgs = []
+    logins = [org["login"].strip() for org in orgs if org.get("login", "").strip()]
+    return SessionState(login=user["login"].strip(), orgs=logins, authenticated=True)
+
+
+#: Identity shared by every entry point in this module.
+session = GitHubSession(_resolve_session)
 
 
 def check_auth_status() -> bool:
     """Return ``True`` if the user is authenticated with the ``gh`` CLI."""
-    success, _ = run_cmd(["gh", "auth", "status"])
-    return success
+    return session.state().authenticated
 
 
 def get_user_login() -> Optional[str]:
     """Return the login of the authenticated GitHub user, or ``None`` on error."""
-    success, output = run_cmd(["gh", "api", "user", "--jq", ".login"])
-    if success:
-        return output.strip()
-    return None
+    return session.state().login
 
 
 def get_user_orgs() -> list[str]:
     """Return a list of organization logins for the current user."""
-    success, output = run_cmd(["gh", "api", "user/orgs", "--jq", ".[].login"])
-    if not success:
-        return []
-    return [line.strip() for line in output.splitlines() if line.strip()]
+    return list(session.state().orgs)
 
 
-def get_repos(owner: str) -> list[str]:
-    """Return a list of repository full names for the given owner."""
-    repos: list[str] = []
-    page = 1
-    import logging
-    logging.basicConfig(filename="org_selector_debug.log", level=logging.INFO, filemode="a")
-    from . import github_client
-    user_login = github_client.get_user_login()
-    while True:
-        if owner == user_login:
+def _last_page(link: Optional[str]) -> Optional[int]:
+    """Return the ``rel="last"`` page number advertised by a ``Link`` header."""
+    match = _LAST_PAGE_RE.search(link or "")
+    return int(match.group(1)) if match else None
+
+
+def _repo_count(owner: str, is_self: bool) -> Optional[int]:
+    """Return how many repositories ``owner`` has, or ``None`` if unknown."""
+    profile = _api_get_json("user" if is_self else f"users/{owner}")
+    if not isinstance(profile, dict) or "public_repos" not in profile:
+        return None
+    return profile["public_repos"] + profile.get("owned_private_repos", 0)
+
+
+@tracing.traced("github.get_repos", "owner")
+def get_repos(owner: str, max_workers: int = PAGE_WORKERS) -> list[str]:
+    """Return a list of repository full names for the given owner.
+
+    The first page tells us how many pages exist (from its ``Link`` header,
+    or failing that the owner's repository count). The remaining pages are
+    then fetched concurrently by up to ``max_workers`` threads and merged in
+    page order. ``max_workers=1`` fetches strictly one page after another.
+    """
+    is_self = owner == get_user_login()
+
+    def fetch_page(page: int) -> tuple[Optional[list[str]], Optional[str]]:
+        if is_self:
             path = f"user/repos?per_page=100&page={page}"
         else:
             path = f"users/{owner}/repos?per_page=100&page={page}"
-        logging.info(f"DEBUG get_repos: fetching {path}")
-        success, output = run_cmd(["gh", "api", path, "--jq", ".[].full_name"]);
-        if not success:
-            logging.info(f"DEBUG get_repos: failed to fetch {path}, output={output!r}")
+        logging.debug("get_repos: fetching %s", path)
+        response = _api_get(path)
+        data = _decode(response)
+        if not isinstance(data, list):
+            logging.warning("get_repos: failed to fetch %s", path)
+            return None, None
+        return [repo["full_name"] for repo in data if repo.get("full_name")], response.link
+
+    def fetch(page: int) -> Optional[list[str]]:
+        return fetch_page(page)[0]
+
+    lines, link = fetch_page(1)
+    if lines is None:
+        return []
+    repos = list(lines)
+    page = 1
+    if len(lines) == 100 and max_workers > 1:
+        last = _last_page(link)
+        if last is None:
+            count = _repo_count(owner, is_self)
+            last = -(-count // 100) if count else None
+        if last and last > 1:
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                for lines in pool.map(tracing.propagate(fetch), range(2, last + 1)):
+                    if lines is None:
+                        return repos
+                    repos.extend(lines)
+                    page += 1
+    # Sequential tail: covers max_workers=1 and stale page estimates.
+    while len(lines) == 100:
+        page += 1
+        lines = fetch(page)
+        if lines is None:
             break
-        lines = [line.strip() for line in output.splitlines() if line.strip()]
         repos.extend(lines)
-        if len(lines) < 100:
-            break
-        page += 1
-    logging.info(f"DEBUG get_repos: found {len(repos)} repos for owner={owner}")
+    logging.debug("get_repos: found %d repos for %s", len(repos), owner)
     return repos
 
+
+def iter_repo_pages(owner: str) -> Iterator[list[RepoRecord]]:
+    """Yield :class:`RepoRecord` pages for ``owner`` as each one arrives.
+
+    Uses one GraphQL round trip per 100 repositories, following the cursor
+    until the last page.
+    """
+    cursor: Optional[str] = None
+    while True:
+        data = _graphql(_REPOS_QUERY, owner=owner, cursor=cursor)
+        owner_node = (data or {}).get("repositoryOwner")
+        if not owner_node:
+            return
+        connection = owner_node["repositories"]
+        yield [RepoRecord.from_node(node) for node in connection["nodes"] if node]
+        page_info = connection["pageInfo"]
+        if not page_info.get("hasNextPage"):
+            return
+        cursor = page_info["endCursor"]
+
+
+def get_repo_records(owner: str) -> list[RepoRecord]:
+    """Return :class:`RepoRecord` entries for every repository of ``owner``."""
+    return [record for page in iter_repo_pages(owner) for record in page]
+
+
+@tracing.traced("github.pull_statuses", "repo")
+def get_pull_statuses(repo: str) -> Optional[dict[str, PullStatus]]:
+    """Return ``{head branch: PullStatus}`` for the open PRs of ``repo``.
+
+    All PRs, review decisions and check rollups come from one paginated
+    GraphQL query. PRs from forks are skipped: their head branch only
+    shares the name with a branch of ``repo``. Returns ``None`` if a
+    request failed.
+    """
+    owner, _, name = repo.partition("/")
+    statuses: dict[str, PullStatus] = {}
+    cursor: Optional[str] = None
+    while True:
+        data = _graphql(_PULLS_QUERY, owner=owner, name=name, cursor=cursor)
+        repo_node = (data or {}).get("repository")
+        if not repo_node:
+            return None
+        connection = repo_node["pullRequests"]
+        for node in connection["nodes"]:
+            if node and not node.get("isCrossRepository"):
+                status = PullStatus.from_node(node)
+                statuses.setdefault(status.branch, status)
+        page_info = connection["pageInfo"]
+        if not page_info.get("hasNextPage"):
+            return statuses
+        cursor = page_info["endCursor"]
+
+
+@tracing.traced("github.merged_pr_heads", "repo")
+def get_merged_pr_heads(repo: str) -> Optional[dict[str, set[str]]]:
+    """Return ``{head branch: {head sha, ...}}`` for merged PRs of ``repo``.
+
+    Squash and rebase merges leave no ancestry link to the branch, but a
+    branch whose head is the head of a merged PR has landed. PRs from forks
+    are skipped. Results are kept per repository; later calls only page
+    through PRs updated since the newest one seen. Returns ``None`` if a
+    request failed.
+    """
+    owner, _, name = repo.partition("/")
+    with _merged_heads_lock:
+        since, known = _merged_heads.get(repo, ("", {}))
+    heads = {branch: set(shas) for branch, shas in known.items()}
+    newest = since
+    cursor: Optional[str] = None
+    while True:
+        data = _graphql(_MERGED_PULLS_QUERY, owner=owner, name=name, cursor=cursor)
+        repo_node = (data or {}).get("repository")
+        if not repo_node:
+            return None
+        connection = repo_node["pullRequests"]
+        caught_up = False
+        for node in connection["nodes"]:
+            if not node:
+                continue
+            updated = node.get("updatedAt") or ""
+            if since and updated < since:
+                # Sorted by updatedAt, so everything from here on is known.
+                caught_up = True
+                break
+            newest = max(newest, updated)
+            if node.get("headRefOid") and not node.get("isCrossRepository"):
+                heads.setdefault(node["headRefName"], set()).add(node["headRefOid"])
+        page_info = connection["pageInfo"]
+        if caught_up or not page_info.get("hasNextPage"):
+            break
+        cursor = page_info["endCursor"]
+    with _merged_heads_lock:
+        _merged_heads[repo] = (newest, heads)
+    return {branch: set(shas) for branch, shas in heads.items()}
@@ -0,0 +1,134 @@
+"""Talking to the GitHub API over pooled keep-alive connections.
+
+An alternative to spawning ``gh api`` for every request: the token is read
+once and requests reuse a small pool of persistent ``http.client``
+connections. Responses are rendered like ``gh api --include`` output, so
+callers parse both backends the same way.
+"""
+
+from __future__ import annotations
+
+import http.client
+import json
+import os
+import queue
+import threading
+from typing import Any, Mapping, Optional
+from urllib.parse import urlsplit
+
+from . import utils
+
+#: Default REST/GraphQL endpoint.
+DEFAULT_BASE_URL = "https://api.github.com"
+#: Idle connections kept per backend.
+DEFAULT_POOL_SIZE = 4
+DEFAULT_TIMEOUT = 30.0
+
+
+def resolve_token() -> Optional[str]:
+    """Return a token from ``GH_TOKEN``/``GITHUB_TOKEN`` or ``gh auth token``."""
+    for name in ("GH_TOKEN", "GITHUB_TOKEN"):
+        if os.environ.get(name):
+            return os.environ[name]
+    success, output = utils.run_cmd(["gh", "auth", "token"])
+    return (output.strip() or None) if success else None
+
+
+class HTTPBackend:
+    """Send GitHub API requests over a pool of keep-alive connections."""
+
+    def __init__(
+        self,
+        base_url: str = DEFAULT_BASE_URL,
+        token: Optional[str] = None,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        timeout: float = DEFAULT_TIMEOUT,
+    ):
+        parts = urlsplit(base_url)
+        self._scheme = parts.scheme
+        self._host = parts.hostname or ""
+        self._port = parts.port
+        self._prefix = parts.path.rstrip("/")
+        self._timeout = timeout
+        self._token = token
+        self._token_lock = threading.Lock()
+        self._pool: "queue.LifoQueue[http.client.HTTPConnection]" = queue.LifoQueue(pool_size)
+
+    @property
+    def token(self) -> Optional[str]:
+        with self._token_lock:
+            if self._token is None:
+                self._token = resolve_token()
+            return self._token
+
+    def _connect(self) -> http.client.HTTPConnection:
+        cls = http.client.HTTPSConnection if self._scheme == "https" else http.client.HTTPConnection
+        return cls(self._host, self._port, timeout=self._timeout)
+
+    def _checkout(self) -> http.client.HTTPConnection:
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            return self._connect()
+
+    def _checkin(self, conn: http.client.HTTPConnection) -> None:
+        try:
+            self._pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def close(self) -> None:
+        """Close every idle connection."""
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                return
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        headers: Optional[Mapping[str, str]] = None,
+        body: Optional[Any] = None,
+    ) -> tuple[bool, str]:
+        """Send a request and return ``(success, gh-api-style --include output)``.
+
+        ``body`` is sent as JSON. Success means a status below 400.
+        """
+        send_headers = {
+            "Accept": "application/vnd.github+json",
+            "User-Agent": "gh-pr-manager",
+        }
+        if self.token:
+            send_headers["Authorization"] = f"Bearer {self.token}"
+        send_headers.update(headers or {})
+        payload = None
+        if body is not None:
+            payload = json.dumps(body).encode()
+            send_headers["Content-Type"] = "application/json"
+        url = f"{self._prefix}/{path.lstrip('/')}"
+
+        retries = 1
+        while True:
+            conn = self._checkout()
+            try:
+                conn.request(method, url, body=payload, headers=send_headers)
+                response = conn.getresponse()
+                data = response.read()
+            except (http.client.HTTPException, OSError) as exc:
+                conn.close()
+                # A pooled connection may have been closed by the server;
+                # retry once on a fresh one.
+                if retries:
+                    retries -= 1
+                    continue
+                return False, str(exc)
+            if response.will_close:
+                conn.close()
+            else:
+                self._checkin(conn)
+            head = [f"HTTP/1.1 {response.status} {response.reason}"]
+            head += [f"{name}: {value}" for name, value in response.getheaders()]
+            text = "\n".join(head) + "\n\n" + data.decode("utf-8", "replace")
+            return response.status < 400, text
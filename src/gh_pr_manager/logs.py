@@ -0,0 +1,107 @@
+"""Logging setup for the whole app, done once at startup.
+
+Log calls only put records on a bounded queue; a single listener thread
+formats them and writes a size-rotated file under :func:`default_log_dir`.
+The UI and worker threads therefore never wait for disk, and when the
+listener falls behind records are dropped instead of piling up in memory.
+Use ``%``-style arguments (``logging.info("Found %d", n)``) so messages
+below the configured level are never formatted.
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from pathlib import Path
+from typing import Optional, Union
+
+#: Environment variable overriding the configured level, e.g. ``DEBUG``.
+LOG_LEVEL_ENV = "GH_PR_MANAGER_LOG_LEVEL"
+DEFAULT_LEVEL = "INFO"
+LOG_FILE = "gh_pr_manager.log"
+#: Size at which the log file is rotated, and how many old files to keep.
+MAX_BYTES = 5 * 1024 * 1024
+BACKUP_COUNT = 3
+#: Records waiting for the listener before new ones are dropped.
+QUEUE_SIZE = 10_000
+
+_FORMAT = "%(asctime)s %(levelname)s [%(threadName)s] %(name)s: %(message)s"
+
+
+def default_log_dir() -> Path:
+    """Return the directory the log files are written to."""
+    return Path.home() / ".cache" / "gh_pr_manager" / "logs"
+
+
+class _DroppingQueueHandler(QueueHandler):
+    """Queue handler that drops records instead of blocking when full."""
+
+    def __init__(self, log_queue: "queue.Queue[logging.LogRecord]"):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_handler: Optional[_DroppingQueueHandler] = None
+_listener: Optional[QueueListener] = None
+
+
+def setup_logging(
+    level: Union[str, int, None] = None, directory: Union[str, Path, None] = None
+) -> Path:
+    """Route all logging through the queue to a rotating file; return its path.
+
+    ``$GH_PR_MANAGER_LOG_LEVEL`` overrides ``level``, which defaults to
+    ``INFO``. Calling this again only changes the level.
+    """
+    global _handler, _listener
+    level = os.environ.get(LOG_LEVEL_ENV) or level or DEFAULT_LEVEL
+    if isinstance(level, str):
+        level = logging.getLevelName(level.upper())
+        if not isinstance(level, int):
+            level = logging.INFO
+    root = logging.getLogger()
+    root.setLevel(level)
+    if _listener is not None:
+        return Path(_listener.handlers[0].baseFilename)
+
+    path = Path(directory or default_log_dir()) / LOG_FILE
+    path.parent.mkdir(parents=True, exist_ok=True)
+    file_handler = RotatingFileHandler(
+        path, maxBytes=MAX_BYTES, backupCount=BACKUP_COUNT, encoding="utf-8", delay=True
+    )
+    file_handler.setFormatter(logging.Formatter(_FORMAT))
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(QUEUE_SIZE)
+    _handler = _DroppingQueueHandler(log_queue)
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(_handler)
+    _listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+    return path
+
+
+def dropped_records() -> int:
+    """Number of records discarded because the queue was full."""
+    return _handler.dropped if _handler is not None else 0
+
+
+def shutdown_logging() -> None:
+    """Flush queued records, stop the listener and detach the handler."""
+    global _handler, _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    logging.getLogger().removeHandler(_handler)
+    _handler = _listener = None
@@ -2,18 +2,28 @@
 import json
 import logging
 import re
-import traceback
+import threading
+import time
 from pathlib import Path
-
-from . import github_client
+from typing import Optional
+
+from . import github_client, rate_limit, repo_cache, tasks, tracing
+from .branch_info import SORT_KEYS, BranchInfo, scan_branches, sort_branches
+from .branch_ops import delete_remote_branches, land_branches, summarize
+from .logs import setup_logging
+from .pr_status import StatusPoller
+from .refresh import Prefetcher, RefreshPipeline
+from .search import SearchIndex
+from .stale import ACTIVE, classify_branches
 from .utils import run_cmd
+from .virtual_list import VirtualList
 from textual import events
 from textual.app import App, ComposeResult
 from textual.binding import Binding
 from textual.containers import Container, Horizontal, Vertical
 from textual.css.query import NoMatches
 from textual.message import Message
-from textual.screen import Screen
+from textual.screen import ModalScreen, Screen
 from textual.widgets import (
     Button,
     Footer,
@@ -38,6 +48,25 @@ class AuthScreen(Static):
 
 
 CONFIG_PATH = Path(__file__).parent.parent / "config.json"
+#: Seconds loading a repository may take before it is abandoned.
+PROCESS_DEADLINE = 60.0
+
+
+def read_config() -> dict:
+    """Return the contents of ``config.json``, or ``{}`` if it is missing."""
+    try:
+        with open(CONFIG_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def update_config(**values) -> None:
+    """Merge ``values`` into ``config.json``, keeping the other keys."""
+    config = read_config()
+    config.update(values)
+    with open(CONFIG_PATH, "w") as f:
+        json.dump(config, f, indent=2)
 
 # Add this before the OrgSelector class definition
 
@@ -56,16 +85,19 @@ class PRManagerApp(App):
     BINDINGS = [
         ("q", "quit", "Quit"),
         ("ctrl+c", "quit", "Quit"),
+        ("ctrl+r", "resume_last", "Resume last repo"),
+        ("ctrl+t", "show_tasks", "Tasks"),
     ]
 
     def __init__(self):
         super().__init__()
         self.selected_repo = None
-        print("DEBUG: PRManagerApp.__init__")
+        #: Default branch of :attr:`selected_repo`, as reported by GitHub.
+        self.default_branch: Optional[str] = None
+        self._prefetch: Optional[Prefetcher] = None
+        self._repo_task: Optional[tasks.Task] = None
 
     def compose(self) -> ComposeResult:
-        print("DEBUG: PRManagerApp.compose")
-        
         # Check if authenticated
         if not github_client.check_auth_status():
             yield Container(
@@ -75,30 +107,255 @@ class PRManagerApp(App):
                 id="auth_error"
             )
         else:
-            yield OrgSelector(self.on_org_selected)
+            yield Container(OrgSelector(self.on_org_selected), id="main_container")
+
+    def on_org_selected(self, org):
+        self.on_owner_selected(org)
 
     async def on_button_pressed(self, event: Button.Pressed) -> None:
         if event.button.id == "exit_button":
             self.exit()
+        elif event.button.id == "back_to_repos":
+            self.show_repo_selector()
+
+    def action_quit(self) -> None:
+        """Handle the quit action."""
+        self.exit()
+
+    def on_mount(self) -> None:
+        self.load_config()
+        rate_limit.scheduler.on_wait = self._rate_limit_wait
+        if self.selected_repo:
+            # Warm start: refresh last session's repository while the user
+            # is still picking an organization.
+            self._prefetch = Prefetcher(self.selected_repo).start()
+
+    def _rate_limit_wait(self, resource: str, seconds: float) -> None:
+        """Tell the user a background request is waiting for a rate limit."""
+        self.call_from_thread(
+            self.notify,
+            f"GitHub {resource} rate limit reached; waiting {seconds:.0f}s.",
+            severity="warning",
+        )
+
+    def _take_prefetch(self, repo: str) -> Optional[Prefetcher]:
+        """Return the prefetch for ``repo``; cancel one for another repo."""
+        prefetch, self._prefetch = self._prefetch, None
+        if prefetch is None or prefetch.cancelled:
+            return None
+        if prefetch.repo != repo:
+            prefetch.cancel()
+            return None
+        return prefetch
+
+    def action_resume_last(self) -> None:
+        """Jump straight to the branches of the last selected repository."""
+        if self.selected_repo:
+            self.on_repo_selected(self.selected_repo, self.default_branch)
+
+    def action_show_tasks(self) -> None:
+        """Show the background tasks that are running or waiting."""
+        self.push_screen(TaskMonitor())
+
+    def load_config(self):
+        config = read_config()
+        self.selected_repo = config.get("selected_repository", "")
+        self.default_branch = config.get("default_branch")
+        repo_cache.configure(
+            max_bytes=config.get("clone_cache_max_bytes"),
+            max_entries=config.get("clone_cache_max_entries"),
+            pinned=config.get("pinned_repositories"),
+        )
+        if github_client.response_cache is not None:
+            github_client.configure_response_cache(
+                max_age=config.get("api_cache_max_age"),
+                max_bytes=config.get("api_cache_max_bytes"),
+            )
+        try:
+            github_client.configure_backend(config.get("api_backend", "gh"))
+        except ValueError as e:
+            logging.warning("Ignoring api_backend setting: %s", e)
+        if config.get("trace_file"):
+            tracing.configure(config["trace_file"])
+
+    def on_owner_selected(self, owner: str) -> None:
+        """Replace the organization selector with the repository selector."""
+        logging.info("Owner selected: %s", owner)
+        self.selected_org = owner
+        try:
+            container = self.query_one("#main_container")
+            container.remove_children()
+            container.mount(RepoSelectionWidget(owner, self.on_repo_selected))
+        except Exception as e:
+            error_msg = f"Error in on_owner_selected: {str(e)}"
+            logging.exception("Error in on_owner_selected")
+            self.notify(error_msg, severity="error")
+
+    def _show_error_in_ui(self, container, error_msg: str):
+        """Helper function to display error in the UI"""
+        logging.error("Showing error in UI: %s", error_msg)
+        if container is None:
+            container = self.query_one("#main_container")
+        container.remove_children()
+        container.mount(
+            Static(error_msg, classes="error"),
+            Button("← Back to Repositories", id="back_to_repos"),
+        )
+
+    @tracing.traced("repository.process", "repo")
+    def _process_repository(
+        self,
+        repo: str,
+        container,
+        loading_widget,
+        prefetch: Optional[Prefetcher] = None,
+        cancel: Optional[threading.Event] = None,
+        base: Optional[str] = None,
+    ) -> None:
+        """List the repository's branches on the task pool.
+
+        Runs a :class:`RefreshPipeline`: a cached clone is fetched once and
+        read with ``git for-each-ref``; otherwise branch heads come straight
+        from the remote, so selecting a repository never waits for a clone.
+        A running ``prefetch`` of the same repository is awaited instead.
+        Nothing is shown once ``cancel`` is set. ``base`` is the default
+        branch the branch view compares against.
+        """
+        logging.info("Processing repository %s", repo)
+        try:
+            # Stops waiting, and drops the prefetch, when this load is cancelled
+            # or runs past its deadline.
+            heads = prefetch.result(PROCESS_DEADLINE, cancel=cancel) if prefetch else None
+            info = prefetch.info if prefetch else None
+            if heads is None:
+                pipeline = RefreshPipeline(repo, cancel=cancel)
+                heads = pipeline.run()
+                info = pipeline.info
+            if cancel is not None and cancel.is_set():
+                logging.info("Loading %s was cancelled", repo)
+                return
+            if heads is None:
+                logging.error("Could not list branches for %s", repo)
+                self.call_from_thread(
+                    self._show_error_in_ui, container, f"Could not list branches for {repo}"
+                )
+                return
+            branches = sorted(heads)
+            logging.info("Found %d branches in %s", len(branches), repo)
+            if not branches:
+                self.call_from_thread(
+                    self._show_error_in_ui, container, "No branches found in repository"
+                )
+                return
+
+            def on_back():
+                logging.debug("Back to the repository selector")
+                self.show_repo_selector()
+
+            def safe_mount():
+                try:
+                    container.remove_children()
+                    branch_selector = BranchSelector(
+                        repo=repo, branches=branches, on_back=on_back, info=info, base=base
+                    )
+                    container.mount(branch_selector)
+                    logging.debug("Branch selector mounted for %s", repo)
+                except Exception:
+                    logging.exception("Failed to mount branch selector")
+                    self._show_error_in_ui(container, "Failed to load branch list. Check logs for details.")
+
+            self.call_from_thread(safe_mount)
+        except Exception:
+            logging.exception("Unexpected error in _process_repository")
+            self.call_from_thread(
+                self._show_error_in_ui, container, "An unexpected error occurred. Please check the logs."
+            )
+
+    @tracing.traced("repository.select", "repo")
+    def on_repo_selected(self, repo: str, default_branch: Optional[str] = None) -> None:
+        """Handle repository selection"""
+        logging.info("Repository selected: %s", repo)
+        self.selected_repo = repo
+        self.default_branch = default_branch
+        repo_cache.clone_cache.selected = repo
+        prefetch = self._take_prefetch(repo)
+
+        try:
+            # Get the container where we'll show the loading widget and branch selector
+            container = self.query_one("#main_container")
+
+            # Clear the container and show loading
+            loading = Label("Fetching repository data...", id="loading-widget")
+            container.remove_children()
+            container.mount(loading)
+
+            # A newer selection supersedes one that is still loading.
+            if self._repo_task is not None:
+                self._repo_task.cancel()
+            cancel = threading.Event()
+
+            def timed_out(task: tasks.Task) -> None:
+                self.call_from_thread(
+                    self._show_error_in_ui,
+                    container,
+                    "Repository processing took too long. Please check your connection and try again.",
+                )
+
+            self._repo_task = tasks.pool.submit(
+                self._process_repository,
+                repo,
+                container,
+                loading,
+                prefetch,
+                cancel,
+                base=default_branch,
+                name=f"load {repo}",
+                deadline=PROCESS_DEADLINE,
+                on_timeout=timed_out,
+                cancel=cancel,
+            )
+
+            # Update config with the selected repository
+            try:
+                update_config(selected_repository=repo, default_branch=default_branch)
+            except Exception:
+                logging.exception("Error updating config at %s", CONFIG_PATH)
+
+        except Exception as e:
+            error_msg = f"Error in on_repo_selected: {str(e)}"
+            logging.exception("Error in on_repo_selected")
+            self._show_error_in_ui(None, f"Error: {error_msg}")
+
+    def show_repo_selector(self) -> None:
+        container = self.query_one("#main_container")
+        try:
+            branch_list = container.query(BranchSelector).first()
+            self.call_after_refresh(branch_list.remove)
+        except NoMatches:
+            pass
+        container.remove_children()
+        container.mount(RepoSelectionWidget(self.selected_repo.split("/")[0], self.on_repo_selected))
+
+
+class TaskMonitor(ModalScreen):
+    """Live view of the background tasks in :data:`tasks.pool`."""
+
+    BINDINGS = [("escape", "dismiss", "Close"), ("ctrl+t", "dismiss", "Close")]
+
+    def compose(self) -> ComposeResult:
+        yield Static(tasks.pool.describe(), id="task_monitor", markup=False)
+
+    def on_mount(self) -> None:
+        self.set_interval(0.5, self.refresh_tasks)
+
+    def refresh_tasks(self) -> None:
+        self.query_one("#task_monitor", Static).update(tasks.pool.describe())
+
 
-    def on_org_selected(self, org):
-        print(f"DEBUG: PRManagerApp.on_org_selected called with org={org}")
-        # Save the selected organization
-        self.selected_org = org
-        
-        # Remove the organization selector
-        org_selector = self.query_one("#org_selector")
-        if org_selector:
-            org_selector.remove()
-        
-        # Add the repository selection widget
-        self.mount(RepoSelectionWidget(owner=org, on_select=self.on_repo_selected))
-        
 class OrgSelector(Static):
     """Widget for choosing a GitHub organization or user account."""
     
     def __init__(self, on_select):
-        print("DEBUG: OrgSelector.__init__")
         super().__init__(id="org_selector")
         self.on_select = on_select
         self.orgs = []  # Initialize empty list
@@ -106,14 +363,12 @@ class OrgSelector(Static):
         self.options = []
         
     def compose(self) -> ComposeResult:
-        print("DEBUG: OrgSelector.compose")
         # Start with a loading message
         with Container(id="org_container"):
             yield Static("Loading organizations...", id="org_loading")
             yield Button("Continue", id="org_continue", disabled=True)
     
     async def on_mount(self) -> None:
-        print("DEBUG: OrgSelector.on_mount")
         try:
             # Fetch user login and organizations
             self.login = (github_client.get_user_login() or "").strip()
@@ -125,16 +380,13 @@ class OrgSelector(Static):
                 self.options.append((self.login, self.login))
             self.options.extend((org, org) for org in orgs)
             
-            # Log for debugging
-            print(f"DEBUG: Found {len(self.options)} organizations")
+            logging.debug("Found %d owners", len(self.options))
             
             # Update UI
             await self._update_ui()
             
         except Exception as e:
-            print(f"Error in OrgSelector.on_mount: {e}")
-            import traceback
-            traceback.print_exc()
+            logging.exception("Error in OrgSelector.on_mount")
             # Show error in UI
             container = self.query_one("#org_container")
             container.remove_children()
@@ -183,8 +435,6 @@ class OrgSelector(Static):
     
     async def on_button_pressed(self, event: Button.Pressed) -> None:
         """Handle button press events."""
-        print(f"DEBUG: OrgSelector.on_button_pressed called, button.id={event.button.id}")
-        
         if event.button.id == "quit_button":
             self.app.exit()
             return
@@ -205,7 +455,7 @@ class OrgSelector(Static):
                 except NoMatches:
                     pass
             
-            print(f"DEBUG: Selected owner: {owner}")
+            logging.debug("Selected owner: %s", owner)
             
             if owner and self.on_select:
                 # Call the callback
@@ -214,166 +464,126 @@ class OrgSelector(Static):
                 if hasattr(result, "__await__"):
                     await result
 
+#: Seconds of typing inactivity before the repository filter runs.
+FILTER_DEBOUNCE = 0.15
+#: Maximum number of ranked matches shown for a filter term.
+MAX_FILTER_RESULTS = 500
+
+
+def _repo_label(repo) -> str:
+    """Return the ``owner/name`` shown for a repository entry."""
+    if isinstance(repo, github_client.RepoRecord):
+        return repo.full_name
+    return repo.name if hasattr(repo, 'name') else str(repo)
+
+
 class RepoSelectionWidget(Static):
     """Widget for selecting a repository from the chosen owner."""
     def __init__(self, owner: str, on_select=None, **kwargs):
-        print(f"DEBUG: RepoSelectionWidget.__init__ for owner={owner}")
         super().__init__(**kwargs)
         self.owner = owner
         self.on_select = on_select
         self.repos = []
         self.filtered_repos = []
+        self.filter_term = ""
         self.loading = True
-        self._initialized = False
         self._list_view = None  # Strong reference to the list view widget
+        self._index = SearchIndex()
+        self._filter_timer = None
 
     def compose(self) -> ComposeResult:
-        print("DEBUG: RepoSelectionWidget.compose")
         with Vertical():
-            yield Static("DEBUG: UI reached here", id="debug_top")
             yield Static(f"Repositories for {self.owner}")
             yield Input(placeholder="Filter repositories...", id="repo_filter")
             yield Static("Loading repositories...", id="repo_loading")
-            yield ListView(id="repo_list")
+            yield VirtualList(id="repo_list")
 
-    async def on_mount(self) -> None:
-        print("DEBUG: RepoSelectionWidget.on_mount")
-        try:
-            logging.info(f"Mounting repo selector for owner: {self.owner}")
-            # ... your code here ...
-        except Exception as e:
-            print(f"Error in RepoSelectionWidget.on_mount: {e}")
-            logging.error(f"Error in RepoSelectionWidget.on_mount: {e}")
-                
-    def _finish_initialization(self):
-        """Complete the initialization after the list view is found."""
-        try:
-            logging.info(f"List view initialized: {self._list_view}")
-            # ... your code here ...
-        except Exception as e:
-            print(f"Error in _finish_initialization: {e}")
-            logging.error(f"Error in _finish_initialization: {e}")
-        
-            # Set up event handlers
-            filter_input = self.query_one("#repo_filter")
-            if filter_input:
-                filter_input.on_change = self.on_input_changed
-            else:
-                logging.error("Failed to find #repo_filter")
-                return
-            
-            # Mark as initialized
-            self._initialized = True
-            
-            # Fetch repositories in a background task to keep the UI responsive
-            self.run_worker(self._load_repositories())
-            
-        except Exception as e:
-            error_msg = f"Error in _finish_initialization: {str(e)}"
-            logging.error(error_msg)
-            logging.error(traceback.format_exc())
-            self.notify(error_msg, severity="error")
-    
-    async def _load_repositories(self) -> None:
-        """Load repositories asynchronously."""
-        print(f"DEBUG: _load_repositories called for owner={self.owner}")
-        # Simulate async repo loading for now
-        import asyncio
-        from types import SimpleNamespace
-        await asyncio.sleep(0.1)
-        # Replace with real GitHub API call or gh CLI integration
-        self.repos = [SimpleNamespace(name=f"repo-{i}") for i in range(3)]
-        print(f"DEBUG: _load_repositories loaded repos: {[r.name for r in self.repos]}")
-        self.filtered_repos = list(self.repos)
-        self.update_list_view()
-        # Update the UI on the main thread
-        self.call_after_refresh(
-            self._on_repositories_loaded,
-            self.repos
+    def on_mount(self) -> None:
+        logging.debug("Mounting repo selector for owner %s", self.owner)
+        self._list_view = self.query_one("#repo_list", VirtualList)
+        # Fetch repositories in a background thread to keep the UI responsive
+        self.run_worker(
+            self._load_repositories, thread=True, exclusive=True, group="repo_load"
         )
-            
-    def _update_repo_list(self, repos: list[str]) -> None:
-        """Update the repository list in the UI."""
+
+    def _load_repositories(self) -> None:
+        """Stream repository pages from GitHub into the list as they arrive."""
         try:
-            # Update widget state
-            self.repos = repos
-            self.filtered_repos = repos.copy()
-            
-            # Update the list view
-            self.update_list_view(self.filtered_repos)
-            
-            # Remove loading message
-            loading = self.query_one("#repo_loading")
-            if loading:
-                loading.remove()
-            
-            # Set focus to the list view
-            if self.list_view:
-                self.list_view.focus()
-                
-            logging.info("Repository list updated successfully")
-            
+            for page in github_client.iter_repo_pages(self.owner):
+                self.app.call_from_thread(self._append_repos, page)
         except Exception as e:
-            error_msg = f"Failed to update repository list: {str(e)}"
-            logging.error(error_msg)
-            logging.error(traceback.format_exc())
-            self.notify(f"Error updating repository list: {e}", severity="error")
-
-    def log_widget_tree(self, widget=None, indent=0):
-        """Recursively log the widget tree for debugging"""
-        if widget is None:
-            widget = self
-            logging.info("\n=== WIDGET TREE ===")
-            
-        widget_id = f"{widget.__class__.__name__}(id={getattr(widget, 'id', 'N/A')})"
-        logging.info("  " * indent + f"- {widget_id}")
-        
-        if hasattr(widget, 'children'):
-            for child in widget.children:
-                self.log_widget_tree(child, indent + 1)
-                
-        if widget is self:
-            logging.info("=== END WIDGET TREE ===\n")
-
-    def on_input_changed(self, event: Input.Changed) -> None:
-        term = event.value.lower()
-        self.filtered_repos = [r for r in self.repos if term in r.name.lower()]
-        self.update_list_view()
-
-    def _on_repositories_loaded(self, repos):
-        """Handle repositories loaded event.
-
-        Args:
-            repos: List of repository objects or an exception if loading failed
-        """
-        if isinstance(repos, Exception):
-            error_msg = f"Error loading repositories: {str(repos)}"
-            logging.error(error_msg)
-            self.notify(error_msg, severity="error")
+            self.app.call_from_thread(self._on_repositories_loaded, e)
             return
-
+        self.app.call_from_thread(self._on_repositories_loaded, None)
+
+    def _append_repos(self, batch) -> None:
+        """Add one page of repositories, showing rows that match the filter."""
+        self.repos.extend(batch)
+        self._index.add(_repo_label(repo) for repo in batch)
+        if self.filter_term:
+            # Re-rank so late arrivals land in the right place.
+            self._schedule_filter()
+        else:
+            self.filtered_repos.extend(batch)
+            if self._list_view is not None:
+                self._list_view.append_items(_repo_label(repo) for repo in batch)
         try:
-            self.repos = repos
-            self.filtered_repos = list(repos)  # Initialize filtered list
-            logging.info(f"Found {len(repos)} repositories for {self.owner}")
+            self.query_one("#repo_loading", Static).update(
+                f"Loading repositories... ({len(self.repos)} so far)"
+            )
+        except NoMatches:
+            pass
 
-            # Ensure we have a valid list view reference
-            if self._list_view is None:
-                logging.warning("List view reference lost, trying to find it...")
-                self._list_view = self.query_one("#repo_list")
+    def on_input_changed(self, event: Input.Changed) -> None:
+        self.filter_term = event.value.strip().lower()
+        self._schedule_filter()
+
+    def _schedule_filter(self) -> None:
+        """Run the filter once typing pauses for ``FILTER_DEBOUNCE`` seconds."""
+        if self._filter_timer is not None:
+            self._filter_timer.stop()
+        self._filter_timer = self.set_timer(FILTER_DEBOUNCE, self._start_filter)
+
+    def _start_filter(self) -> None:
+        self._filter_timer = None
+        term = self.filter_term
+        if not term:
+            # A cleared filter shows everything, not the top ranked matches.
+            self.filtered_repos = list(self.repos)
+            self.update_list_view()
+            return
+        self.run_worker(
+            lambda: self._match(term), thread=True, exclusive=True, group="repo_filter"
+        )
 
-            if self._list_view is None:
-                logging.error("Could not find list view after repository load")
-                return
+    def _match(self, term: str) -> None:
+        """Rank matches off the UI thread and hand them back to it."""
+        positions = self._index.search(term, limit=MAX_FILTER_RESULTS)
+        self.app.call_from_thread(self._show_matches, term, positions)
 
-            # Update the UI with the repositories
-            self.call_after_refresh(self.update_list_view)
+    def _show_matches(self, term: str, positions: list[int]) -> None:
+        if term != self.filter_term:
+            return  # a newer keystroke superseded this result
+        self.filtered_repos = [self.repos[i] for i in positions]
+        self.update_list_view()
 
-        except Exception as e:
-            error_msg = f"Error handling repositories: {str(e)}"
-            logging.error(error_msg)
-            logging.error(traceback.format_exc())
+    def _on_repositories_loaded(self, error) -> None:
+        """Finish loading once the last page arrived or loading failed."""
+        self.loading = False
+        try:
+            loading = self.query_one("#repo_loading", Static)
+        except NoMatches:
+            loading = None
+        if error is not None:
+            error_msg = f"Error loading repositories: {str(error)}"
+            logging.error("Error loading repositories for %s: %s", self.owner, error)
             self.notify(error_msg, severity="error")
+            if loading is not None:
+                loading.update(error_msg)
+            return
+        logging.info("Found %d repositories for %s", len(self.repos), self.owner)
+        if loading is not None:
+            loading.remove()
 
     def update_list_view(self, repos=None):
         """Update the list view with repositories.
@@ -386,73 +596,24 @@ class RepoSelectionWidget(Static):
                 logging.error("List view reference is None in update_list_view")
                 return
             # Use provided repos or fall back to filtered_repos
-            repos_to_display = repos if repos is not None else getattr(self, 'filtered_repos', [])
-            if not repos_to_display:
-                logging.warning("No repositories to display in update_list_view")
-                self._list_view.clear()
-                try:
-                    debug_label = self.query_one("#repo_debug_label")
-                    debug_label.update("[debug] No repos to display.")
-                except Exception:
-                    pass
-                return
-            # Clear the list view and add new items
-            self._list_view.clear()
-            for repo in repos_to_display:
-                repo_name = repo.name if hasattr(repo, 'name') else str(repo)
-                self._list_view.append(ListItem(Label(repo_name)))
-            try:
-                debug_label = self.query_one("#repo_debug_label")
-                debug_label.update(f"[debug] Repo list updated with {len(repos_to_display)} items.")
-            except Exception:
-                pass
-            logging.info(f"Repository list updated successfully with {len(repos_to_display)} items")
-            # Add timer to log number of items in ListView after update
-            from threading import Timer
-            def log_listview_count():
-                try:
-                    count = len(self._list_view.children)
-                    logging.info(f"[timer] ListView now has {count} children after update_list_view")
-                except Exception as e:
-                    logging.error(f"[timer] Error logging ListView count: {e}")
-            Timer(2.0, log_listview_count).start()
+            repos_to_display = repos if repos is not None else self.filtered_repos
+            labels = [_repo_label(repo) for repo in repos_to_display]
+            self._list_view.reconcile(labels)
+            logging.debug("Repository list shows %d items", len(repos_to_display))
         except Exception as e:
             error_msg = f"Error in update_list_view: {str(e)}"
-            logging.error(error_msg)
-            logging.error(traceback.format_exc())
+            logging.exception("Error in update_list_view")
             self.notify(error_msg, severity="error")
 
-    def on_list_view_selected(self, event):
+    def on_virtual_list_selected(self, event: VirtualList.Selected) -> None:
         """Handle repository selection from the list"""
-        try:
-            item = event.item if hasattr(event, 'item') else None
-            if not item or not hasattr(item, 'children') or not item.children:
-                logging.warning("No valid item selected")
-                return
-                
-            # Get the label from the selected item
-            label = item.children[0]
-            repo = None
-            
-            # Extract the repository name from the label
-            if hasattr(label, 'renderable') and isinstance(label.renderable, str):
-                repo = label.renderable
-            elif hasattr(label, 'plain'):
-                repo = label.plain
-            elif hasattr(label, 'text'):
-                repo = label.text
-                
-            if repo:
-                logging.info(f"Repository selected: {repo}")
-                self.on_select(repo)
-            else:
-                logging.warning("Could not determine selected repository")
-                
-        except Exception as e:
-            logging.error(f"Error in on_list_view_selected: {str(e)}")
-            logging.error(traceback.format_exc())
-
-
+        index = event.index
+        if not 0 <= index < len(self.filtered_repos):
+            logging.warning("No valid item selected")
+            return
+        entry = self.filtered_repos[index]
+        if self.on_select:
+            self.on_select(_repo_label(entry), getattr(entry, "default_branch", None))
 
 
 class BranchActions(Static):
@@ -476,63 +637,79 @@ class BranchActions(Static):
             msg.update("No branch selected.")
             return
         if event.button.id == "delete_branch":
-            if len(branches) > 1:
-                # Multi-branch delete confirmation should be handled by parent (BranchSelector)
-                self.app.post_message("multi_delete_requested")
-            else:
-                branch = next(iter(branches))
-                success, output = run_cmd(["git", "-C", self.repo, "branch", "-D", branch])
-                if success:
-                    msg.update(f"Deleted {branch}")
-                    self.set_timer(2, lambda: msg.update(""))
-                    self.refresh_callback()
-                else:
-                    msg.update(f"Delete failed: {output}")
+            names = sorted(branches)
+            msg.update(f"Deleting {len(names)} branch(es)...")
+            self.run_worker(lambda: self._delete(names), thread=True, group="branch_actions")
         elif event.button.id == "pr_flow":
-            if len(branches) > 1:
-                msg.update("Select only one branch for PR/Merge/Delete.")
-                self.set_timer(2, lambda: msg.update(""))
-                return
-            branch = next(iter(branches))
-            # PR/Merge/Delete logic as before
-            success, output = run_cmd(["gh", "pr", "create", "--repo", self.repo, "--head", branch, "--base", "main", "--title", branch, "--body", "Automated PR"])
-            if not success:
-                msg.update(f"Create failed: {output}")
-                self.refresh_callback()
-                return
-            success, output = run_cmd(["gh", "pr", "merge", "--repo", self.repo, "--head", branch, "--delete-branch", "--yes"])
-            if not success:
-                msg.update(f"Merge failed: {output}")
-                self.refresh_callback()
-                return
-            success, output = run_cmd(["git", "-C", self.repo, "branch", "-D", branch])
-            if success:
-                msg.update(f"PR merged and {branch} deleted")
-                self.set_timer(2, lambda: msg.update(""))
-                self.refresh_callback()  # Refresh the branch list immediately
-            else:
-                msg.update(f"Cleanup failed: {output}")
+            names = sorted(branches)
+            msg.update(f"Landing {len(names)} branch(es)...")
+            self.run_worker(lambda: self._land(names), thread=True, group="branch_actions")
 
         # self.refresh_callback()  # Removed this line to avoid duplicate refresh
+
+    def _delete(self, branches: list[str]) -> None:
+        results = delete_remote_branches(self.repo, branches)
+        self.app.call_from_thread(self._deleted, results)
+
+    def _deleted(self, results) -> None:
+        msg = self.query_one("#action_msg")
+        msg.update(summarize(results))
+        if all(r.ok for r in results):
+            self.set_timer(2, lambda: msg.update(""))
+        self.refresh_callback()
+
+    def _land(self, branches: list[str]) -> None:
+        results = land_branches(branches, path=self.repo)
+        self.app.call_from_thread(self._landed, results)
+
+    def _landed(self, results) -> None:
+        msg = self.query_one("#action_msg")
+        if len(results) == 1 and results[0].ok:
+            msg.update(f"PR merged and {results[0].branch} deleted")
+        else:
+            msg.update(summarize(results, "Landed"))
+        if all(r.ok for r in results):
+            self.set_timer(2, lambda: msg.update(""))
+        self.refresh_callback()
+
+
 class BranchSelector(Static):
+    BINDINGS = [
+        Binding("s", "cycle_sort", "Sort"),
+        Binding("i", "load_details", "Branch details"),
+        Binding("x", "select_stale", "Select stale"),
+    ]
+
     class BranchSelectionChanged(Message):
         def __init__(self, selected):
             self.selected = selected
             super().__init__()
 
-    def __init__(self, repo: str, branches: list[str], on_back):
+    def __init__(self, repo: str, branches: list[str], on_back, info=None, base: Optional[str] = None):
         super().__init__(id="branch_list")
         self.repo = repo
+        #: Default branch; guessed from the clone when ``None``.
+        self.base = base
         self.branches = branches
         self.on_back = on_back
         self.selected_branches = set()
+        #: Progress of running bulk operations, shown next to each branch.
+        self.status: dict[str, str] = {}
+        #: Open pull request per branch, kept current by :attr:`poller`.
+        self.pr_status: dict[str, github_client.PullStatus] = {}
+        self.poller: Optional[StatusPoller] = None
+        #: Commit date, author and ahead/behind per branch, once scanned.
+        self.info: dict[str, BranchInfo] = {i.name: i for i in info or ()}
+        self.sort_key = "name"
+        #: Category per branch from the last stale analysis.
+        self.staleness: dict[str, str] = {}
 
     def compose(self) -> ComposeResult:
         """Create child widgets for the app."""
         yield Header(show_clock=True)
         
-        # Main container with quit button overlay
-        with Container(id="main_container"):
+        # Branch view container with quit button overlay
+        with Container(id="branch_container"):
             yield Static("", id="content")
             yield QuitButton(id="quit_button")
             
@@ -553,7 +730,7 @@ class BranchSelector(Static):
                 
                 # Main branch list taking up remaining space
                 with Container(classes="list-container"):
-                    self.list_view = ListView(id="branch_listview")
+                    self.list_view = VirtualList(multi_select=True, id="branch_listview")
                     yield self.list_view
                 
                 # Footer with back button
@@ -565,14 +742,202 @@ class BranchSelector(Static):
         
     def on_mount(self) -> None:
         """Set up the app after the DOM is ready."""
-        # Position the quit button in the top-right corner
+        # Keep the quit button in the top-right corner
         quit_btn = self.query_one("#quit_button")
-        quit_btn.styles.offset = ("100vw - 10", 1)
-        quit_btn.styles.layer = "overlay"
+        quit_btn.styles.dock = "right"
         
-        self.list_view = self.query_one("#branch_listview")
+        self.list_view = self.query_one("#branch_listview", VirtualList)
+        self.populate_list_view()
+        self.update_buttons()
+        self.poller = StatusPoller(self.repo, self._on_pr_status).start()
+        # The refresh leaves ahead/behind out; count them in the background.
+        uncounted = not self.info or any(i.ahead is None for i in self.info.values())
+        if uncounted and repo_cache.clone_path(self.repo).exists():
+            self.action_load_details()
+
+    def action_load_details(self) -> None:
+        """Scan commit date, author and ahead/behind, cloning if needed."""
+        tasks.pool.submit(self._load_details, name=f"branch details {self.repo}")
+
+    def _load_details(self) -> None:
+        with repo_cache.clone_cache.use(self.repo):
+            path, _ = repo_cache.ensure_clone(self.repo)
+            infos = scan_branches(path, self.base) if path else None
+        if infos is not None:
+            self.app.call_from_thread(self.apply_branch_info, infos)
+
+    def apply_branch_info(self, infos) -> None:
+        if not self.is_mounted:
+            return
+        self.info = {info.name: info for info in infos}
+        self.branches = sort_branches(self.branches, self.info, self.sort_key)
         self.populate_list_view()
+
+    def action_select_stale(self) -> None:
+        """Select merged, squash-merged and inactive branches for deletion."""
+        self.msg_label.update("Looking for stale branches...")
+        self.run_worker(self._find_stale, thread=True, exclusive=True, group="stale")
+
+    def _find_stale(self) -> None:
+        with repo_cache.clone_cache.use(self.repo):
+            path, error = repo_cache.ensure_clone(self.repo)
+            report = None
+            if path is not None:
+                infos = list(self.info.values()) or None
+                open_prs = [b for b, status in self.pr_status.items() if status.state == "OPEN"]
+                report = classify_branches(
+                    path,
+                    self.base,
+                    merged_pr_heads=github_client.get_merged_pr_heads(self.repo),
+                    infos=infos,
+                    open_prs=open_prs,
+                )
+        self.app.call_from_thread(self.apply_stale_report, report)
+
+    def apply_stale_report(self, report) -> None:
+        if report is None:
+            self.msg_label.update("Stale branch analysis failed")
+            return
+        self.staleness = dict(report.categories)
+        self.populate_list_view()
+        self.list_view.select_keys(report.prunable)
+        self.app.notify(f"{report.summary()}. Prunable branches are selected for deletion.")
+        if not report.merged_prs_known:
+            self.msg_label.update("Could not fetch merged pull requests; merged branches were not detected")
+
+    def action_cycle_sort(self) -> None:
+        """Switch between sorting by name, date, ahead and behind."""
+        self.sort_key = SORT_KEYS[(SORT_KEYS.index(self.sort_key) + 1) % len(SORT_KEYS)]
+        self.branches = sort_branches(self.branches, self.info, self.sort_key)
+        self.populate_list_view()
+        self.msg_label.update(f"Sorted by {self.sort_key}")
+
+    def on_unmount(self) -> None:
+        if self.poller:
+            self.poller.stop()
+
+    def _on_pr_status(self, changes) -> None:
+        self.app.call_from_thread(self.apply_pr_status, changes)
+
+    def apply_pr_status(self, changes) -> None:
+        """Merge polled PR status changes; only affected rows are repainted."""
+        for branch, status in changes.items():
+            if status is None:
+                self.pr_status.pop(branch, None)
+            else:
+                self.pr_status[branch] = status
+        self.populate_list_view()
+
+    def row_label(self, branch: str) -> str:
+        """Return the text shown for ``branch`` in the list."""
+        label = branch
+        if branch in self.info:
+            label += f"  {self.info[branch].describe()}"
+        if branch in self.pr_status:
+            label += f"  {self.pr_status[branch].describe()}"
+        if self.staleness.get(branch, ACTIVE) != ACTIVE:
+            label += f"  ({self.staleness[branch]})"
+        if branch in self.status:
+            label += f"  [{self.status[branch]}]"
+        return label
+
+    def populate_list_view(self) -> None:
+        """Show ``self.branches``; existing rows keep cursor and selection."""
+        self.list_view.reconcile([self.row_label(b) for b in self.branches], keys=self.branches)
+        self.selected_branches = {self.branches[i] for i in self.list_view.selected_indices}
+
+    def remove_branches(self, branches) -> None:
+        """Drop ``branches`` from the list, e.g. after they were deleted."""
+        gone = set(branches)
+        self.branches = [b for b in self.branches if b not in gone]
+        self.populate_list_view()
+        self.update_buttons()
+
+    def update_buttons(self) -> None:
+        """Enable branch actions only while something is selected."""
+        count = len(self.selected_branches)
+        for button_id in ("#delete_branch", "#pr_flow"):
+            self.query_one(button_id, Button).disabled = count == 0
+        if count:
+            self.msg_label.update(f"{count} branch(es) selected")
+        else:
+            self.msg_label.update("Click to select/deselect branches")
+
+    def on_virtual_list_selection_changed(self, event: VirtualList.SelectionChanged) -> None:
+        self.selected_branches = {self.branches[i] for i in event.selected}
         self.update_buttons()
+        self.post_message(self.BranchSelectionChanged(set(self.selected_branches)))
+
+    def on_button_pressed(self, event: Button.Pressed) -> None:
+        if event.button.id == "back":
+            event.stop()
+            self.on_back()
+        elif event.button.id == "delete_branch":
+            event.stop()
+            names = sorted(self.selected_branches)
+            if names:
+                self.msg_label.update(f"Deleting {len(names)} branch(es)...")
+                self.run_worker(lambda: self._delete(names), thread=True, group="branch_delete")
+        elif event.button.id == "pr_flow":
+            event.stop()
+            names = sorted(self.selected_branches)
+            if names:
+                self.warn_if_over_budget(2 * len(names), "graphql")
+                self.msg_label.update(f"Landing {len(names)} branch(es)...")
+                self.run_worker(lambda: self._land(names), thread=True, group="branch_land")
+
+    def _delete(self, branches: list[str]) -> None:
+        """Delete ``branches`` on GitHub in batches, then update the list once."""
+        with repo_cache.clone_cache.use(self.repo):
+            path, error = repo_cache.ensure_clone(self.repo)
+            if path is None:
+                self.app.call_from_thread(self.msg_label.update, f"Delete failed: {error}")
+                return
+            results = delete_remote_branches(path, branches)
+        self.app.call_from_thread(self._deleted, results)
+
+    def warn_if_over_budget(self, requests: int, resource: str) -> None:
+        """Warn when a bulk job needs more API calls than GitHub has left."""
+        if rate_limit.scheduler.can_afford(requests, resource):
+            return
+        budget = rate_limit.scheduler.budget(resource)
+        reset = time.strftime("%H:%M", time.localtime(budget.reset))
+        self.app.notify(
+            f"Only {budget.remaining} {resource} API calls left until {reset}; "
+            "the job will pause until the limit resets.",
+            severity="warning",
+        )
+
+    def _deleted(self, results) -> None:
+        self.remove_branches(r.branch for r in results if r.ok)
+        self.msg_label.update(summarize(results))
+
+    def set_status(self, branch: str, status: str) -> None:
+        """Show ``status`` next to ``branch``; only that row is repainted."""
+        self.status[branch] = status
+        self.populate_list_view()
+
+    def _land(self, branches: list[str]) -> None:
+        """Create, merge and delete a PR per branch with bounded concurrency."""
+        with repo_cache.clone_cache.use(self.repo):
+            path = repo_cache.clone_path(self.repo)
+            results = land_branches(
+                branches,
+                repo=self.repo,
+                path=path if path.exists() else None,
+                base=self.base,
+                progress=lambda branch, stage: self.app.call_from_thread(self.set_status, branch, stage),
+            )
+        self.app.call_from_thread(self._landed, results)
+
+    def _landed(self, results) -> None:
+        for r in results:
+            if r.ok:
+                self.status.pop(r.branch, None)
+            else:
+                self.status[r.branch] = "failed"
+        self.remove_branches(r.branch for r in results if r.ok)
+        self.msg_label.update(summarize(results, "Landed"))
 
 
 class BaseContainer(Container):
@@ -590,738 +955,16 @@ class BaseContainer(Container):
             else:
                 yield Static()  # Placeholder for actual content
 
-
-
-        print("DEBUG: Mounted RepoSelectionWidget")
-
-    
-    def action_quit(self) -> None:
-        """Handle the quit action."""
-        self.exit()
-        
     def get_content_container(self) -> Container:
         """Get the content container where main UI elements should be placed."""
         return self.query_one("#content")
 
-    def __init__(self):
-        super().__init__()
-        self.selected_repo = None
-        print("DEBUG: PRManagerApp.__init__")
-
-    def load_config(self):
-        if CONFIG_PATH.exists():
-            with open(CONFIG_PATH) as f:
-                self.selected_repo = json.load(f).get("selected_repository", "")
-        else:
-            self.selected_repo = ""
-        logging.info(f"Owner selected: {owner}")
-        
-        try:
-            # Get the main container
-            container = self.query_one("#main_container")
-            if not container:
-                error_msg = "Could not find main container"
-                logging.error(error_msg)
-                self.notify(error_msg, severity="error")
-                return
-            
-            # Remove the org selector
-            selector = container.query_one(OrgSelector)
-            if selector:
-                logging.info("Removing OrgSelector")
-                selector.remove()
-            
-            # Create and mount the repo selector
-            logging.info("Creating RepoSelectionWidget")
-            repo_selector = RepoSelectionWidget(owner, self.on_repo_selected)
-            
-            # Mount the repo selector after a small delay to ensure the DOM is ready
-            def mount_repo_selector():
-                logging.info("Mounting RepoSelectionWidget")
-                try:
-                    container.mount(repo_selector)
-                    logging.info("RepoSelectionWidget mounted successfully")
-                except Exception as e:
-                    error_msg = f"Failed to mount RepoSelectionWidget: {str(e)}"
-                    logging.error(error_msg)
-                    logging.error(traceback.format_exc())
-                    self.notify(error_msg, severity="error")
-            
-            # Schedule the mount operation
-            self.call_after_refresh(mount_repo_selector)
-            
-        except Exception as e:
-            error_msg = f"Error in on_owner_selected: {str(e)}"
-            logging.error(error_msg)
-            logging.error(traceback.format_exc())
-            self.notify(error_msg, severity="error")
 
-    def _show_error_in_ui(self, container, error_msg: str):
-        """Helper function to display error in the UI"""
-        logging.error(f"Showing error in UI: {error_msg}")
-        if container is None:
-            container = self.query_one("#main_container")
-    
-    def _process_repository(self, repo: str, container, loading_widget) -> None:
-        """Process repository in a background thread"""
-        import threading
-        import traceback
-        
-        current_thread = threading.current_thread()
-        thread_id = current_thread.ident
-        
-        def log(msg: str, level: str = 'info') -> None:
-            """Helper function for consistent logging format"""
-            log_msg = f"[Thread-{thread_id}] {msg}"
-            if level == 'error':
-                logging.error(log_msg)
-            elif level == 'warning':
-                logging.warning(log_msg)
-            else:
-                logging.info(log_msg)
-        
-        log(f"=== STARTING REPOSITORY PROCESSING FOR: {repo} ===")
-        log(f"Thread name: {current_thread.name}")
-        log(f"Is daemon: {current_thread.daemon}")
-        log(f"Is alive: {current_thread.is_alive()}")
-        
-        def log_thread_status():
-            log(f"Thread status - Alive: {current_thread.is_alive()}, Daemon: {current_thread.daemon}")
-        
-        # Log thread status periodically
-        try:
-            from threading import Timer
-            status_timer = Timer(5.0, log_thread_status)
-            status_timer.daemon = True
-            status_timer.start()
-            log("Started periodic status timer")
-        except Exception as e:
-            log(f"Failed to start status timer: {str(e)}", 'error')
-            log(traceback.format_exc(), 'error')
-        
-        try:
-            log("Setting up repository path...")
-            clone_base = Path.home() / ".cache" / "gh_pr_manager"
-            repo_path = clone_base / repo.replace("/", "_")
-            log(f"Repository path: {repo_path}")
-            log(f"Clone base exists: {clone_base.exists()}")
-            
-            # Clone or update the repository
-            try:
-                log(f"Checking if repository exists at: {repo_path}")
-                repo_exists = repo_path.exists()
-                log(f"Repository exists: {repo_exists}")
-                if not repo_path.exists():
-                    log("Repository does not exist, cloning...")
-                    log(f"Ensuring parent directory exists: {repo_path.parent}")
-                    try:
-                        repo_path.parent.mkdir(parents=True, exist_ok=True)
-                        log(f"Running: gh repo clone {repo} {repo_path}")
-                        success, output = run_cmd(["gh", "repo", "clone", repo, str(repo_path)])
-                        if not success:
-                            error_msg = f"Failed to clone repository: {output}"
-                            log(error_msg, 'error')
-                            raise Exception(error_msg)
-                        log("Repository cloned successfully")
-                    except Exception as e:
-                        log(f"Error during clone: {str(e)}", 'error')
-                        log(traceback.format_exc(), 'error')
-                        raise
-                else:
-                    log("Repository exists, pulling latest changes...")
-                    log(f"Running: git -C {repo_path} pull")
-                    try:
-                        success, output = run_cmd(["git", "-C", str(repo_path), "pull"])
-                        if not success:
-                            log(f"Warning: Failed to pull repository: {output}", 'warning')
-                        else:
-                            log("Repository updated successfully")
-                    except Exception as e:
-                        log(f"Error during pull: {str(e)}", 'error')
-                        log(traceback.format_exc(), 'error')
-                        raise
-            except Exception as e:
-                logging.error(f"[Thread-{current_thread.ident}] Error in repository update: {str(e)}", exc_info=True)
-                raise
-
-            # Fetch all branches
-            try:
-                log("Fetching all branches...")
-                log(f"Running: git -C {repo_path} fetch --prune")
-                success, fetch_output = run_cmd(["git", "-C", str(repo_path), "fetch", "--prune"])
-                if not success:
-                    log(f"Warning: Failed to fetch branches: {fetch_output}", 'warning')
-                else:
-                    log("Successfully fetched branches")
-                
-                # Verify git repository
-                log("Verifying git repository...")
-                success, git_status = run_cmd(["git", "-C", str(repo_path), "status"])
-                if not success:
-                    log(f"Warning: Git status check failed: {git_status}", 'warning')
-                else:
-                    log("Git repository verified successfully")
-                log("Getting branch list...")
-                cmd = [
-                    "git", "-C", str(repo_path), "for-each-ref",
-                    "--format=%(refname:short)", "refs/remotes/origin/"
-                ]
-                log(f"Running: {' '.join(cmd)}")
-                success, output = run_cmd(cmd)
-                log(f"Command success: {success}, output length: {len(output) if output else 0}")
-                if output:
-                    log(f"First 200 chars of branch list: {output[:200]}")
-                    
-                if success:
-                    if not output:
-                        log("Warning: Branch list command succeeded but returned no output", 'warning')
-                        # Try an alternative approach to get branches
-                        log("Trying alternative branch listing command...")
-                        alt_cmd = ["git", "-C", str(repo_path), "branch", "-r"]
-                        log(f"Running: {' '.join(alt_cmd)}")
-                        success, output = run_cmd(alt_cmd)
-                        log(f"Alternative command success: {success}, output length: {len(output) if output else 0}")
-                        if output:
-                            log(f"First 200 chars of alternative branch list: {output[:200]}")
-                
-                if output:
-                    branches = [b.replace('origin/', '') for b in output.splitlines() if b.strip()]
-                    branches = [b for b in branches if not b.endswith('HEAD')]
-                    log(f"Found {len(branches)} branches after filtering")
-                    
-                    if not branches:
-                        log("No branches found after filtering. Raw output:", 'warning')
-                        log(output, 'warning')
-                else:
-                    log("No branch data available", 'warning')
-            except Exception as e:
-                logging.error(f"[Thread-{current_thread.ident}] Error fetching branches: {str(e)}", exc_info=True)
-                raise
-            
-            # Create and mount the branch selector
-            try:
-                log(f"=== CREATING BRANCH SELECTOR ===")
-                log(f"Processing {len(branches)} branches...")
-                
-                if not branches:
-                    log("Warning: No branches to display", 'warning')
-                    self.call_after_refresh(
-                        lambda: self._show_error_in_ui(container, "No branches found in repository")
-                    )
-                    return
-                
-                log(f"Sample branches for selector (first 5): {branches[:5]}")
-                
-                # Create the branch selector
-                log("=== CREATING BRANCH SELECTOR INSTANCE ===")
-                log(f"Number of branches to display: {len(branches)}")
-                log(f"Sample branches (first 5): {branches[:5] if len(branches) > 5 else branches}")
-                log(f"Repository path: {repo_path}")
-                
-                try:
-                    log("Initializing BranchSelector...")
-                    # Create a back callback function
-                    def on_back():
-                        log("Back button pressed, showing repo selector")
-                        self.show_repo_selector()
-                    
-                    # Initialize BranchSelector with all required parameters
-                    branch_selector = BranchSelector(
-                        repo=repo,  # The repository name/path
-                        branches=branches,  # List of branch names
-                        on_back=on_back  # Callback for back button
-                    )
-                    
-                    # Verify the branch selector was created correctly
-                    if not hasattr(branch_selector, 'mount'):
-                        raise Exception("BranchSelector is missing required 'mount' method")
-                    
-                    log("BranchSelector instance created successfully")
-                    log(f"BranchSelector type: {type(branch_selector).__name__}")
-                    log(f"BranchSelector ID: {getattr(branch_selector, 'id', 'N/A')}")
-                    log(f"BranchSelector has mount method: {hasattr(branch_selector, 'mount')}")
-                    log(f"BranchSelector parent: {getattr(branch_selector, 'parent', 'None')}")
-                    
-                    # Check if branch selector has the expected attributes
-                    expected_attrs = ['branches', 'on_branch_selected', 'selected_branches']
-                    for attr in expected_attrs:
-                        log(f"BranchSelector has {attr}: {hasattr(branch_selector, attr)}")
-                    
-                except Exception as e:
-                    error_msg = f"Failed to create BranchSelector: {str(e)}"
-                    log(error_msg, 'error')
-                    log(traceback.format_exc(), 'error')
-                    raise Exception(f"BranchSelector creation failed: {str(e)}")
-                
-                # Schedule the branch selector to be mounted in the UI thread
-                log("Scheduling branch selector mount in UI thread...")
-                
-                def safe_mount():
-                    try:
-                        log("[UI Thread] === STARTING BRANCH SELECTOR MOUNT ===")
-                        log(f"[UI Thread] Container type: {type(container).__name__}")
-                        
-                        # Remove loading widget if it exists
-                        if loading_widget and loading_widget in container.children:
-                            try:
-                                container.remove_child(loading_widget)
-                                log("Removed loading widget")
-                            except Exception as e:
-                                log(f"Error removing loading widget: {str(e)}", 'warning')
-                        
-                        # Clear any existing content in the container
-                        container.remove_children()
-                        log("Cleared container children")
-                        
-                        # Mount the branch selector directly in the container
-                        container.mount(branch_selector)
-                        log("Branch selector mounted successfully")
-                        
-                        # Set focus to the branch selector if it has a focusable element
-                        if hasattr(branch_selector, 'focus'):
-                            branch_selector.focus()
-                        
-                    except Exception as e:
-                        error_msg = f"Failed to mount branch selector: {str(e)}"
-                        log(error_msg, 'error')
-                        log(traceback.format_exc(), 'error')
-                        self._show_error_in_ui(container, "Failed to load branch list. Check logs for details.")
-                
-                # Verify we have a valid container before scheduling the update
-                if container and hasattr(container, 'mount'):
-                    log("Scheduling branch selector mount...")
-                    self.call_after_refresh(safe_mount)
-                else:
-                    log(f"Invalid container for mounting: {container}", 'error')
-                    self._show_error_in_ui(container, "UI Error: Invalid container")
-                    
-                return  # Successfully scheduled mount
-                
-            except Exception as e:
-                error_msg = f"Error in repository processing: {str(e)}"
-                log(error_msg, 'error')
-                log(traceback.format_exc(), 'error')
-                self.call_after_refresh(
-                    lambda: self._show_error_in_ui(container, f"Error: {str(e)}")
-                )
-        except Exception as outer_e:
-            error_msg = f"Unexpected error in _process_repository: {str(outer_e)}"
-            logging.error(error_msg)
-            logging.error(traceback.format_exc())
-            self.call_after_refresh(
-                lambda: self._show_error_in_ui(container, "An unexpected error occurred. Please check the logs.")
-            )
-                
-    def mount_branch_selector(self, branch_selector, container, loading_widget):
-        """Safely mount the branch selector and remove loading widget"""
-        # Configure logging for this method
-        logging.basicConfig(filename="branch_selector_debug.log", level=logging.DEBUG, filemode="a")
-        
-        def log(msg: str, level: str = 'info') -> None:
-            """Helper function for consistent logging format"""
-            log_msg = f"[UI Thread][mount_branch_selector] {msg}"
-            if level == 'error':
-                logging.error(log_msg)
-            elif level == 'warning':
-                logging.warning(log_msg)
-            else:
-                logging.info(log_msg)
-            print(log_msg)  # Also print to console for immediate feedback
-            
-        log("=== STARTING BRANCH SELECTOR MOUNT ===")
-        log(f"Container type: {type(container).__name__}")
-        log(f"Container ID: {getattr(container, 'id', 'N/A')}")
-        log(f"Container classes: {getattr(container, 'classes', 'N/A')}")
-        if container and hasattr(container, 'children'):
-            children_info = []
-            for c in container.children:
-                child_type = type(c).__name__
-                child_id = getattr(c, 'id', 'N/A')
-                children_info.append(f"{child_type}(id={child_id})")
-            log(f"Container children: {children_info}" if children_info else "Container has no children")
-        else:
-            log("Container has no children or is invalid")
-        log(f"Loading widget type: {type(loading_widget).__name__ if loading_widget else 'None'}")
-        log(f"Loading widget ID: {getattr(loading_widget, 'id', 'N/A') if loading_widget else 'N/A'}")
-        log(f"Branch selector type: {type(branch_selector).__name__}")
-        log(f"Branch selector ID: {getattr(branch_selector, 'id', 'N/A')}")
-        log(f"Branch selector has mount: {hasattr(branch_selector, 'mount')}")
-        log(f"Branch selector branches: {getattr(branch_selector, 'branches', 'N/A')}" if hasattr(branch_selector, 'branches') else 'Branch selector has no branches attribute')
-        
-        try:
-            # Remove loading widget if it exists
-            if loading_widget is not None:
-                log(f"\n=== PROCESSING LOADING WIDGET ===")
-                log(f"Widget type: {type(loading_widget).__name__}")
-                log(f"Widget ID: {getattr(loading_widget, 'id', 'N/A')}")
-                log(f"Widget parent: {getattr(loading_widget, 'parent', 'None')}")
-                
-                try:
-                    widget_removed = False
-                    
-                    # First check if widget is mounted in container
-                    if container and hasattr(container, 'children'):
-                        log(f"Container has {len(container.children)} children")
-                        children_list = []
-                        for c in container.children:
-                            child_type = type(c).__name__
-                            child_id = getattr(c, 'id', 'N/A')
-                            children_list.append(f"{child_type}(id={child_id})")
-                        log(f"Container children: {children_list}")
-                        
-                        if loading_widget in container.children:
-                            log("Loading widget found in container, removing...")
-                            try:
-                                # Create a list of children to keep (excluding the loading widget)
-                                children_to_keep = [c for c in container.children if c != loading_widget]
-                                log(f"Will keep {len(children_to_keep)} children after removing loading widget")
-                                
-                                # Clear all children
-                                container.remove_children()
-                                log("All children removed from container")
-                                
-                                # Re-add non-loading widgets
-                                if children_to_keep:
-                                    log(f"Re-adding {len(children_to_keep)} non-loading widgets")
-                                    for child in children_to_keep:
-                                        try:
-                                            container.mount(child)
-                                            log(f"Re-added child: {type(child).__name__}(id={getattr(child, 'id', 'N/A')})")
-                                        except Exception as mount_error:
-                                            log(f"Error re-adding child: {str(mount_error)}", 'error')
-                                
-                                widget_removed = True
-                                log("Loading widget removed from container")
-                                
-                            except Exception as remove_error:
-                                log(f"Error removing loading widget: {str(remove_error)}", 'error')
-                                log(traceback.format_exc(), 'error')
-                    
-                    # If not removed from container, try removing from parent
-                    if not widget_removed and hasattr(loading_widget, 'parent') and loading_widget.parent is not None:
-                        parent = loading_widget.parent
-                        log(f"Loading widget has parent: {type(parent).__name__}")
-                        if hasattr(parent, 'children'):
-                            try:
-                                # Remove the widget by clearing children and re-adding any non-loading widgets
-                                children = list(parent.children)
-                                parent.remove_children()
-                                for child in children:
-                                    if child != loading_widget:
-                                        parent.mount(child)
-                                log("Loading widget removed from parent")
-                                widget_removed = True
-                            except Exception as remove_error:
-                                log(f"Error removing from parent: {str(remove_error)}", 'error')
-                    
-                    if not widget_removed:
-                        log("Loading widget not found in container or parent", 'warning')
-                        # As a last resort, try to clear all children
-                        try:
-                            container.remove_children()
-                            log("Cleared all children from container as fallback")
-                            widget_removed = True
-                        except Exception as e:
-                            log(f"Failed to clear container: {str(e)}", 'error')
-                except Exception as remove_error:
-                    log(f"Error removing loading widget: {str(remove_error)}", 'error')
-                    log(traceback.format_exc(), 'error')
-            else:
-                log("No loading widget to process")
-            
-            # Mount the branch selector
-            log("Preparing to mount branch selector...")
-            log(f"Branch selector children: {[type(c).__name__ for c in branch_selector.children] if hasattr(branch_selector, 'children') else 'N/A'}")
-            
-            # Check if branch selector is already mounted
-            if hasattr(branch_selector, 'parent') and branch_selector.parent is not None:
-                log(f"Branch selector already has parent: {type(branch_selector.parent).__name__}")
-                if hasattr(branch_selector.parent, 'remove_child'):
-                    log("Removing branch selector from current parent...")
-                    branch_selector.parent.remove_child(branch_selector)
-            
-            # Clear container before mounting new content
-            try:
-                log("Clearing container children...")
-                container.remove_children()
-                log(f"Container cleared. New children: {[type(c).__name__ for c in container.children]}")
-            except Exception as clear_error:
-                log(f"Warning: Failed to clear container: {str(clear_error)}", 'warning')
-            
-            # Mount the branch selector
-            log("Mounting branch selector...")
-            try:
-                # Ensure container is mounted and has a screen
-                if not hasattr(container, 'mount'):
-                    raise Exception("Container does not have mount method")
-                
-                # Clear container first
-                container.remove_children()
-                
-                # Mount the branch selector
-                container.mount(branch_selector)
-                log(f"Branch selector mounted successfully. Container children: {[type(c).__name__ for c in container.children]}")
-                
-                # Verify the branch selector is in the container
-                if branch_selector not in container.children:
-                    error_msg = "Failed to mount branch selector: not found in container after mount"
-                    log(error_msg, 'error')
-                    raise Exception(error_msg)
-                
-                # Force a layout refresh
-                log("Refreshing layout...")
-                try:
-                    self.refresh(layout=True)
-                    log("Layout refresh completed")
-                except Exception as refresh_error:
-                    log(f"Warning: Error during layout refresh: {str(refresh_error)}", 'warning')
-                    log(traceback.format_exc(), 'warning')
-                
-                # Try to focus the list view inside the branch selector
-                try:
-                    list_view = branch_selector.query_one("#branch_list")
-                    if list_view and hasattr(list_view, 'focus'):
-                        list_view.focus()
-                        log("Focused branch list view")
-                    else:
-                        # If no list view, try to focus the branch selector itself
-                        branch_selector.focus()
-                        log("Focused branch selector")
-                except Exception as focus_error:
-                    log(f"Warning: Could not focus list view or branch selector: {str(focus_error)}", 'warning')
-                
-            except Exception as mount_error:
-                error_msg = f"Failed to mount branch selector: {str(mount_error)}"
-                log(error_msg, 'error')
-                log(traceback.format_exc(), 'error')
-                raise
-            
-            log("Branch selector mount completed successfully")
-            return True
-            
-        except Exception as e:
-            error_msg = f"Critical error in mount_branch_selector: {str(e)}"
-            log(error_msg, 'error')
-            log(traceback.format_exc(), 'error')
-            
-            # Try to show error in UI if possible
-            try:
-                self._show_error_in_ui(container, "Failed to load branch list. Please check logs.")
-            except Exception as ui_error:
-                log(f"Failed to show error in UI: {str(ui_error)}", 'error')
-            
-            # Re-raise to allow caller to handle the error
-            raise
-            
-        finally:
-            log("=== BRANCH SELECTOR MOUNT PROCESS COMPLETE ===")
-
-    def on_repo_selected(self, repo: str) -> None:
-        """Handle repository selection"""
-        def log(msg: str, level: str = 'info') -> None:
-            """Helper function for consistent logging format"""
-            log_msg = f"[UI Thread] {msg}"
-            if level == 'error':
-                logging.error(log_msg)
-            elif level == 'warning':
-                logging.warning(log_msg)
-            else:
-                logging.info(log_msg)
-            print(log_msg)  # Also print to console for immediate feedback
-        
-        # Configure logging
-        logging.basicConfig(
-            filename="repo_debug.log", 
-            level=logging.DEBUG, 
-            filemode="a",
-            format='%(asctime)s - %(levelname)s - %(message)s'
-        )
-        
-        log(f"=== REPOSITORY SELECTED: {repo} ===")
-        log(f"Current thread: {threading.current_thread().name}")
-        log(f"Is main thread: {threading.current_thread() is threading.main_thread()}")
-        
-        try:
-            # Get the container where we'll show the loading widget and branch selector
-            container = self.query_one("#main_container")
-            if not container:
-                error_msg = "Error: Could not find main container"
-                log(error_msg, 'error')
-                self._show_error_in_ui(None, error_msg)
-                return
-                
-            log(f"Found container: {container}")
-            
-            # Create and show loading widget
-            loading = Label("Fetching repository data...", id="loading-widget")
-            log("Created loading widget")
-            
-            # Clear the container and show loading
-            try:
-                # Clear existing children
-                container.remove_children()
-                container.mount(loading)
-                log("Mounted loading widget")
-                
-                # Force a UI refresh to show the loading widget
-                self.refresh()
-                log("Forced UI refresh after mounting loading widget")
-                
-            except Exception as e:
-                error_msg = f"Error updating UI: {str(e)}"
-                log(error_msg, 'error')
-                log(traceback.format_exc(), 'error')
-                self._show_error_in_ui(container, "Failed to initialize UI")
-                return
-                
-            # Start repository processing in a background thread
-            log("Starting repository processing in background thread...")
-            
-            try:
-                thread = threading.Thread(
-                    target=self._process_repository,
-                    args=(repo, container, loading),
-                    daemon=True,
-                    name=f"RepoProcessor-{repo}"
-                )
-                thread.start()
-                log(f"Started background thread: {thread.name}")
-                
-                # Set a timer to check if the thread is still alive after a delay
-                def check_thread_status():
-                    if thread.is_alive():
-                        log("Background thread is still running after delay", 'warning')
-                        # If thread is stuck, show an error to the user
-                        self.call_after_refresh(
-                            lambda: self._show_error_in_ui(
-                                container,
-                                "Repository processing is taking longer than expected. Please check your connection and try again."
-                            )
-                        )
-                    else:
-                        log("Background thread completed successfully")
-                
-                # Check after 15 seconds
-                timer = threading.Timer(15.0, check_thread_status)
-                timer.daemon = True
-                timer.start()
-                log("Started thread status check timer")
-                
-            except Exception as e:
-                error_msg = f"Failed to start repository processing: {str(e)}"
-                log(error_msg, 'error')
-                log(traceback.format_exc(), 'error')
-                self._show_error_in_ui(container, "Failed to start repository processing")
-            
-            # Update config with the selected repository
-            try:
-                log(f"Updating config file at {CONFIG_PATH}")
-                with open(CONFIG_PATH, "w") as f:
-                    json.dump({"selected_repository": repo}, f, indent=2)
-                log("Successfully updated config file")
-            except Exception as e:
-                error_msg = f"Error updating config: {str(e)}"
-                log(error_msg, 'error')
-                log(traceback.format_exc(), 'error')
-                
-        except Exception as e:
-            error_msg = f"Error in on_repo_selected: {str(e)}"
-            log(error_msg, 'error')
-            log(traceback.format_exc(), 'error')
-            self._show_error_in_ui(None, f"Error: {error_msg}")
-            # Use call_after_refresh to ensure UI updates happen in the main thread
-            self.call_after_refresh(lambda: self._show_error_in_ui(None, error_msg))
-            return
-            
-            log("Locating main container...")
-            container = self.query_one("#main_container")
-            if not container:
-                error_msg = "Could not find #main_container in UI"
-                log(error_msg, 'error')
-                return
-            
-            log("Clearing existing widgets...")
-            try:
-                container.remove_children()
-                log("Container cleared successfully")
-            except Exception as e:
-                log(f"Warning: Failed to clear container: {str(e)}", 'warning')
-            
-            # Show loading message
-            log("Mounting loading widget...")
-            loading = Static("Loading repository data...", id="loading-widget")
-            try:
-                container.mount(loading)
-                log("Loading widget mounted successfully")
-                self.call_after_refresh(lambda: log("Loading message confirmed visible in UI"))
-            except Exception as e:
-                log(f"Failed to mount loading widget: {str(e)}", 'error')
-                log(traceback.format_exc(), 'error')
-            
-            # Start the background task
-            log("Preparing to start background thread...")
-            try:
-                import threading
-                log("Creating background thread...")
-                thread = threading.Thread(
-                    target=self._process_repository,
-                    args=(repo, container, loading),
-                    daemon=True,
-                    name=f"RepoProcessor-{repo}"
-                )
-                
-                log(f"Starting background thread: {thread.name}")
-                thread.start()
-                log(f"Background thread started (alive: {thread.is_alive()})")
-                
-                # Add a timeout check for the thread
-                def check_thread():
-                    if thread.is_alive():
-                        log("Background thread is still running - possible hang detected", 'warning')
-                        self.call_after_refresh(
-                            lambda: self._show_error_in_ui(
-                                container, 
-                                "Repository processing is taking too long. Please try again."
-                            )
-                        )
-                    else:
-                        log("Background thread completed successfully")
-                
-                # Schedule a check after 30 seconds
-                from threading import Timer
-                timer = Timer(30.0, check_thread)
-                timer.daemon = True
-                timer.start()
-                log(f"Thread timeout check scheduled in 30 seconds (timer alive: {timer.is_alive()})")
-                
-            except Exception as e:
-                error_msg = f"Failed to start repository processing: {str(e)}"
-                log(error_msg, 'error')
-                log(traceback.format_exc(), 'error')
-                self.call_after_refresh(lambda: self._show_error_in_ui(container, error_msg))
-                
-        except Exception as e:
-            error_msg = f"Unexpected error in repository selection: {str(e)}"
-            log(error_msg, 'error')
-            log(traceback.format_exc(), 'error')
-            try:
-                self.call_after_refresh(lambda: self._show_error_in_ui(container, error_msg))
-            except Exception as ui_error:
-                log(f"Failed to show error in UI: {str(ui_error)}", 'error')
-        
-        log("=== REPOSITORY SELECTION PROCESS COMPLETE ===")
+def main() -> None:
+    """Configure logging once and run the app."""
+    setup_logging(read_config().get("log_level"))
+    PRManagerApp().run()
 
-    def show_repo_selector(self) -> None:
-        container = self.query_one("#main_container")
-        try:
-            branch_list = container.query(BranchSelector).first()
-            self.call_after_refresh(branch_list.remove)
-        except NoMatches:
-            pass
-        container.remove_children()
-        container.mount(RepoSelectionWidget(self.selected_repo.split("/")[0], self.on_repo_selected))
 
 if __name__ == "__main__":
-    print("DEBUG: main.py starting up")
-    PRManagerApp().run()
-    print("DEBUG: PRManagerApp has exited")
+    main()
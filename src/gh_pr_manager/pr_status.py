@@ -0,0 +1,80 @@
+"""Background polling of pull request and check status for a repository.
+
+One :func:`github_client.get_pull_statuses` call covers every branch. The
+interval adapts: short while checks are running, longer when nothing
+changes, and backing off after failures.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from typing import Callable, Optional
+
+from . import github_client, tasks, tracing
+from .github_client import PullStatus
+
+#: Seconds between polls while any check is pending.
+FAST_INTERVAL = 15.0
+#: Seconds between polls after a change with no pending checks.
+NORMAL_INTERVAL = 60.0
+#: Upper bound the interval backs off to when nothing changes.
+SLOW_INTERVAL = 300.0
+
+#: ``{branch: status}``; ``None`` means the branch no longer has an open PR.
+StatusChanges = dict[str, Optional[PullStatus]]
+
+
+class StatusPoller:
+    """Poll PR status for ``repo`` and report only what changed."""
+
+    def __init__(self, repo: str, on_change: Callable[[StatusChanges], None]):
+        self.repo = repo
+        self.on_change = on_change
+        self.statuses: dict[str, PullStatus] = {}
+        self.interval = FAST_INTERVAL
+        self._stop = threading.Event()
+
+    def poll_once(self) -> Optional[StatusChanges]:
+        """Fetch statuses, update :attr:`interval` and return the changes.
+
+        Returns ``None`` if the request failed.
+        """
+        latest = github_client.get_pull_statuses(self.repo)
+        if latest is None:
+            self.interval = min(self.interval * 2, SLOW_INTERVAL)
+            return None
+        changes: StatusChanges = {
+            branch: status for branch, status in latest.items() if self.statuses.get(branch) != status
+        }
+        changes.update((branch, None) for branch in self.statuses if branch not in latest)
+        self.statuses = latest
+        if any(status.pending for status in latest.values()):
+            self.interval = FAST_INTERVAL
+        elif changes:
+            self.interval = NORMAL_INTERVAL
+        else:
+            self.interval = min(self.interval * 2, SLOW_INTERVAL)
+        return changes
+
+    def start(self) -> "StatusPoller":
+        self._schedule(0.0)
+        return self
+
+    def stop(self) -> None:
+        """Stop polling; a poll already scheduled is dropped when due."""
+        self._stop.set()
+
+    def _schedule(self, delay: float) -> None:
+        tasks.pool.submit(self._poll, name=f"poll PR status {self.repo}", delay=delay, cancel=self._stop)
+
+    def _poll(self) -> None:
+        try:
+            with tracing.span("pr_status.poll", repo=self.repo, interval=self.interval):
+                changes = self.poll_once()
+            if changes and not self._stop.is_set():
+                self.on_change(changes)
+        except Exception:
+            logging.exception("Polling PR status for %s failed", self.repo)
+        if not self._stop.is_set():
+            self._schedule(self.interval)
@@ -0,0 +1,220 @@
+"""Central pacing of GitHub API traffic.
+
+Every request made on behalf of the app goes through :data:`scheduler`. It
+spaces requests with a token bucket, keeps the last ``x-ratelimit-*``
+values per resource (``core``, ``graphql``, ...), waits for the reset when
+a budget is exhausted, and retries rate-limited requests after
+``Retry-After`` or an exponential backoff. Content-creating requests are
+additionally kept at least :data:`WRITE_INTERVAL` apart, as GitHub asks in
+its secondary rate limit guidance.
+
+A request gives up rather than wait longer than :data:`MAX_WAIT` in total,
+or :data:`INTERACTIVE_MAX_WAIT` when it is made on an event loop thread,
+where sleeping would freeze the UI.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Mapping, Optional
+
+from . import tracing
+
+#: Sustained requests per second allowed by the token bucket.
+DEFAULT_RATE = 5.0
+#: Requests that may be sent back to back before pacing kicks in.
+DEFAULT_BURST = 10
+#: Minimum seconds between content-creating requests.
+WRITE_INTERVAL = 1.0
+#: Retries of a rate-limited request before giving up.
+MAX_RETRIES = 3
+#: Backoff for rate limits that do not say how long to wait.
+BASE_BACKOFF = 60.0
+MAX_BACKOFF = 900.0
+#: Longest a request waits for rate limits, in total, before it fails.
+MAX_WAIT = 300.0
+#: Same for requests made on an event loop thread.
+INTERACTIVE_MAX_WAIT = 1.0
+#: Waits at least this long are reported to :attr:`RateLimitScheduler.on_wait`.
+NOTIFY_WAIT = 5.0
+
+_LIMITED_RE = re.compile(r"rate limit|RATE_LIMITED|abuse detection|HTTP 429", re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class Budget:
+    """Rate limit state of one API resource as last reported by GitHub."""
+
+    resource: str
+    limit: int
+    remaining: int
+    reset: float
+    used: int = 0
+
+
+class RateLimitScheduler:
+    """Token bucket plus GitHub rate limit bookkeeping; thread safe."""
+
+    def __init__(
+        self,
+        rate: float = DEFAULT_RATE,
+        burst: int = DEFAULT_BURST,
+        write_interval: float = WRITE_INTERVAL,
+        max_retries: int = MAX_RETRIES,
+        max_wait: float = MAX_WAIT,
+        clock: Callable[[], float] = time.monotonic,
+        wall_clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.write_interval = write_interval
+        self.max_retries = max_retries
+        self.max_wait = max_wait
+        #: Called as ``on_wait(resource, seconds)`` from the waiting thread
+        #: before a long wait, so the UI can tell the user.
+        self.on_wait: Optional[Callable[[str, float], None]] = None
+        self._clock = clock
+        self._wall_clock = wall_clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = float(burst)
+        self._refilled = clock()
+        self._next_write = 0.0
+        self._budgets: dict[str, Budget] = {}
+
+    # -- budgets ------------------------------------------------------------
+
+    def observe(self, headers: Mapping[str, str]) -> Optional[Budget]:
+        """Record the ``x-ratelimit-*`` values from response ``headers``."""
+        try:
+            budget = Budget(
+                resource=headers.get("x-ratelimit-resource", "core"),
+                limit=int(headers["x-ratelimit-limit"]),
+                remaining=int(headers["x-ratelimit-remaining"]),
+                reset=float(headers["x-ratelimit-reset"]),
+                used=int(headers.get("x-ratelimit-used", 0)),
+            )
+        except (KeyError, ValueError):
+            return None
+        with self._lock:
+            self._budgets[budget.resource] = budget
+        return budget
+
+    def budget(self, resource: str = "core") -> Optional[Budget]:
+        """Return the last known budget of ``resource``, if any."""
+        with self._lock:
+            budget = self._budgets.get(resource)
+        if budget and budget.reset <= self._wall_clock():
+            return None  # the window has rolled over; the numbers are stale
+        return budget
+
+    def can_afford(self, requests: int, resource: str = "core") -> bool:
+        """Whether ``requests`` more calls fit in the known budget."""
+        budget = self.budget(resource)
+        return budget is None or budget.remaining >= requests
+
+    # -- pacing -------------------------------------------------------------
+
+    def acquire(
+        self, resource: str = "core", write: bool = False, max_wait: Optional[float] = None
+    ) -> Optional[float]:
+        """Block until a request to ``resource`` may be sent.
+
+        Returns the number of seconds waited, or ``None`` without waiting
+        or taking a slot if that would take longer than ``max_wait``.
+        """
+        budget = self.budget(resource)
+        wait = budget.reset - self._wall_clock() if budget is not None and budget.remaining <= 0 else 0.0
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._refilled) * self.rate)
+            self._refilled = now
+            if self._tokens < 1:
+                wait = max(wait, (1 - self._tokens) / self.rate)
+            if write:
+                wait = max(wait, self._next_write - now)
+            if max_wait is not None and wait > max_wait:
+                return None
+            self._tokens -= 1
+            if write:
+                self._next_write = now + wait + self.write_interval
+        if wait > 0:
+            self._pause(resource, wait)
+        return max(wait, 0.0)
+
+    def _pause(self, resource: str, seconds: float) -> None:
+        if seconds >= NOTIFY_WAIT and self.on_wait is not None:
+            self.on_wait(resource, seconds)
+        self._sleep(seconds)
+
+    def retry_delay(
+        self, success: bool, output: str, status: int, headers: Mapping[str, str], attempt: int
+    ) -> Optional[float]:
+        """Return how long to wait before retrying, or ``None`` if not limited."""
+        limited = status in (403, 429) and (
+            "retry-after" in headers or headers.get("x-ratelimit-remaining") == "0" or _LIMITED_RE.search(output)
+        )
+        limited = limited or (not success and _LIMITED_RE.search(output)) or '"RATE_LIMITED"' in output
+        if not limited:
+            return None
+        if "retry-after" in headers:
+            try:
+                return float(headers["retry-after"])
+            except ValueError:
+                pass
+        if headers.get("x-ratelimit-remaining") == "0" and "x-ratelimit-reset" in headers:
+            return max(float(headers["x-ratelimit-reset"]) - self._wall_clock(), 0.0) + 1.0
+        return min(BASE_BACKOFF * 2 ** attempt, MAX_BACKOFF)
+
+    def call(
+        self,
+        run: Callable[[], tuple[bool, str]],
+        resource: str = "core",
+        write: bool = False,
+        parse: Optional[Callable[[str], tuple[int, dict[str, str]]]] = None,
+    ) -> tuple[bool, str]:
+        """Run the request ``run`` under the limits, retrying when throttled.
+
+        ``parse`` extracts ``(status, headers)`` from the output so budgets
+        can be tracked; without it only error text is inspected. Fails
+        instead of waiting longer than :attr:`max_wait` in total, or
+        :data:`INTERACTIVE_MAX_WAIT` on an event loop thread.
+        """
+        limit = min(self.max_wait, INTERACTIVE_MAX_WAIT) if _on_event_loop() else self.max_wait
+        attempt = 0
+        with tracing.span("api.request", resource=resource, write=write) as span:
+            waited = 0.0
+            while True:
+                wait = self.acquire(resource, write, limit - waited)
+                if wait is None:
+                    span.attrs.update(attempts=attempt, waited=round(waited, 3), gave_up=True)
+                    return False, f"GitHub {resource} rate limit: not waiting more than {limit:g}s"
+                waited += wait
+                success, output = run()
+                status, headers = parse(output) if parse else (0, {})
+                self.observe(headers)
+                delay = self.retry_delay(success, output, status, headers, attempt)
+                span.attrs.update(status=status, attempts=attempt + 1, waited=round(waited, 3))
+                if delay is None or attempt >= self.max_retries or waited + delay > limit:
+                    return success, output
+                attempt += 1
+                waited += delay
+                self._pause(resource, delay)
+
+
+def _on_event_loop() -> bool:
+    """Whether the calling thread is running an asyncio event loop."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+#: Scheduler shared by all GitHub traffic of the app.
+scheduler = RateLimitScheduler()
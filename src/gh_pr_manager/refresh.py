@@ -0,0 +1,180 @@
+"""Refreshing the branch list of a repository as a sequence of timed stages.
+
+A refresh makes at most one network round trip: a ``git fetch --prune``
+when a cached clone exists, otherwise a remote listing. Branches of a clone,
+with their commit metadata, are read from a single ``git for-each-ref``; the
+working tree is never consulted. Ahead/behind counts are left for the
+branch view to compute later.
+
+:class:`Prefetcher` runs a pipeline speculatively, e.g. for the repository
+selected in the previous session, and can be cancelled between stages.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator, Optional
+
+from . import branches, repo_cache, tasks, tracing
+from .branch_info import BranchInfo, scan_branches
+
+#: Seconds between checks of the caller's cancel event in :meth:`Prefetcher.result`.
+_POLL_INTERVAL = 0.1
+
+
+@dataclass
+class StageTiming:
+    """Wall time of one pipeline stage."""
+
+    name: str
+    seconds: float
+    ok: bool = True
+
+
+@dataclass
+class RefreshPipeline:
+    """Refresh the branches of ``repo`` and record how long each stage took."""
+
+    repo: str
+    timings: list[StageTiming] = field(default_factory=list)
+    #: When set, remaining stages are skipped and :meth:`run` returns ``None``.
+    cancel: Optional[threading.Event] = None
+    #: Branch metadata from the last run; only available for cached clones.
+    info: Optional[list[BranchInfo]] = None
+
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel is not None and self.cancel.is_set()
+
+    @contextmanager
+    def _stage(self, name: str) -> Iterator[StageTiming]:
+        timing = StageTiming(name, 0.0)
+        start = time.perf_counter()
+        with tracing.span(f"refresh.{name}", repo=self.repo) as span:
+            try:
+                yield timing
+            except BaseException:
+                timing.ok = False
+                raise
+            finally:
+                timing.seconds = time.perf_counter() - start
+                span.attrs["ok"] = timing.ok
+                self.timings.append(timing)
+
+    def run(self) -> Optional[dict[str, str]]:
+        """Return ``{branch: head sha}``, or ``None`` if listing failed.
+
+        A failed fetch is not fatal: the refs already in the clone are used.
+        """
+        with tracing.span("refresh", repo=self.repo):
+            return self._run()
+
+    def _run(self) -> Optional[dict[str, str]]:
+        self.timings.clear()
+        self.info = None
+        if self.cancelled:
+            return None
+        with repo_cache.clone_cache.use(self.repo):
+            heads = self._refresh(repo_cache.clone_path(self.repo))
+        logging.info("Refreshed %s: %s", self.repo, self.summary())
+        return heads
+
+    def _refresh(self, path: Path) -> Optional[dict[str, str]]:
+        if not path.exists():
+            with self._stage("list-remote") as stage:
+                heads = branches.list_remote_branches(self.repo)
+                stage.ok = heads is not None
+            return heads
+        with self._stage("fetch") as stage:
+            stage.ok, _ = repo_cache.update_clone(self.repo)
+        if self.cancelled:
+            return None
+        with self._stage("for-each-ref") as stage:
+            self.info = scan_branches(path, with_counts=False)
+            heads = {i.name: i.sha for i in self.info} if self.info is not None else None
+            stage.ok = heads is not None
+        return heads
+
+    @property
+    def total(self) -> float:
+        return sum(t.seconds for t in self.timings)
+
+    def summary(self) -> str:
+        """Return e.g. ``"fetch 0.412s, for-each-ref 0.008s (total 0.420s)"``."""
+        parts = [
+            f"{t.name} {t.seconds:.3f}s" + ("" if t.ok else " (failed)")
+            for t in self.timings
+        ]
+        return f"{', '.join(parts)} (total {self.total:.3f}s)"
+
+
+class Prefetcher:
+    """Refresh ``repo`` on the task pool ahead of it being selected.
+
+    Interactive work takes precedence: callers either adopt the prefetch
+    for the same repository through :meth:`result` or :meth:`cancel` it.
+    """
+
+    def __init__(self, repo: str):
+        self.repo = repo
+        self._cancel = threading.Event()
+        self._done = threading.Event()
+        self._pipeline = RefreshPipeline(repo, cancel=self._cancel)
+        self._heads: Optional[dict[str, str]] = None
+
+    def start(self) -> "Prefetcher":
+        tasks.pool.submit(self._run, name=f"prefetch {self.repo}", cancel=self._cancel)
+        return self
+
+    def _run(self) -> None:
+        try:
+            with tracing.span("refresh.prefetch", repo=self.repo):
+                self._heads = self._pipeline.run()
+        except Exception:
+            logging.exception("Prefetch of %s failed", self.repo)
+        finally:
+            self._done.set()
+
+    def cancel(self) -> None:
+        """Stop after the running stage and discard the result."""
+        self._cancel.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    @property
+    def info(self) -> Optional[list[BranchInfo]]:
+        return self._pipeline.info if self.done and not self.cancelled else None
+
+    def result(
+        self, timeout: Optional[float] = None, cancel: Optional[threading.Event] = None
+    ) -> Optional[dict[str, str]]:
+        """Wait for the prefetch and return its branches.
+
+        Returns ``None`` if it was cancelled, failed or did not finish in time.
+        Once ``cancel`` is set the wait ends and the prefetch is cancelled.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        # A prefetch cancelled while still queued never runs at all.
+        while not self.cancelled and not self._done.is_set():
+            if cancel is not None and cancel.is_set():
+                self.cancel()
+                break
+            wait = _POLL_INTERVAL if cancel is not None else None
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                wait = remaining if wait is None else min(wait, remaining)
+            self._done.wait(wait)
+        return None if self.cancelled else self._heads
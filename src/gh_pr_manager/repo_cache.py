@@ -0,0 +1,345 @@
+"""Local clones of GitHub repositories under ``~/.cache/gh_pr_manager``.
+
+Clones are only created when an operation needs a local repository;
+listing branches does not. Cached clones are bare, partial
+(``--filter=blob:none``) repositories: the tool only needs refs and commit
+history, so no working tree is checked out and file contents are only
+downloaded if a command actually reads them. Remote branches are kept under
+``refs/remotes/origin/`` and updated with a fetch-only refspec.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from . import tasks, tracing, utils
+
+#: Partial clone filter used for cached clones.
+CLONE_FILTER = "blob:none"
+
+#: Default total size budget of all cached clones.
+DEFAULT_MAX_BYTES = 5 * 1024 ** 3
+#: Default maximum number of cached clones.
+DEFAULT_MAX_ENTRIES = 50
+
+#: ``git -c`` options that let ``gh`` answer credential requests.
+GH_CREDENTIAL_ARGS = [
+    "-c", "credential.helper=",
+    "-c", "credential.helper=!gh auth git-credential",
+]
+
+
+def remote_url(repo: str) -> str:
+    """Return the HTTPS URL of ``owner/name`` on GitHub."""
+    return f"https://github.com/{repo}.git"
+
+
+def cache_root() -> Path:
+    """Return the directory holding cached clones."""
+    return Path.home() / ".cache" / "gh_pr_manager"
+
+
+def clone_path_in(root: Path, repo: str) -> Path:
+    """Return where the clone of ``repo`` lives below ``root``."""
+    return root / repo.replace("/", "_")
+
+
+def clone_path(repo: str) -> Path:
+    """Return where the clone of ``owner/name`` lives in the cache."""
+    return clone_path_in(cache_root(), repo)
+
+
+def _git(path: Path, *args: str) -> tuple[bool, str]:
+    return utils.run_cmd(["git", "-C", str(path), *args])
+
+
+_clone_locks: defaultdict[str, threading.Lock] = defaultdict(threading.Lock)
+_clone_locks_lock = threading.Lock()
+
+
+def _clone_lock(repo: str) -> threading.Lock:
+    with _clone_locks_lock:
+        return _clone_locks[repo]
+
+
+@tracing.traced("clone.ensure", "repo")
+def ensure_clone(repo: str) -> tuple[Optional[Path], str]:
+    """Return the path of a local clone of ``repo``, cloning it if needed.
+
+    A new clone is a bare repository whose ``origin`` maps
+    ``refs/heads/*`` to ``refs/remotes/origin/*``. It is populated by a
+    single blobless fetch. On failure the path is ``None``, the second item
+    holds the error, and any partial directory is removed.
+
+    Concurrent calls for the same repository clone it once. The clone is
+    built in a hidden directory and renamed into place when complete, so
+    nobody sees a half-fetched clone at :func:`clone_path`.
+    """
+    path = clone_path(repo)
+    with _clone_lock(repo):
+        if path.exists():
+            clone_cache.touch(repo)
+            return path, ""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".cloning-{path.name}-{time.time_ns()}")
+        steps = [
+            ["git", "init", "--bare", "-q", str(tmp)],
+            ["git", "-C", str(tmp), "remote", "add", "origin", remote_url(repo)],
+            ["git", "-C", str(tmp), "config", "remote.origin.promisor", "true"],
+            ["git", "-C", str(tmp), "config", "remote.origin.partialclonefilter", CLONE_FILTER],
+            ["git", "-C", str(tmp), "config", "--add", "credential.helper", ""],
+            ["git", "-C", str(tmp), "config", "--add", "credential.helper", "!gh auth git-credential"],
+            ["git", "-C", str(tmp), "fetch", "--quiet", f"--filter={CLONE_FILTER}", "origin"],
+        ]
+        for cmd in steps:
+            success, output = utils.run_cmd(cmd)
+            if not success:
+                shutil.rmtree(tmp, ignore_errors=True)
+                return None, output
+        try:
+            os.rename(tmp, path)
+        except OSError as exc:
+            shutil.rmtree(tmp, ignore_errors=True)
+            return None, str(exc)
+    clone_cache.touch(repo, fetched=True)
+    return path, ""
+
+
+@tracing.traced("clone.update", "repo")
+def update_clone(repo: str) -> tuple[bool, str]:
+    """Fetch new commits and prune deleted branches; never touches files."""
+    success, output = _git(clone_path(repo), "fetch", "--prune", "--quiet", "origin")
+    clone_cache.touch(repo, fetched=success)
+    return success, output
+
+
+def _dir_size(path: Path) -> int:
+    total = 0
+    for dirpath, _, filenames in os.walk(path):
+        for name in filenames:
+            try:
+                total += os.lstat(os.path.join(dirpath, name)).st_size
+            except OSError:
+                pass
+    return total
+
+
+def _is_clone(path: Path) -> bool:
+    return path.is_dir() and ((path / "HEAD").exists() or (path / ".git").exists())
+
+
+@dataclass
+class CloneEntry:
+    """Index record for one cached clone."""
+
+    repo: str
+    last_used: float = 0.0
+    last_fetch: float = 0.0
+    size: int = -1  # -1 means "needs measuring"
+    pinned: bool = False
+
+
+class CloneCache:
+    """LRU bookkeeping and eviction for the clone cache directory.
+
+    The index lives in ``clones.json`` next to the clones. Eviction removes
+    the least recently used unpinned clones until both ``max_bytes`` and
+    ``max_entries`` are respected, skipping clones that are in use. It runs
+    on the task pool after a clone is used.
+    """
+
+    def __init__(
+        self,
+        root: Optional[Path] = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        self._root = root
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._evict_task: Optional[tasks.Task] = None
+        self._evict_again = False
+        self._in_use: Counter[str] = Counter()
+        #: Repository open in the UI; its clone is never evicted.
+        self.selected: Optional[str] = None
+
+    @property
+    def root(self) -> Path:
+        return self._root or cache_root()
+
+    @property
+    def index_path(self) -> Path:
+        return self.root / "clones.json"
+
+    def _load(self) -> dict[str, CloneEntry]:
+        try:
+            raw = json.loads(self.index_path.read_text())
+            entries = {repo: CloneEntry(**data) for repo, data in raw.items()}
+        except (OSError, ValueError, TypeError):
+            entries = {}
+        # Adopt clones created before the index existed.
+        known = {clone_path_in(self.root, repo) for repo in entries}
+        try:
+            children = list(self.root.iterdir())
+        except OSError:
+            children = []
+        for child in children:
+            if child not in known and not child.name.startswith(".") and _is_clone(child):
+                repo = child.name.replace("_", "/", 1)
+                mtime = child.stat().st_mtime
+                entries[repo] = CloneEntry(repo, last_used=mtime, last_fetch=mtime)
+        return entries
+
+    def _save(self, entries: dict[str, CloneEntry]) -> None:
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            tmp = self.index_path.with_suffix(".tmp")
+            tmp.write_text(json.dumps({repo: asdict(e) for repo, e in entries.items()}, indent=2))
+            os.replace(tmp, self.index_path)
+        except OSError:
+            pass
+
+    def entries(self) -> dict[str, CloneEntry]:
+        """Return a snapshot of the index."""
+        with self._lock:
+            return self._load()
+
+    def touch(self, repo: str, fetched: bool = False) -> None:
+        """Record a use of ``repo`` and schedule eviction."""
+        now = time.time()
+        with self._lock:
+            entries = self._load()
+            entry = entries.setdefault(repo, CloneEntry(repo))
+            entry.last_used = now
+            if fetched:
+                entry.last_fetch = now
+                entry.size = -1
+            self._save(entries)
+        self.evict_in_background()
+
+    def pin(self, repo: str, pinned: bool = True) -> None:
+        """Exempt ``repo`` from eviction (or make it evictable again)."""
+        with self._lock:
+            entries = self._load()
+            entries.setdefault(repo, CloneEntry(repo)).pinned = pinned
+            self._save(entries)
+
+    def set_pinned(self, repos: Iterable[str]) -> None:
+        """Make exactly ``repos`` pinned."""
+        wanted = set(repos)
+        with self._lock:
+            entries = self._load()
+            for repo in wanted:
+                entries.setdefault(repo, CloneEntry(repo))
+            for repo, entry in entries.items():
+                entry.pinned = repo in wanted
+            self._save(entries)
+
+    @contextmanager
+    def use(self, repo: str) -> Iterator[None]:
+        """Keep the clone of ``repo`` from being evicted inside the block."""
+        with self._lock:
+            self._in_use[repo] += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._in_use[repo] -= 1
+                if not self._in_use[repo]:
+                    del self._in_use[repo]
+
+    @tracing.traced("clone.evict")
+    def evict(self) -> list[str]:
+        """Remove least recently used clones until within budget.
+
+        Returns the evicted repositories. Pinned clones, clones in
+        :meth:`use` and the :attr:`selected` repository are never removed.
+        Sizes are measured and directories deleted without holding the lock.
+        """
+        with self._lock:
+            unmeasured = [
+                repo for repo, entry in self._load().items()
+                if entry.size < 0 and clone_path_in(self.root, repo).exists()
+            ]
+        sizes = {repo: _dir_size(clone_path_in(self.root, repo)) for repo in unmeasured}
+
+        doomed: list[Path] = []
+        with self._lock:
+            entries = self._load()
+            for repo, entry in list(entries.items()):
+                if not clone_path_in(self.root, repo).exists():
+                    if not entry.pinned:
+                        del entries[repo]
+                    continue
+                if entry.size < 0:
+                    # Clones fetched again since measuring get measured next time.
+                    entry.size = sizes.get(repo, -1)
+            present = [e for e in entries.values() if clone_path_in(self.root, e.repo).exists()]
+            total = sum(max(e.size, 0) for e in present)
+            count = len(present)
+            evicted: list[str] = []
+            for entry in sorted(present, key=lambda e: e.last_used):
+                if total <= self.max_bytes and count <= self.max_entries:
+                    break
+                if entry.pinned or entry.repo in self._in_use or entry.repo == self.selected:
+                    continue
+                # Renaming is atomic, so nobody picks up a half-deleted clone.
+                path = clone_path_in(self.root, entry.repo)
+                trash = path.with_name(f".evicting-{path.name}-{time.time_ns()}")
+                try:
+                    os.rename(path, trash)
+                except OSError:
+                    continue
+                doomed.append(trash)
+                del entries[entry.repo]
+                total -= max(entry.size, 0)
+                count -= 1
+                evicted.append(entry.repo)
+            self._save(entries)
+        for trash in doomed:
+            shutil.rmtree(trash, ignore_errors=True)
+        return evicted
+
+    def evict_in_background(self) -> None:
+        """Run :meth:`evict` on the task pool, coalescing repeat requests."""
+        with self._lock:
+            if self._evict_task and not self._evict_task.future.done():
+                self._evict_again = True
+                return
+            self._evict_task = tasks.pool.submit(self._evict_loop, name="evict clone cache")
+
+    def _evict_loop(self) -> None:
+        while True:
+            self.evict()
+            with self._lock:
+                if not self._evict_again:
+                    return
+                self._evict_again = False
+
+
+#: Shared clone cache bookkeeping.
+clone_cache = CloneCache()
+
+
+def configure(
+    max_bytes: Optional[int] = None,
+    max_entries: Optional[int] = None,
+    pinned: Optional[Iterable[str]] = None,
+) -> None:
+    """Apply clone cache settings, e.g. from ``config.json``."""
+    if max_bytes is not None:
+        clone_cache.max_bytes = max_bytes
+    if max_entries is not None:
+        clone_cache.max_entries = max_entries
+    if pinned is not None:
+        clone_cache.set_pinned(pinned)
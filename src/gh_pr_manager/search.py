@@ -0,0 +1,115 @@
+"""In-memory fuzzy search over repository or branch names.
+
+Names are normalized once when added. A trigram index narrows longer
+queries to a few candidates, so a keystroke never scans every name.
+Matches are ranked as prefix, then word-boundary, then substring, then
+subsequence; ties go to shorter names.
+
+Names may be added on one thread while another searches: each search only
+looks at the entries that were complete when it started.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+from typing import Iterable, Optional
+
+_BOUNDARY_RE = re.compile(r"[/\-_. ]")
+
+PREFIX, WORD_BOUNDARY, SUBSTRING, SUBSEQUENCE = range(4)
+
+
+def normalize(text: str) -> str:
+    """Return the form of ``text`` that queries are matched against."""
+    return text.strip().lower()
+
+
+def _trigrams(text: str) -> set[str]:
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+def _is_subsequence(query: str, text: str) -> bool:
+    it = iter(text)
+    return all(ch in it for ch in query)
+
+
+class SearchIndex:
+    """Precomputed search structure over a growing list of names."""
+
+    def __init__(self, names: Iterable[str] = ()):
+        self._lock = threading.Lock()
+        self.names: list[str] = []
+        self._normalized: list[str] = []
+        self._short: list[str] = []
+        self._trigrams: dict[str, set[int]] = {}
+        self.add(names)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def add(self, names: Iterable[str]) -> None:
+        """Index ``names``; they get positions after the existing entries."""
+        for name in names:
+            norm = normalize(name)
+            with self._lock:
+                position = len(self.names)
+                self._normalized.append(norm)
+                self._short.append(norm.rsplit("/", 1)[-1])
+                for gram in _trigrams(norm):
+                    self._trigrams.setdefault(gram, set()).add(position)
+                # Published last: searches only read positions below len(names).
+                self.names.append(name)
+
+    def _rank(self, query: str, position: int) -> Optional[int]:
+        norm = self._normalized[position]
+        if norm.startswith(query) or self._short[position].startswith(query):
+            return PREFIX
+        found = norm.find(query)
+        if found >= 0:
+            while found >= 0:
+                if found == 0 or _BOUNDARY_RE.match(norm, found - 1):
+                    return WORD_BOUNDARY
+                found = norm.find(query, found + 1)
+            return SUBSTRING
+        if _is_subsequence(query, norm):
+            return SUBSEQUENCE
+        return None
+
+    def _substring_candidates(self, query: str, count: int) -> Iterable[int]:
+        if len(query) < 3:
+            return range(count)
+        with self._lock:
+            postings = [self._trigrams.get(gram, set()) for gram in _trigrams(query)]
+            postings.sort(key=len)
+            candidates = set.intersection(*postings) if postings else set()
+        return sorted(position for position in candidates if position < count)
+
+    def search(self, query: str, limit: Optional[int] = None) -> list[int]:
+        """Return positions of names matching ``query``, best first.
+
+        An empty query matches every name in insertion order.
+        """
+        query = normalize(query)
+        with self._lock:
+            count = len(self.names)
+        if not query:
+            positions = range(count)
+            return list(positions if limit is None else positions[:limit])
+        scored: list[tuple[int, int, int]] = []
+        seen: set[int] = set()
+        for position in self._substring_candidates(query, count):
+            rank = self._rank(query, position)
+            if rank is not None:
+                seen.add(position)
+                scored.append((rank, len(self.names[position]), position))
+        if limit is None or len(scored) < limit:
+            # Subsequence matches cannot be found through the trigram index.
+            for position in range(count):
+                norm = self._normalized[position]
+                if position not in seen and _is_subsequence(query, norm):
+                    scored.append((SUBSEQUENCE, len(norm), position))
+        scored.sort()
+        if limit is not None:
+            scored = scored[:limit]
+        return [position for _, _, position in scored]
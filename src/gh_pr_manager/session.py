@@ -0,0 +1,132 @@
+"""Process-wide cache of the authenticated GitHub identity.
+
+The login, organization list and authentication validity are resolved once
+and persisted to disk. A stale copy is still served immediately while a
+background task refreshes it.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, Optional, Union
+
+from . import tasks
+
+#: Seconds after which a persisted session is refreshed in the background.
+DEFAULT_TTL = 6 * 60 * 60
+
+
+def default_session_path() -> Path:
+    """Return the default location of the persisted session."""
+    return Path.home() / ".cache" / "gh_pr_manager" / "session.json"
+
+
+@dataclass
+class SessionState:
+    """Identity information about the authenticated ``gh`` user."""
+
+    login: Optional[str] = None
+    orgs: list[str] = field(default_factory=list)
+    authenticated: bool = False
+    resolved_at: float = 0.0
+    #: GitHub refused the credentials, e.g. after ``gh auth logout``.
+    rejected: bool = False
+
+
+class GitHubSession:
+    """Lazily resolved, disk-backed :class:`SessionState`."""
+
+    def __init__(
+        self,
+        resolver: Callable[[], SessionState],
+        path: Union[str, Path, None] = None,
+        ttl: float = DEFAULT_TTL,
+    ):
+        self.resolver = resolver
+        self._path = Path(path) if path else None
+        self.ttl = ttl
+        self._state: Optional[SessionState] = None
+        self._lock = threading.Lock()
+        self._refresh_task: Optional[tasks.Task] = None
+
+    @property
+    def path(self) -> Path:
+        return self._path or default_session_path()
+
+    def _load(self) -> Optional[SessionState]:
+        try:
+            state = SessionState(**json.loads(self.path.read_text()))
+        except (OSError, ValueError, TypeError):
+            return None
+        # Only a positive result is trusted; the user may have logged in since.
+        return state if state.authenticated else None
+
+    def _save(self, state: SessionState) -> None:
+        if not state.authenticated:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(json.dumps(asdict(state)))
+        except OSError:
+            pass
+
+    def is_stale(self, state: SessionState) -> bool:
+        return time.time() - state.resolved_at > self.ttl
+
+    def state(self) -> SessionState:
+        """Return the current session, resolving it on first use."""
+        with self._lock:
+            if self._state is None:
+                self._state = self._load()
+            state = self._state
+        if state is None:
+            # Resolve outside the lock so a slow network never blocks it.
+            return self.refresh()
+        if self.is_stale(state):
+            self.refresh_in_background()
+        return state
+
+    def _resolve(self) -> SessionState:
+        state = self.resolver()
+        state.resolved_at = time.time()
+        self._save(state)
+        return state
+
+    def refresh(self) -> SessionState:
+        """Resolve the session again, blocking until done.
+
+        A failed resolve does not replace an authenticated session; a
+        transient network error must not log the user out mid-session.
+        Rejected credentials do: the session is then invalidated.
+        """
+        state = self._resolve()
+        if state.rejected:
+            logging.warning("GitHub rejected the credentials; forgetting the session")
+            self.invalidate()
+            with self._lock:
+                self._state = state
+            return state
+        with self._lock:
+            if not state.authenticated and self._state is not None and self._state.authenticated:
+                logging.warning("Refreshing the GitHub session failed; keeping the previous one")
+                return self._state
+            self._state = state
+        return state
+
+    def refresh_in_background(self) -> None:
+        """Queue a refresh on the task pool unless one is already pending."""
+        with self._lock:
+            if self._refresh_task and not self._refresh_task.future.done():
+                return
+            self._refresh_task = tasks.pool.submit(self.refresh, name="refresh GitHub session")
+
+    def invalidate(self) -> None:
+        """Forget the cached session in memory and on disk."""
+        with self._lock:
+            self._state = None
+        self.path.unlink(missing_ok=True)
@@ -0,0 +1,111 @@
+"""Classifying remote branches as merged, inactive or active.
+
+Everything is derived from two ref scans of the cached clone, independent
+of the number of branches: ``git for-each-ref --merged`` finds branches
+reachable from the default branch, and :func:`branch_info.scan_branches`
+supplies commit dates. A branch only counts as merged when its head is the
+head of a merged pull request; a branch just created from the default branch
+is reachable from it too but has landed nothing. Reachability then tells
+plain merges apart from squash and rebase merges.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Optional, Union
+
+from . import tracing, utils
+from .branch_info import BranchInfo, default_base, scan_branches
+
+MERGED = "merged"
+SQUASH_MERGED = "squash-merged"
+INACTIVE = "inactive"
+ACTIVE = "active"
+
+#: Branches without commits for this many days count as inactive.
+DEFAULT_INACTIVE_DAYS = 90
+
+
+@dataclass(frozen=True)
+class StaleReport:
+    """Categories per branch for one analysis run."""
+
+    base: str
+    categories: dict[str, str]
+    #: Branches with an open pull request; never offered for deletion.
+    open_prs: frozenset[str] = field(default_factory=frozenset)
+    #: Whether merged pull requests were known, so merges could be detected.
+    merged_prs_known: bool = True
+
+    def branches(self, *categories: str) -> list[str]:
+        """Return the branches in any of ``categories``, sorted by name."""
+        return sorted(b for b, c in self.categories.items() if c in categories)
+
+    @property
+    def prunable(self) -> list[str]:
+        """Branches that are merged, squash-merged or inactive, without an open PR.
+
+        Deleting the head branch of an open pull request would close it.
+        """
+        return [b for b in self.branches(MERGED, SQUASH_MERGED, INACTIVE) if b not in self.open_prs]
+
+    def summary(self) -> str:
+        counts = {c: 0 for c in (MERGED, SQUASH_MERGED, INACTIVE, ACTIVE)}
+        for category in self.categories.values():
+            counts[category] += 1
+        return ", ".join(f"{n} {c}" for c, n in counts.items())
+
+
+def merged_branches(path: Union[str, Path], base: str) -> Optional[set[str]]:
+    """Return remote branches reachable from ``origin/base`` in one ref scan."""
+    success, output = utils.run_cmd([
+        "git", "-C", str(path), "for-each-ref",
+        f"--merged=refs/remotes/origin/{base}",
+        "--format=%(refname:lstrip=3)", "refs/remotes/origin/",
+    ])
+    return set(output.split()) if success else None
+
+
+@tracing.traced("stale.classify", "path", "base")
+def classify_branches(
+    path: Union[str, Path],
+    base: Optional[str] = None,
+    merged_pr_heads: Optional[dict[str, set[str]]] = None,
+    inactive_days: int = DEFAULT_INACTIVE_DAYS,
+    infos: Optional[list[BranchInfo]] = None,
+    now: Optional[float] = None,
+    open_prs: Iterable[str] = (),
+) -> Optional[StaleReport]:
+    """Classify every remote branch of the clone at ``path``.
+
+    ``merged_pr_heads`` maps branch names to head SHAs of merged PRs (see
+    :func:`github_client.get_merged_pr_heads`); ``None`` means they could
+    not be fetched, which the report records. ``infos`` can pass an existing
+    :func:`scan_branches` result. Branches in ``open_prs`` are left out of
+    :attr:`StaleReport.prunable`. The base branch itself is not classified.
+    Returns ``None`` if git failed.
+    """
+    infos = infos if infos is not None else scan_branches(path, base, with_counts=False)
+    if infos is None:
+        return None
+    base = base or default_base(i.name for i in infos)
+    if base is None:
+        return None
+    merged = merged_branches(path, base)
+    if merged is None:
+        return None
+    cutoff = (now if now is not None else time.time()) - inactive_days * 86400
+    pr_heads = merged_pr_heads or {}
+    categories: dict[str, str] = {}
+    for info in infos:
+        if info.name == base:
+            continue
+        if info.sha in pr_heads.get(info.name, ()):
+            categories[info.name] = MERGED if info.name in merged else SQUASH_MERGED
+        elif info.committed_at < cutoff:
+            categories[info.name] = INACTIVE
+        else:
+            categories[info.name] = ACTIVE
+    return StaleReport(base, categories, frozenset(open_prs), merged_pr_heads is not None)
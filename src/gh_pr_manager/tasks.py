@@ -0,0 +1,266 @@
+"""One fixed-size pool for the app's background work.
+
+Everything that used to get its own ``threading.Thread`` or
+``threading.Timer`` is submitted to :data:`pool` instead. It runs tasks
+first-in first-out on :data:`DEFAULT_WORKERS` daemon threads, so waiting on
+an earlier task from a later one cannot deadlock, and never starts more
+threads than that however busy the app gets.
+
+A single supervisor thread handles delayed submissions (the replacement for
+``Timer``) and deadlines. A task still queued at its deadline is dropped.
+A running task is marked timed out and its :attr:`Task.cancel_event` is set,
+so cooperative code such as :class:`~gh_pr_manager.refresh.RefreshPipeline`
+stops at the next checkpoint and any child process it is waiting on through
+:func:`~gh_pr_manager.utils.run_cmd` is killed. Tasks cancelled before
+their deadline never time out. :meth:`TaskPool.snapshot` feeds the task
+monitor in the UI.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+from . import tracing, utils
+
+#: Worker threads in the app-wide pool.
+DEFAULT_WORKERS = 4
+#: Finished tasks kept for the task monitor.
+HISTORY_SIZE = 20
+
+SCHEDULED = "scheduled"
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+TIMED_OUT = "timed out"
+
+
+@dataclass(eq=False)
+class Task:
+    """A unit of background work and its bookkeeping."""
+
+    name: str
+    fn: Callable[[], Any]
+    #: Seconds the task may take from when it is due, or ``None``.
+    deadline: Optional[float] = None
+    on_timeout: Optional[Callable[["Task"], None]] = None
+    cancel_event: threading.Event = field(default_factory=threading.Event)
+    future: Future = field(default_factory=Future)
+    state: str = QUEUED
+    due: float = 0.0
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    thread: str = ""
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether the task was cancelled or ran past its deadline."""
+        return self.cancel_event.is_set()
+
+    @property
+    def expires(self) -> Optional[float]:
+        return None if self.deadline is None else self.due + self.deadline
+
+    def cancel(self) -> None:
+        """Skip the task if it has not started, else ask it to stop."""
+        self.cancel_event.set()
+
+    def result(self, timeout: Optional[float] = None) -> Any:
+        return self.future.result(timeout)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the task finished or was dropped; return whether it did."""
+        try:
+            self.future.exception(timeout)
+        except Exception:  # cancelled (CancelledError) or timed out waiting
+            return self.future.done()
+        return True
+
+    def describe(self, now: float) -> str:
+        """Return e.g. ``"running   3.2s  deadline 56.8s  refresh org/repo"``."""
+        if self.state == SCHEDULED:
+            age = f"in {self.due - now:.1f}s"
+        else:
+            age = f"{(self.finished or now) - (self.started or self.due):.1f}s"
+        text = f"{self.state:<10}{age:>9}"
+        expires = self.expires
+        if expires is not None and self.state in (QUEUED, RUNNING):
+            text += f"  deadline {max(expires - now, 0.0):.1f}s"
+        return f"{text}  {self.name}"
+
+
+class TaskPool:
+    """Fixed-size FIFO thread pool with delayed tasks and deadlines."""
+
+    def __init__(self, max_workers: int = DEFAULT_WORKERS, clock: Callable[[], float] = time.monotonic):
+        self.max_workers = max_workers
+        self._clock = clock
+        self._cond = threading.Condition()
+        self._queue: deque[Task] = deque()
+        self._scheduled: set[Task] = set()
+        self._running: set[Task] = set()
+        self._history: deque[Task] = deque(maxlen=HISTORY_SIZE)
+        #: ``(when, seq, task)`` for delayed starts and deadlines.
+        self._timers: list[tuple[float, int, Task]] = []
+        self._seq = itertools.count()
+        self._threads: list[threading.Thread] = []
+
+    def _start_threads(self) -> None:
+        if self._threads:
+            return
+        for n in range(self.max_workers):
+            thread = threading.Thread(target=self._work, daemon=True, name=f"TaskWorker-{n}")
+            thread.start()
+            self._threads.append(thread)
+        supervisor = threading.Thread(target=self._supervise, daemon=True, name="TaskSupervisor")
+        supervisor.start()
+        self._threads.append(supervisor)
+
+    def submit(
+        self,
+        fn: Callable[..., Any],
+        *args: Any,
+        name: Optional[str] = None,
+        delay: float = 0.0,
+        deadline: Optional[float] = None,
+        on_timeout: Optional[Callable[[Task], None]] = None,
+        cancel: Optional[threading.Event] = None,
+        **kwargs: Any,
+    ) -> Task:
+        """Run ``fn(*args, **kwargs)`` on the pool and return its :class:`Task`.
+
+        The task is queued after ``delay`` seconds. ``deadline`` seconds after
+        that it is dropped or, if running, cancelled and ``on_timeout(task)``
+        is called. ``cancel`` is used as the task's cancel event, so one
+        event can stop a task together with the code it drives.
+        """
+        task = Task(
+            name=name or getattr(fn, "__qualname__", repr(fn)),
+            fn=tracing.propagate(lambda: fn(*args, **kwargs)),
+            deadline=deadline,
+            on_timeout=on_timeout,
+            cancel_event=cancel or threading.Event(),
+        )
+        with self._cond:
+            self._start_threads()
+            task.due = self._clock() + max(delay, 0.0)
+            if delay > 0:
+                task.state = SCHEDULED
+                self._scheduled.add(task)
+                heapq.heappush(self._timers, (task.due, next(self._seq), task))
+            else:
+                self._enqueue(task)
+            self._cond.notify_all()
+        return task
+
+    def _enqueue(self, task: Task) -> None:
+        task.state = QUEUED
+        self._queue.append(task)
+        if task.expires is not None:
+            heapq.heappush(self._timers, (task.expires, next(self._seq), task))
+
+    def _finish(self, task: Task, state: str) -> None:
+        if task.state not in (DONE, FAILED, CANCELLED, TIMED_OUT):
+            task.state = state
+        task.finished = self._clock()
+        self._history.append(task)
+
+    def _work(self) -> None:
+        while True:
+            with self._cond:
+                while not self._queue:
+                    self._cond.wait()
+                task = self._queue.popleft()
+                if task.cancelled:
+                    self._finish(task, CANCELLED)
+                    task.future.cancel()
+                    continue
+                task.state = RUNNING
+                task.started = self._clock()
+                task.thread = threading.current_thread().name
+                self._running.add(task)
+            task.future.set_running_or_notify_cancel()
+            try:
+                # Children started by the task are killed once it is cancelled.
+                with utils.cancel_on(task.cancel_event):
+                    result = task.fn()
+            except BaseException as exc:
+                logging.exception("Background task %s failed", task.name)
+                state = FAILED
+                task.future.set_exception(exc)
+            else:
+                state = DONE
+                task.future.set_result(result)
+            with self._cond:
+                self._running.discard(task)
+                self._finish(task, state)
+
+    def _supervise(self) -> None:
+        while True:
+            expired: list[Task] = []
+            with self._cond:
+                now = self._clock()
+                while self._timers and self._timers[0][0] <= now:
+                    _, _, task = heapq.heappop(self._timers)
+                    if task.cancelled and task.state in (QUEUED, RUNNING):
+                        continue  # cancelled by its owner; no timeout to report
+                    if task.state == SCHEDULED:
+                        self._scheduled.discard(task)
+                        if task.cancelled:
+                            self._finish(task, CANCELLED)
+                            task.future.cancel()
+                        else:
+                            self._enqueue(task)
+                            self._cond.notify_all()
+                    elif task.state == QUEUED:
+                        self._queue.remove(task)
+                        self._finish(task, TIMED_OUT)
+                        task.cancel_event.set()
+                        task.future.cancel()
+                        expired.append(task)
+                    elif task.state == RUNNING:
+                        # Threads cannot be killed; mark it and ask it to stop.
+                        task.state = TIMED_OUT
+                        task.cancel_event.set()
+                        expired.append(task)
+                timeout = self._timers[0][0] - now if self._timers else None
+                if not expired:
+                    self._cond.wait(timeout)
+            for task in expired:
+                logging.warning("Background task %s missed its %.1fs deadline", task.name, task.deadline)
+                if task.on_timeout is not None:
+                    try:
+                        task.on_timeout(task)
+                    except Exception:
+                        logging.exception("Timeout handler of %s failed", task.name)
+
+    def snapshot(self) -> list[Task]:
+        """Return running, queued, scheduled and recently finished tasks."""
+        with self._cond:
+            running = sorted(self._running, key=lambda t: t.started or 0.0)
+            scheduled = sorted(self._scheduled, key=lambda t: t.due)
+            return running + list(self._queue) + scheduled + list(reversed(self._history))
+
+    def describe(self) -> str:
+        """Return a plain-text table of :meth:`snapshot` for the task monitor."""
+        now = self._clock()
+        tasks = self.snapshot()
+        counts = {state: sum(t.state == state for t in tasks) for state in (RUNNING, QUEUED, SCHEDULED)}
+        header = (
+            f"{counts[RUNNING]} running, {counts[QUEUED]} queued, "
+            f"{counts[SCHEDULED]} scheduled on {self.max_workers} workers"
+        )
+        return "\n".join([header, ""] + [task.describe(now) for task in tasks])
+
+
+#: Pool shared by all background work of the app.
+pool = TaskPool()
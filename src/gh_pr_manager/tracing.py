@@ -0,0 +1,234 @@
+"""Structured timing spans for commands and the operations built on them.
+
+:func:`span` times a block and records its name, start, duration, thread
+and attributes, plus the enclosing span as its parent (tracked with
+:mod:`contextvars`, so it follows ``await`` and, through :func:`propagate`,
+worker threads). :func:`~gh_pr_manager.utils.run_cmd` records argv, cwd,
+exit code and output size for every child process.
+
+Spans are appended as JSON lines to the file given to :func:`configure`
+(or the ``GH_PR_MANAGER_TRACE`` environment variable); nothing is written
+while tracing is off. Convert a trace for ``chrome://tracing`` or Perfetto
+with::
+
+    python -m gh_pr_manager.tracing trace.jsonl -o trace.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import inspect
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import IO, Any, Callable, Iterable, Iterator, Optional, TypeVar, Union
+
+#: Environment variable naming the JSONL file to trace into.
+TRACE_ENV = "GH_PR_MANAGER_TRACE"
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+@dataclass
+class Span:
+    """One timed operation."""
+
+    name: str
+    span_id: int
+    parent_id: Optional[int]
+    #: Wall clock start, seconds since the epoch.
+    start: float
+    duration: float = 0.0
+    thread: str = ""
+    pid: int = 0
+    attrs: dict[str, Any] = field(default_factory=dict)
+
+
+_current: ContextVar[Optional[Span]] = ContextVar("gh_pr_manager_span", default=None)
+
+
+class Tracer:
+    """Append finished spans to a JSONL file; thread safe."""
+
+    def __init__(self, path: Union[str, Path, None] = None):
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._file: Optional[IO[str]] = None
+        self.path: Optional[Path] = None
+        self.configure(path)
+
+    @property
+    def enabled(self) -> bool:
+        return self.path is not None
+
+    def configure(self, path: Union[str, Path, None]) -> None:
+        """Trace into ``path`` from now on; ``None`` turns tracing off."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            self.path = Path(path).expanduser() if path else None
+
+    def next_id(self) -> int:
+        return next(self._ids)
+
+    def record(self, span: Span) -> None:
+        if self.path is None:
+            return
+        line = json.dumps(asdict(span), default=str) + "\n"
+        with self._lock:
+            try:
+                if self._file is None:
+                    self.path.parent.mkdir(parents=True, exist_ok=True)
+                    self._file = open(self.path, "a", encoding="utf-8")
+                self._file.write(line)
+                self._file.flush()
+            except OSError:
+                pass  # tracing must never break the operation being traced
+
+
+#: Tracer used by :func:`span`.
+tracer = Tracer(os.environ.get(TRACE_ENV))
+
+
+def configure(path: Union[str, Path, None]) -> None:
+    """Write spans to ``path`` (JSONL), or stop tracing with ``None``."""
+    tracer.configure(path)
+
+
+def current_span() -> Optional[Span]:
+    """Return the innermost open span of this context, if any."""
+    return _current.get()
+
+
+@contextmanager
+def span(name: str, **attrs: Any) -> Iterator[Span]:
+    """Time the enclosed block as a child of the current span.
+
+    Attributes can be added to the yielded :class:`Span` while it is open.
+    An escaping exception is recorded as ``attrs["error"]``.
+    """
+    parent = _current.get()
+    current = Span(
+        name=name,
+        span_id=tracer.next_id(),
+        parent_id=parent.span_id if parent else None,
+        start=time.time(),
+        thread=threading.current_thread().name,
+        pid=os.getpid(),
+        attrs=attrs,
+    )
+    token = _current.set(current)
+    started = time.perf_counter()
+    try:
+        yield current
+    except BaseException as exc:
+        current.attrs["error"] = repr(exc)
+        raise
+    finally:
+        current.duration = time.perf_counter() - started
+        _current.reset(token)
+        tracer.record(current)
+
+
+def traced(name: Optional[str] = None, *fields: str) -> Callable[[F], F]:
+    """Decorate a function so every call runs in a :func:`span`.
+
+    ``name`` defaults to ``module.qualname``; the arguments named in
+    ``fields`` are recorded as attributes.
+    """
+
+    def decorate(fn: F) -> F:
+        label = name or f"{fn.__module__.rpartition('.')[2]}.{fn.__qualname__}"
+        signature = inspect.signature(fn) if fields else None
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            attrs: dict[str, Any] = {}
+            if signature is not None:
+                bound = signature.bind_partial(*args, **kwargs).arguments
+                attrs = {key: bound[key] for key in fields if key in bound}
+            with span(label, **attrs):
+                return fn(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+def propagate(fn: F) -> F:
+    """Return ``fn`` bound to the current span, for running on another thread.
+
+    Spans opened by ``fn`` in a thread pool then nest under the span that
+    submitted it instead of becoming roots.
+    """
+    parent = _current.get()
+
+    @functools.wraps(fn)
+    def run(*args: Any, **kwargs: Any) -> Any:
+        token = _current.set(parent)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _current.reset(token)
+
+    return run  # type: ignore[return-value]
+
+
+def read_spans(path: Union[str, Path]) -> list[Span]:
+    """Load the spans of a JSONL trace, skipping malformed lines."""
+    spans = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                spans.append(Span(**json.loads(line)))
+            except (ValueError, TypeError):
+                continue
+    return spans
+
+
+def to_chrome_trace(spans: Iterable[Span]) -> dict[str, Any]:
+    """Convert spans to the Chrome trace event format (also read by Perfetto)."""
+    tids: dict[tuple[int, str], int] = {}
+    events: list[dict[str, Any]] = []
+    for s in sorted(spans, key=lambda s: s.start):
+        tid = tids.setdefault((s.pid, s.thread), len(tids) + 1)
+        args = dict(s.attrs, span_id=s.span_id, parent_id=s.parent_id)
+        events.append({
+            "name": s.name,
+            "cat": s.name.partition(".")[0],
+            "ph": "X",
+            "ts": round(s.start * 1e6),
+            "dur": round(s.duration * 1e6),
+            "pid": s.pid,
+            "tid": tid,
+            "args": args,
+        })
+    for (pid, thread), tid in tids.items():
+        events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": thread}})
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Convert a JSONL span trace to Chrome trace format.")
+    parser.add_argument("trace", help="JSONL file written by the app")
+    parser.add_argument("-o", "--output", help="where to write the JSON (default: stdout)")
+    args = parser.parse_args(argv)
+    text = json.dumps(to_chrome_trace(read_spans(args.trace)))
+    if args.output:
+        Path(args.output).write_text(text)
+    else:
+        sys.stdout.write(text + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,26 +1,208 @@
+import asyncio
 import subprocess
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from contextvars import ContextVar
 from pathlib import Path
-from typing import List, Union, Tuple
+from typing import Iterator, List, Optional, Union, Tuple
 
+from . import tracing
 
-def run_cmd(cmd: List[str], cwd: Union[str, Path, None] = None) -> Tuple[bool, str]:
-    """Run a subprocess command and return success status and output."""
+
+#: Upper bound on child processes started through :func:`run_cmd_async`.
+MAX_CONCURRENT_CMDS = 8
+
+_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+#: Seconds between checks of the cancel event while a child runs.
+CANCEL_POLL_INTERVAL = 0.1
+
+_cancel: ContextVar[Optional[threading.Event]] = ContextVar("gh_pr_manager_cancel", default=None)
+
+
+@contextmanager
+def cancel_on(event: Optional[threading.Event]) -> Iterator[None]:
+    """Kill children started by :func:`run_cmd` in this block once ``event`` is set.
+
+    :class:`~gh_pr_manager.tasks.TaskPool` runs every task under its cancel
+    event, which the pool also sets when the task misses its deadline.
+    """
+    token = _cancel.set(event)
     try:
-        result = subprocess.run(
-            cmd,
-            cwd=cwd,
-            capture_output=True,
-            text=True,
-        )
-    except FileNotFoundError:
-        return False, f"Command not found: {cmd[0]}"
-    except Exception as exc:
-        return False, str(exc)
+        yield
+    finally:
+        _cancel.reset(token)
+
+
+def run_cmd(
+    cmd: List[str],
+    cwd: Union[str, Path, None] = None,
+    timeout: Optional[float] = None,
+    input: Optional[str] = None,
+) -> Tuple[bool, str]:
+    """Run a subprocess command and return success status and output.
+
+    ``input`` is written to the child's stdin. The child is killed after
+    ``timeout`` seconds or when the enclosing :func:`cancel_on` event is set,
+    and ``(False, ...)`` is returned.
+    """
+    return _run_cmd(cmd, cwd, timeout, combined=False, input=input)
+
+
+def run_cmd_combined(
+    cmd: List[str], cwd: Union[str, Path, None] = None, timeout: Optional[float] = None
+) -> Tuple[bool, str]:
+    """Like :func:`run_cmd`, but a failed command returns stdout and stderr.
+
+    ``gh api --include`` prints the status line and headers of an error
+    response on stdout, which :func:`run_cmd` would drop.
+    """
+    return _run_cmd(cmd, cwd, timeout, combined=True)
+
+
+def _communicate(
+    proc: subprocess.Popen,
+    timeout: Optional[float],
+    cancel: Optional[threading.Event],
+    input: Optional[str] = None,
+) -> Optional[Tuple[str, str]]:
+    """Return the output of ``proc``, or ``None`` after killing it."""
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while True:
+        wait = CANCEL_POLL_INTERVAL if cancel is not None else None
+        if deadline is not None:
+            remaining = max(deadline - time.monotonic(), 0.0)
+            wait = remaining if wait is None else min(wait, remaining)
+        try:
+            # Popen only writes ``input`` on the first call.
+            return proc.communicate(input, timeout=wait)
+        except subprocess.TimeoutExpired:
+            cancelled = cancel is not None and cancel.is_set()
+            if cancelled or (deadline is not None and time.monotonic() >= deadline):
+                proc.kill()
+                proc.communicate()
+                return None
+
+
+def _run_cmd(
+    cmd: List[str],
+    cwd: Union[str, Path, None],
+    timeout: Optional[float],
+    combined: bool,
+    input: Optional[str] = None,
+) -> Tuple[bool, str]:
+    cancel = _cancel.get()
+    if cancel is not None and cancel.is_set():
+        return False, f"Command cancelled: {' '.join(cmd)}"
+    with tracing.span("cmd." + (cmd[0] if cmd else ""), argv=cmd, cwd=str(cwd) if cwd else None) as span:
+        try:
+            proc = subprocess.Popen(
+                cmd,
+                cwd=cwd,
+                stdin=subprocess.PIPE if input is not None else None,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+            )
+        except FileNotFoundError:
+            return False, f"Command not found: {cmd[0]}"
+        except Exception as exc:
+            return False, str(exc)
+        output = _communicate(proc, timeout, cancel, input)
+        if output is None:
+            span.attrs["killed"] = True
+            if cancel is not None and cancel.is_set():
+                return False, f"Command cancelled: {' '.join(cmd)}"
+            return False, f"Command timed out after {timeout}s: {' '.join(cmd)}"
+        stdout, stderr = output
+        span.attrs["exit_code"] = proc.returncode
+        if tracing.tracer.enabled:
+            span.attrs["bytes"] = len(stdout.encode()) + len(stderr.encode())
+
+    if proc.returncode != 0:
+        if combined:
+            return False, "\n".join(filter(None, (stdout.strip(), stderr.strip())))
+        return False, stderr.strip() or stdout.strip()
+    return True, stdout
+
+
+def set_max_concurrent_cmds(limit: int) -> None:
+    """Change the cap on concurrently running :func:`run_cmd_async` children.
+
+    Only event loops that have not started a command yet pick up the new value.
+    """
+    global MAX_CONCURRENT_CMDS
+    if limit < 1:
+        raise ValueError("limit must be at least 1")
+    MAX_CONCURRENT_CMDS = limit
+    _semaphores.clear()
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    """Return the process-wide command semaphore for the running event loop."""
+    loop = asyncio.get_running_loop()
+    semaphore = _semaphores.get(loop)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_CMDS)
+        _semaphores[loop] = semaphore
+    return semaphore
+
+
+async def _kill(proc: asyncio.subprocess.Process) -> None:
+    """Kill ``proc`` if it is still running and reap it."""
+    if proc.returncode is None:
+        try:
+            proc.kill()
+        except ProcessLookupError:
+            pass
+    await proc.wait()
+
 
-    if result.returncode != 0:
-        output = result.stderr.strip() or result.stdout.strip()
-        return False, output
-    return True, result.stdout
+async def run_cmd_async(
+    cmd: List[str],
+    cwd: Union[str, Path, None] = None,
+    timeout: Optional[float] = None,
+) -> Tuple[bool, str]:
+    """Asynchronous counterpart of :func:`run_cmd`.
 
+    At most ``MAX_CONCURRENT_CMDS`` children run at once; further calls wait
+    for a free slot. If ``timeout`` seconds elapse the child is killed and
+    ``(False, ...)`` is returned. Cancelling the awaiting task kills the child
+    before the cancellation propagates.
+    """
+    async with _get_semaphore():
+        with tracing.span("cmd." + (cmd[0] if cmd else ""), argv=cmd, cwd=str(cwd) if cwd else None) as span:
+            try:
+                proc = await asyncio.create_subprocess_exec(
+                    *cmd,
+                    cwd=cwd,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                )
+            except FileNotFoundError:
+                return False, f"Command not found: {cmd[0]}"
+            except Exception as exc:
+                return False, str(exc)
 
+            try:
+                stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout)
+            except asyncio.TimeoutError:
+                await _kill(proc)
+                span.attrs["timeout"] = timeout
+                return False, f"Command timed out after {timeout}s: {' '.join(cmd)}"
+            except asyncio.CancelledError:
+                await asyncio.shield(_kill(proc))
+                raise
+            span.attrs["exit_code"] = proc.returncode
+            span.attrs["bytes"] = len(stdout) + len(stderr)
 
+    out = stdout.decode(errors="replace")
+    if proc.returncode != 0:
+        err = stderr.decode(errors="replace")
+        return False, err.strip() or out.strip()
+    return True, out
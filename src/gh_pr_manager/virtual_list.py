@@ -0,0 +1,275 @@
+"""A list widget that only renders the rows currently on screen.
+
+``ListView`` mounts one ``ListItem`` widget per entry, which becomes slow
+and memory hungry for tens of thousands of repositories or branches.
+:class:`VirtualList` keeps rows, cursor and multi-select state in plain
+lists and draws visible lines on demand through Textual's line API.
+"""
+
+from __future__ import annotations
+
+from difflib import SequenceMatcher
+from typing import Hashable, Iterable, Optional, Sequence
+
+from rich.cells import cell_len
+from rich.segment import Segment
+from textual import events
+from textual.binding import Binding
+from textual.geometry import Region, Size
+from textual.message import Message
+from textual.scroll_view import ScrollView
+from textual.strip import Strip
+
+
+def diff_keys(old: Sequence[Hashable], new: Sequence[Hashable]) -> list[tuple]:
+    """Return the edits that turn the ``old`` key order into ``new``.
+
+    Each edit is ``("insert", key, new_index)``, ``("remove", key,
+    old_index)`` or ``("move", key, old_index, new_index)``. Keys that keep
+    their relative order produce no edit.
+    """
+    removed: dict[Hashable, int] = {}
+    inserted: dict[Hashable, int] = {}
+    matcher = SequenceMatcher(None, old, new, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag in ("delete", "replace"):
+            removed.update((old[i], i) for i in range(i1, i2))
+        if tag in ("insert", "replace"):
+            inserted.update((new[j], j) for j in range(j1, j2))
+    ops: list[tuple] = []
+    for key, i in removed.items():
+        if key in inserted:
+            ops.append(("move", key, i, inserted.pop(key)))
+        else:
+            ops.append(("remove", key, i))
+    ops.extend(("insert", key, j) for key, j in inserted.items())
+    return ops
+
+
+class VirtualList(ScrollView, can_focus=True):
+    """Scrollable list of text rows with a cursor and optional multi-select."""
+
+    BINDINGS = [
+        Binding("up", "cursor_up", "Up", show=False),
+        Binding("down", "cursor_down", "Down", show=False),
+        Binding("pageup", "page_up", "Page up", show=False),
+        Binding("pagedown", "page_down", "Page down", show=False),
+        Binding("home", "first", "First", show=False),
+        Binding("end", "last", "Last", show=False),
+        Binding("enter", "select", "Select", show=False),
+        Binding("space", "toggle", "Toggle", show=False),
+    ]
+
+    COMPONENT_CLASSES = {"virtual-list--cursor", "virtual-list--selected"}
+
+    DEFAULT_CSS = """
+    VirtualList {
+        height: 1fr;
+    }
+    VirtualList > .virtual-list--cursor {
+        background: $accent 50%;
+    }
+    VirtualList:focus > .virtual-list--cursor {
+        background: $accent;
+    }
+    VirtualList > .virtual-list--selected {
+        text-style: bold;
+    }
+    """
+
+    class Selected(Message):
+        """Posted when a row is activated with enter or a click."""
+
+        def __init__(self, virtual_list: "VirtualList", index: int):
+            self.virtual_list = virtual_list
+            self.index = index
+            super().__init__()
+
+    class SelectionChanged(Message):
+        """Posted when the set of multi-selected rows changes."""
+
+        def __init__(self, virtual_list: "VirtualList", selected: list[int]):
+            self.virtual_list = virtual_list
+            self.selected = selected
+            super().__init__()
+
+    def __init__(self, multi_select: bool = False, **kwargs):
+        super().__init__(**kwargs)
+        self.multi_select = multi_select
+        self.items: list[str] = []
+        self.keys: list[Hashable] = []
+        self.selected: list[bool] = []
+        self.cursor = 0
+        self._max_width = 0
+
+    # -- data -------------------------------------------------------------
+
+    def set_items(self, items: Iterable[str], keys: Optional[Iterable[Hashable]] = None) -> None:
+        """Replace every row, clearing the multi-selection."""
+        self.items = list(items)
+        self.keys = list(keys) if keys is not None else list(self.items)
+        self.selected = [False] * len(self.items)
+        self._max_width = max((cell_len(item) for item in self.items), default=0)
+        self.cursor = min(self.cursor, max(len(self.items) - 1, 0))
+        self._update_virtual_size()
+        self.refresh()
+
+    def append_items(self, items: Iterable[str], keys: Optional[Iterable[Hashable]] = None) -> None:
+        """Add rows at the end, only repainting them if they are visible."""
+        start = len(self.items)
+        new = list(items)
+        if not new:
+            return
+        self.items.extend(new)
+        self.keys.extend(keys if keys is not None else new)
+        self.selected.extend([False] * len(new))
+        self._max_width = max(self._max_width, *(cell_len(item) for item in new))
+        self._update_virtual_size()
+        self.refresh_lines(start, len(new))
+
+    def reconcile(self, items: Iterable[str], keys: Optional[Iterable[Hashable]] = None) -> list[tuple]:
+        """Update rows to ``items`` by key instead of rebuilding the list.
+
+        The cursor and multi-selection follow their keys to new positions.
+        Only rows whose content or position changed are repainted. Returns
+        the edits computed by :func:`diff_keys`.
+        """
+        new_items = list(items)
+        new_keys = list(keys) if keys is not None else list(new_items)
+        old_items, old_keys = self.items, self.keys
+        ops = diff_keys(old_keys, new_keys)
+
+        chosen = {key for key, flag in zip(old_keys, self.selected) if flag}
+        cursor_key = old_keys[self.cursor] if self.cursor < len(old_keys) else None
+        self.items, self.keys = new_items, new_keys
+        self.selected = [key in chosen for key in new_keys]
+        self._max_width = max((cell_len(item) for item in new_items), default=0)
+        if cursor_key is not None and ops:
+            try:
+                self.cursor = new_keys.index(cursor_key)
+            except ValueError:
+                pass
+        self.cursor = min(self.cursor, max(len(new_items) - 1, 0))
+        self._update_virtual_size()
+
+        # Rows from the first edit onwards may have shifted; before it only
+        # rows whose text changed need repainting.
+        first = min((min(op[2:]) for op in ops), default=len(new_items))
+        if ops:
+            self.refresh_lines(first, max(len(old_items), len(new_items)) - first)
+        for index in range(min(first, len(old_items))):
+            if old_items[index] != new_items[index]:
+                self.refresh_line(index)
+        if self.multi_select and chosen != {k for k, f in zip(new_keys, self.selected) if f}:
+            self.post_message(self.SelectionChanged(self, self.selected_indices))
+        return ops
+
+    def clear(self) -> None:
+        self.set_items([])
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    @property
+    def selected_indices(self) -> list[int]:
+        return [i for i, flag in enumerate(self.selected) if flag]
+
+    def set_selected(self, index: int, value: bool) -> None:
+        """Mark row ``index`` as (de)selected and notify listeners."""
+        if self.selected[index] != value:
+            self.selected[index] = value
+            self.refresh_line(index)
+            self.post_message(self.SelectionChanged(self, self.selected_indices))
+
+    def select_keys(self, keys: Iterable[Hashable]) -> None:
+        """Make exactly the rows with ``keys`` selected, notifying once."""
+        wanted = set(keys)
+        selected = [key in wanted for key in self.keys]
+        if selected != self.selected:
+            self.selected = selected
+            self.refresh()
+            self.post_message(self.SelectionChanged(self, self.selected_indices))
+
+    def _update_virtual_size(self) -> None:
+        self.virtual_size = Size(self._max_width + self._gutter_width, len(self.items))
+
+    @property
+    def _gutter_width(self) -> int:
+        return 4 if self.multi_select else 0
+
+    # -- rendering ----------------------------------------------------------
+
+    def render_line(self, y: int) -> Strip:
+        scroll_x, scroll_y = self.scroll_offset
+        index = y + scroll_y
+        width = self.scrollable_content_region.width
+        if index >= len(self.items):
+            return Strip.blank(width, self.rich_style)
+        style = self.rich_style
+        if self.multi_select and self.selected[index]:
+            style += self.get_component_rich_style("virtual-list--selected")
+        if index == self.cursor:
+            style += self.get_component_rich_style("virtual-list--cursor")
+        text = self.items[index]
+        if self.multi_select:
+            text = ("[x] " if self.selected[index] else "[ ] ") + text
+        strip = Strip([Segment(text, style)])
+        total = max(width + scroll_x, self.virtual_size.width)
+        return strip.extend_cell_length(total, style).crop(scroll_x, scroll_x + width)
+
+    # -- cursor -----------------------------------------------------------
+
+    def move_cursor(self, index: int) -> None:
+        """Move the cursor to ``index`` (clamped) and scroll it into view."""
+        if not self.items:
+            return
+        index = max(0, min(index, len(self.items) - 1))
+        old, self.cursor = self.cursor, index
+        self.refresh_line(old)
+        self.refresh_line(index)
+        self.scroll_to_region(
+            Region(0, index, 1, 1), animate=False, force=True, immediate=True
+        )
+
+    def action_cursor_up(self) -> None:
+        self.move_cursor(self.cursor - 1)
+
+    def action_cursor_down(self) -> None:
+        self.move_cursor(self.cursor + 1)
+
+    def action_page_up(self) -> None:
+        self.move_cursor(self.cursor - max(self.scrollable_content_region.height - 1, 1))
+
+    def action_page_down(self) -> None:
+        self.move_cursor(self.cursor + max(self.scrollable_content_region.height - 1, 1))
+
+    def action_first(self) -> None:
+        self.move_cursor(0)
+
+    def action_last(self) -> None:
+        self.move_cursor(len(self.items) - 1)
+
+    def action_select(self) -> None:
+        if self.items:
+            self.post_message(self.Selected(self, self.cursor))
+
+    def action_toggle(self) -> None:
+        if self.multi_select and self.items:
+            self.set_selected(self.cursor, not self.selected[self.cursor])
+
+    def _row_at(self, event: events.MouseEvent) -> Optional[int]:
+        offset = event.get_content_offset(self)
+        if offset is None:
+            return None
+        index = offset.y + int(self.scroll_offset.y)
+        return index if 0 <= index < len(self.items) else None
+
+    def on_click(self, event: events.Click) -> None:
+        index = self._row_at(event)
+        if index is None:
+            return
+        self.move_cursor(index)
+        if self.multi_select:
+            self.action_toggle()
+        else:
+            self.action_select()
@@ -1,5 +1,5 @@
 import pytest
-from gh_pr_manager import github_client
+from gh_pr_manager import github_client, rate_limit
 
 
 @pytest.fixture(autouse=True)
@@ -13,4 +13,22 @@ def mock_github(monkeypatch):
         "get_repos",
         lambda owner: [f"{owner}/repo1", f"{owner}/repo2"],
     )
+    monkeypatch.setattr(
+        github_client,
+        "get_repo_records",
+        lambda owner: [
+            github_client.RepoRecord(f"{owner}/repo{i}", f"repo{i}", "main")
+            for i in (1, 2)
+        ],
+    )
+    monkeypatch.setattr(
+        github_client,
+        "iter_repo_pages",
+        lambda owner: iter([github_client.get_repo_records(owner)]),
+    )
+    monkeypatch.setattr(github_client, "get_pull_statuses", lambda repo: {})
+    # Keep fake requests from being paced or backed off.
+    monkeypatch.setattr(
+        rate_limit, "scheduler", rate_limit.RateLimitScheduler(rate=1e9, burst=10**9, write_interval=0)
+    )
     yield
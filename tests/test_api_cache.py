@@ -0,0 +1,69 @@
+import json
+import os
+import time
+
+from gh_pr_manager import github_client
+from gh_pr_manager.api_cache import CachedResponse, ResponseCache
+
+
+def _ok(status: str, headers: dict[str, str], body) -> tuple[bool, str]:
+    head = "\r\n".join([status, *(f"{k}: {v}" for k, v in headers.items())])
+    return True, f"{head}\r\n\r\n{json.dumps(body)}"
+
+
+def test_etag_replayed_and_304_served_from_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(github_client, "response_cache", ResponseCache(tmp_path))
+    calls: list[list[str]] = []
+
+    def fake_run(cmd, cwd=None):
+        calls.append(cmd)
+        if len(calls) == 1:
+            return _ok("HTTP/2.0 200 OK", {"ETag": '"abc"'}, {"login": "me"})
+        return False, "gh: HTTP 304"
+
+    monkeypatch.setattr(github_client, "run_cmd_combined", fake_run)
+
+    assert github_client._api_get_json("user") == {"login": "me"}
+    assert github_client._api_get_json("user") == {"login": "me"}
+    assert "If-None-Match: \"abc\"" not in calls[0]
+    assert calls[1][-2:] == ["-H", 'If-None-Match: "abc"']
+
+
+def test_failure_without_cache_returns_none(tmp_path, monkeypatch):
+    monkeypatch.setattr(github_client, "response_cache", ResponseCache(tmp_path))
+    monkeypatch.setattr(github_client, "run_cmd_combined", lambda cmd, cwd=None: (False, "HTTP 404"))
+    assert github_client._api_get_json("user") is None
+
+
+def test_expired_entries_are_dropped(tmp_path):
+    cache = ResponseCache(tmp_path, max_age=60)
+    cache.put("user", CachedResponse(body="{}", etag='"x"'))
+    assert cache.get("user") is not None
+    cache.max_age = -1
+    assert cache.get("user") is None
+    assert not list(tmp_path.glob("*.json"))
+
+
+def test_size_bound_evicts_least_recently_used(tmp_path):
+    cache = ResponseCache(tmp_path, max_bytes=10_000)
+    for name in ("a", "b", "c"):
+        cache.put(name, CachedResponse(body="x" * 3000, etag=name))
+        path = cache._file(name)
+        stamp = time.time() - {"a": 30, "b": 20, "c": 10}[name]
+        os.utime(path, (stamp, stamp))
+    cache.get("a")  # refresh "a" so "b" becomes the oldest
+    cache.put("d", CachedResponse(body="x" * 3000, etag="d"))
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("d") is not None
+
+
+def test_config_sets_response_cache_limits(tmp_path, monkeypatch):
+    from gh_pr_manager import main
+
+    conf = tmp_path / "config.json"
+    conf.write_text(json.dumps({"api_cache_max_age": 60, "api_cache_max_bytes": 1024}))
+    monkeypatch.setattr(main, "CONFIG_PATH", conf)
+    monkeypatch.setattr(github_client, "response_cache", ResponseCache(tmp_path / "api"))
+    main.PRManagerApp().load_config()
+    assert (github_client.response_cache.max_age, github_client.response_cache.max_bytes) == (60, 1024)
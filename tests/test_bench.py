@@ -0,0 +1,23 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+BENCH = Path(__file__).resolve().parent.parent / "benchmarks" / "bench.py"
+
+
+def test_bench_runs_offline(tmp_path):
+    output = tmp_path / "report.json"
+    args = ["--repos", "5", "--branches", "10", "--history", "50", "--bulk", "2", "--runs", "1", "--latency-ms", "0"]
+    result = subprocess.run(
+        [sys.executable, str(BENCH), *args, "--output", str(output)],
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    assert result.returncode == 0, result.stderr
+    assert "failed to fetch" not in result.stderr
+    report = json.loads(output.read_text())
+    assert report["meta"]["params"]["branches"] == 10
+    assert {"get_repos.parallel", "refresh.cached_clone", "branches.counts_git_2.39", "bulk.land"} <= set(report["results"])
+    assert all(stats["median"] >= 0 for stats in report["results"].values())
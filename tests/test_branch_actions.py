@@ -2,7 +2,7 @@ import pytest
 from textual.app import App
 
 from gh_pr_manager.main import BranchActions
-from gh_pr_manager import utils, main as main_module
+from gh_pr_manager import github_client, utils, main as main_module
 
 
 class _BranchApp(App):
@@ -12,7 +12,7 @@ class _BranchApp(App):
         self.branch = branch
 
     def compose(self):
-        yield BranchActions(self.repo, lambda: self.branch, lambda: None)
+        yield BranchActions(self.repo, lambda: [self.branch], lambda: None)
 
 
 @pytest.mark.asyncio
@@ -57,13 +57,52 @@ async def test_pr_flow_commands(tmp_path, monkeypatch):
     async with app.run_test() as pilot:
         await pilot.click("#pr_flow")
         await pilot.pause()
+        await pilot.app.workers.wait_for_complete()
+        await pilot.pause()
         msg = pilot.app.query_one("#action_msg").renderable
 
     expected = [
-        ["gh", "pr", "create", "--fill", "--head", "feature"],
-        ["gh", "pr", "merge", "--merge", "--delete-branch", "--yes"],
-        ["git", "-C", str(repo), "branch", "-D", "feature"],
+        ["gh", "pr", "create", "--head", "feature", "--fill"],
+        ["gh", "pr", "merge", "feature", "--merge", "--delete-branch"],
+        ["git", "-C", str(repo), "update-ref", "-d", "refs/remotes/origin/feature"],
     ]
-    for exp in expected:
-        assert exp in [c[0] for c in calls]
+    assert [c[0] for c in calls] == expected
+    assert calls[0][1] == str(repo)
     assert "PR merged and feature deleted" in msg
+
+
+@pytest.mark.asyncio
+async def test_branch_selector_bulk_delete(tmp_path, monkeypatch):
+    from pathlib import Path
+
+    from gh_pr_manager.main import BranchSelector
+
+    monkeypatch.setattr(Path, "home", lambda: tmp_path)
+    (tmp_path / ".cache" / "gh_pr_manager" / "org_repo").mkdir(parents=True)
+    calls = []
+
+    def fake_run(cmd, cwd=None):
+        calls.append(cmd)
+        return True, ""
+
+    monkeypatch.setattr(utils, "run_cmd", fake_run)
+
+    class _SelectorApp(App):
+        def compose(self):
+            yield BranchSelector("org/repo", ["a", "b", "main"], lambda: None)
+
+    async with _SelectorApp().run_test() as pilot:
+        selector = pilot.app.query_one(BranchSelector)
+        selector.apply_pr_status({"main": github_client.PullStatus("main", 3, checks="FAILURE")})
+        assert selector.list_view.items == ["a", "b", "main  #3 checks failing"]
+        selector.list_view.set_selected(0, True)
+        selector.list_view.set_selected(1, True)
+        await pilot.pause()
+        selector.query_one("#delete_branch").press()
+        await pilot.pause()
+        await pilot.app.workers.wait_for_complete()
+        await pilot.pause()
+        assert selector.branches == ["main"]
+
+    pushes = [c for c in calls if "push" in c]
+    assert pushes == [["git", "-C", str(tmp_path / ".cache" / "gh_pr_manager" / "org_repo"), "push", "origin", "--delete", "a", "b"]]
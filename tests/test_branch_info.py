@@ -0,0 +1,118 @@
+import subprocess
+
+from gh_pr_manager import branch_info, utils
+from gh_pr_manager.branch_info import BranchInfo, scan_branches, sort_branches
+
+
+def _git(*args, cwd=None):
+    env_args = ["-c", "user.name=Ada", "-c", "user.email=a@example.com", "-c", "init.defaultBranch=main"]
+    subprocess.run(["git", *env_args, *args], cwd=cwd, check=True, capture_output=True)
+
+
+def test_scan_reports_metadata_and_caches_counts(tmp_path, monkeypatch):
+    origin = tmp_path / "origin"
+    _git("init", "-q", str(origin))
+    _git("commit", "-q", "--allow-empty", "-m", "one", cwd=origin)
+    _git("checkout", "-q", "-b", "feature", cwd=origin)
+    _git("commit", "-q", "--allow-empty", "-m", "two", cwd=origin)
+    _git("commit", "-q", "--allow-empty", "-m", "three", cwd=origin)
+    _git("checkout", "-q", "main", cwd=origin)
+    _git("commit", "-q", "--allow-empty", "-m", "four", cwd=origin)
+    _git("branch", "old", "main~1", cwd=origin)
+    clone = tmp_path / "clone.git"
+    _git("clone", "-q", "--bare", str(origin), str(clone))
+    _git("-C", str(clone), "fetch", "-q", "origin", "+refs/heads/*:refs/remotes/origin/*")
+
+    monkeypatch.setattr(branch_info, "git_supports_ahead_behind", lambda: False)
+    calls = []
+    real_run = utils.run_cmd
+
+    def counting_run(cmd, cwd=None, input=None):
+        calls.append(cmd)
+        return real_run(cmd, cwd, input=input)
+
+    monkeypatch.setattr(utils, "run_cmd", counting_run)
+    infos = {i.name: i for i in scan_branches(clone)}
+    assert (infos["feature"].ahead, infos["feature"].behind) == (2, 1)
+    assert (infos["main"].ahead, infos["main"].behind) == (0, 0)
+    assert (infos["old"].ahead, infos["old"].behind) == (0, 1)
+    assert infos["feature"].author == "Ada" and infos["feature"].committed_at > 0
+    # Both uncached branches are counted by one rev-list.
+    assert sum("rev-list" in c for c in calls) == 1
+
+    calls.clear()
+    assert {i.name: i for i in scan_branches(clone)} == infos
+    assert len(calls) == 1 and "for-each-ref" in calls[0]
+
+
+def test_batched_counts_match_git(tmp_path, monkeypatch):
+    repo = tmp_path / "repo"
+    _git("init", "-q", str(repo))
+    for n in range(6):
+        _git("commit", "-q", "--allow-empty", "-m", f"main {n}", cwd=repo)
+    # Branches fork at different depths; one merges another back in.
+    for name, depth, commits in (("a", 1, 3), ("b", 4, 1), ("c", 2, 2)):
+        _git("checkout", "-q", "-b", name, f"main~{depth}", cwd=repo)
+        for n in range(commits):
+            _git("commit", "-q", "--allow-empty", "-m", f"{name} {n}", cwd=repo)
+    _git("merge", "-q", "--no-edit", "--no-ff", "b", cwd=repo)
+    _git("branch", "behind", "main~3", cwd=repo)
+
+    def rev(ref):
+        return subprocess.run(
+            ["git", "rev-parse", ref], cwd=repo, check=True, capture_output=True, text=True
+        ).stdout.strip()
+
+    monkeypatch.setattr(branch_info, "MERGE_BASE_CHUNK", 2)
+    heads = {name: rev(name) for name in ("a", "b", "c", "behind")}
+    counts = branch_info._count_batched(repo, rev("main"), heads.values())
+    for name, sha in heads.items():
+        output = subprocess.run(
+            ["git", "rev-list", "--left-right", "--count", f"{sha}...main"],
+            cwd=repo, check=True, capture_output=True, text=True,
+        ).stdout
+        assert counts[sha] == [int(n) for n in output.split()] != [0, 0], name
+
+
+def test_sort_branches():
+    info = {
+        "a": BranchInfo("a", "1", committed_at=10, ahead=5, behind=0),
+        "b": BranchInfo("b", "2", committed_at=30, ahead=1, behind=9),
+    }
+    names = ["c", "b", "a"]
+    assert sort_branches(names, info) == ["a", "b", "c"]
+    assert sort_branches(names, info, "date") == ["b", "a", "c"]
+    assert sort_branches(names, info, "ahead") == ["a", "b", "c"]
+    assert sort_branches(names, info, "behind") == ["b", "a", "c"]
+    assert info["b"].describe().endswith("+1/-9")
+
+
+def test_scan_uses_atom_with_guessed_base(tmp_path, monkeypatch):
+    monkeypatch.setattr(branch_info, "git_supports_ahead_behind", lambda: True)
+    calls = []
+
+    def fake_run(cmd, cwd=None):
+        calls.append(cmd)
+        if "refs/remotes/origin/main" in cmd:
+            return True, "main\n"
+        return True, "a\tmain\t10\tAda\t0 0\nb\tfeature\t20\tAda\t2 1\n"
+
+    monkeypatch.setattr(utils, "run_cmd", fake_run)
+    infos = {i.name: i for i in scan_branches(tmp_path)}
+    assert (infos["feature"].ahead, infos["feature"].behind) == (2, 1)
+    assert "%(ahead-behind:refs/remotes/origin/main)" in calls[-1][4]
+    assert not any("rev-list" in c for c in calls)
+
+
+def test_scan_counts_against_given_default_branch(tmp_path, monkeypatch):
+    monkeypatch.setattr(branch_info, "git_supports_ahead_behind", lambda: True)
+    calls = []
+
+    def fake_run(cmd, cwd=None):
+        calls.append(cmd)
+        return True, "a\tdevelop\t10\tAda\t0 0\nb\tfeature\t20\tAda\t4 0\n"
+
+    monkeypatch.setattr(utils, "run_cmd", fake_run)
+    infos = {i.name: i for i in scan_branches(tmp_path, "develop")}
+    assert (infos["feature"].ahead, infos["feature"].behind) == (4, 0)
+    assert len(calls) == 1 and "%(ahead-behind:refs/remotes/origin/develop)" in calls[0][4]
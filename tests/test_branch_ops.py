@@ -0,0 +1,103 @@
+import subprocess
+
+from gh_pr_manager import utils
+from gh_pr_manager.branch_ops import delete_remote_branches, parse_push_delete, summarize
+
+
+def _git(*args, cwd=None):
+    env_args = ["-c", "user.name=t", "-c", "user.email=t@example.com", "-c", "init.defaultBranch=main"]
+    subprocess.run(["git", *env_args, *args], cwd=cwd, check=True, capture_output=True)
+
+
+def _remote_heads(origin):
+    out = subprocess.run(
+        ["git", "-C", str(origin), "for-each-ref", "--format=%(refname:lstrip=2)", "refs/heads/"],
+        capture_output=True, text=True,
+    ).stdout
+    return out.split()
+
+
+def test_batched_delete_reports_each_branch(tmp_path, monkeypatch):
+    origin = tmp_path / "origin.git"
+    work = tmp_path / "work"
+    _git("init", "-q", "--bare", str(origin))
+    _git("clone", "-q", str(origin), str(work))
+    _git("commit", "-q", "--allow-empty", "-m", "init", cwd=work)
+    _git("push", "-q", "origin", *[f"HEAD:{b}" for b in ["main", "a", "b", "c", "d", "keep"]], cwd=work)
+    hook = origin / "hooks" / "pre-receive"
+    hook.write_text(
+        "#!/bin/sh\nwhile read o n r; do [ \"$r\" = refs/heads/d ] && exit 1; done; exit 0\n"
+    )
+    hook.chmod(0o755)
+
+    calls = []
+    real_run = utils.run_cmd
+
+    def counting_run(cmd, cwd=None):
+        calls.append(cmd)
+        return real_run(cmd, cwd)
+
+    monkeypatch.setattr(utils, "run_cmd", counting_run)
+    results = delete_remote_branches(work, ["a", "gone", "b", "c"], batch_size=3)
+    assert [(r.branch, r.ok) for r in results] == [("a", True), ("gone", False), ("b", True), ("c", True)]
+    assert "remote ref does not exist" in results[1].message
+    # One retry for the batch containing the missing ref, one for the rest.
+    assert len(calls) == 3
+    assert _remote_heads(origin) == ["d", "keep", "main"]
+
+    results = delete_remote_branches(work, ["d", "keep"])
+    assert [(r.branch, r.ok) for r in results] == [("d", False), ("keep", False)]
+    assert "declined" in results[0].message
+    assert _remote_heads(origin) == ["d", "keep", "main"]
+
+
+def test_parse_and_summarize():
+    output = (
+        "To github.com:o/r.git\n - [deleted]         a\n"
+        " ! [remote rejected] b (protected branch hook declined)\n"
+        "error: failed to push some refs\n"
+    )
+    results = parse_push_delete(output)
+    assert results["a"].ok and not results["b"].ok
+    assert results["b"].message == "protected branch hook declined"
+    text = summarize([results["a"], results["b"]])
+    assert text == "Deleted 1 branch(es); 1 failed: b (protected branch hook declined)"
+
+
+def test_land_branches_serializes_merges_and_continues(monkeypatch):
+    import threading
+    import time
+
+    from gh_pr_manager.branch_ops import land_branches
+
+    active = {"merges": 0, "peak": 0}
+    lock = threading.Lock()
+    stages = []
+    creates = []
+
+    def fake_run(cmd, cwd=None):
+        if cmd[:3] == ["gh", "pr", "create"]:
+            creates.append(cmd)
+        if cmd[:3] == ["gh", "pr", "create"] and "bad" in cmd:
+            return False, "no commits between main and bad"
+        if cmd[:3] == ["gh", "pr", "merge"]:
+            with lock:
+                active["merges"] += 1
+                active["peak"] = max(active["peak"], active["merges"])
+            time.sleep(0.02)
+            with lock:
+                active["merges"] -= 1
+        return True, ""
+
+    monkeypatch.setattr(utils, "run_cmd", fake_run)
+    results = land_branches(
+        ["a", "bad", "b", "c"], repo="o/r", max_workers=4,
+        progress=lambda branch, stage: stages.append((branch, stage)),
+    )
+    assert [(r.branch, r.ok) for r in results] == [("a", True), ("bad", False), ("b", True), ("c", True)]
+    assert results[1].message.startswith("create:")
+    assert active["peak"] == 1
+    assert ("bad", "create failed") in stages and ("c", "merged") in stages
+    # Without a clone there are no local commits for --fill to read.
+    assert not any("--fill" in cmd for cmd in creates)
+    assert sorted(cmd[cmd.index("--title") + 1] for cmd in creates) == ["a", "b", "bad", "c"]
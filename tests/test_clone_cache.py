@@ -0,0 +1,77 @@
+import json
+import os
+
+from gh_pr_manager.repo_cache import CloneCache, clone_path_in
+
+
+def _make_clone(root, repo, size, used):
+    path = clone_path_in(root, repo)
+    path.mkdir(parents=True)
+    (path / "HEAD").write_text("ref: refs/heads/main\n")
+    (path / "pack").write_bytes(b"x" * size)
+    os.utime(path, (used, used))
+    return path
+
+
+def test_evicts_least_recently_used_over_byte_budget(tmp_path):
+    cache = CloneCache(tmp_path, max_bytes=2500, max_entries=10)
+    for i, repo in enumerate(["o/a", "o/b", "o/c"]):
+        _make_clone(tmp_path, repo, 1000, used=100 + i)
+    assert cache.evict() == ["o/a"]
+    assert not clone_path_in(tmp_path, "o/a").exists()
+    assert set(cache.entries()) == {"o/b", "o/c"}
+    index = json.loads((tmp_path / "clones.json").read_text())
+    assert index["o/c"]["size"] > 1000
+
+
+def test_entry_limit_and_pinning(tmp_path):
+    cache = CloneCache(tmp_path, max_bytes=10**9, max_entries=1)
+    _make_clone(tmp_path, "o/a", 10, used=100)
+    _make_clone(tmp_path, "o/b", 10, used=200)
+    cache.pin("o/a")
+    assert cache.evict() == ["o/b"]
+    assert clone_path_in(tmp_path, "o/a").exists()
+
+
+def test_touch_updates_recency(tmp_path):
+    cache = CloneCache(tmp_path, max_bytes=10**9, max_entries=10)
+    _make_clone(tmp_path, "o/a", 10, used=100)
+    _make_clone(tmp_path, "o/b", 10, used=200)
+    cache.touch("o/a", fetched=True)
+    cache._evict_task.wait(5)
+    entries = cache.entries()
+    assert entries["o/a"].last_used > entries["o/b"].last_used
+    assert entries["o/a"].last_fetch == entries["o/a"].last_used
+    cache.max_entries = 1
+    assert cache.evict() == ["o/b"]
+
+
+def test_clones_in_use_or_selected_are_kept(tmp_path):
+    cache = CloneCache(tmp_path, max_bytes=10**9, max_entries=1)
+    _make_clone(tmp_path, "o/a", 10, used=100)
+    _make_clone(tmp_path, "o/b", 10, used=200)
+    _make_clone(tmp_path, "o/c", 10, used=300)
+    cache.selected = "o/b"
+    with cache.use("o/a"):
+        assert cache.evict() == ["o/c"]
+    assert cache.evict() == ["o/a"]
+    assert clone_path_in(tmp_path, "o/b").exists()
+    assert [p for p in tmp_path.iterdir() if p.is_dir()] == [clone_path_in(tmp_path, "o/b")]
+
+
+def test_sizes_measured_without_lock(tmp_path, monkeypatch):
+    from gh_pr_manager import repo_cache
+
+    cache = CloneCache(tmp_path, max_bytes=10**9, max_entries=10)
+    _make_clone(tmp_path, "o/a", 10, used=100)
+    locked = []
+    real_size = repo_cache._dir_size
+
+    def size(path):
+        locked.append(cache._lock.locked())
+        return real_size(path)
+
+    monkeypatch.setattr(repo_cache, "_dir_size", size)
+    cache.evict()
+    assert locked == [False]
+    assert cache.entries()["o/a"].size >= 10
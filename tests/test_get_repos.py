@@ -0,0 +1,71 @@
+import json
+import re
+import threading
+import time
+
+from gh_pr_manager import github_client
+from gh_pr_manager.api_cache import ResponseCache
+from gh_pr_manager.github_client import get_repos
+
+
+def _fake_owner(monkeypatch, total: int, link: bool = True):
+    """Serve ``total`` repositories for ``users/org/repos`` 100 per page."""
+    last = -(-total // 100)
+    lock = threading.Lock()
+    state = {"active": 0, "peak": 0, "calls": []}
+
+    def fake_run(cmd, cwd=None):
+        path = cmd[3]
+        with lock:
+            state["calls"].append(path)
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+        try:
+            if path == "users/org":
+                return True, "HTTP/2.0 200 OK\n\n" + json.dumps({"public_repos": total})
+            page = int(re.search(r"[?&]page=(\d+)", path).group(1))
+            time.sleep(0.05)
+            names = range((page - 1) * 100, min(page * 100, total))
+            headers = "HTTP/2.0 200 OK\n"
+            if link and last > 1:
+                headers += f'Link: <https://api.github.com/x?per_page=100&page={last}>; rel="last"\n'
+            body = json.dumps([{"full_name": f"org/r{i}"} for i in names])
+            return True, f"{headers}\n{body}"
+        finally:
+            with lock:
+                state["active"] -= 1
+
+    monkeypatch.setattr(github_client, "run_cmd_combined", fake_run)
+    monkeypatch.setattr(github_client, "response_cache", None)
+    return state
+
+
+def test_parallel_pages_merged_in_order(monkeypatch):
+    state = _fake_owner(monkeypatch, 950)
+    repos = get_repos("org", max_workers=4)
+    assert repos == [f"org/r{i}" for i in range(950)]
+    assert state["peak"] > 1
+    assert state["peak"] <= 4
+
+
+def test_sequential_mode_matches(monkeypatch):
+    state = _fake_owner(monkeypatch, 250)
+    assert get_repos("org", max_workers=1) == [f"org/r{i}" for i in range(250)]
+    assert state["peak"] == 1
+
+
+def test_page_count_from_repo_count_without_link(monkeypatch):
+    state = _fake_owner(monkeypatch, 300, link=False)
+    assert get_repos("org") == [f"org/r{i}" for i in range(300)]
+    assert "users/org" in state["calls"]
+
+
+def test_exact_multiple_of_page_size(monkeypatch):
+    _fake_owner(monkeypatch, 200)
+    assert len(get_repos("org")) == 200
+
+
+def test_cache_keeps_link_header(tmp_path, monkeypatch):
+    _fake_owner(monkeypatch, 150)
+    monkeypatch.setattr(github_client, "response_cache", ResponseCache(tmp_path))
+    assert len(get_repos("org")) == 150
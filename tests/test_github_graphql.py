@@ -0,0 +1,58 @@
+import json
+
+from gh_pr_manager import github_client
+from gh_pr_manager.github_client import RepoRecord, iter_repo_pages
+
+
+def _page(names, has_next, cursor=None):
+    return {
+        "data": {
+            "repositoryOwner": {
+                "repositories": {
+                    "pageInfo": {"hasNextPage": has_next, "endCursor": cursor},
+                    "nodes": [
+                        {
+                            "nameWithOwner": f"org/{name}",
+                            "name": name,
+                            "isArchived": name == "old",
+                            "pushedAt": "2025-01-01T00:00:00Z",
+                            "defaultBranchRef": {"name": "main"},
+                            "pullRequests": {"totalCount": 2},
+                        }
+                        for name in names
+                    ],
+                }
+            }
+        }
+    }
+
+
+def test_iter_repo_pages_follows_cursor(monkeypatch):
+    calls: list[list[str]] = []
+    pages = [_page(["a", "old"], True, "C1"), _page(["b"], False)]
+
+    def fake_run(cmd, cwd=None):
+        calls.append(cmd)
+        return True, json.dumps(pages[len(calls) - 1])
+
+    monkeypatch.setattr(github_client, "run_cmd_combined", fake_run)
+
+    stream = iter_repo_pages("org")
+    first = next(stream)
+    assert len(calls) == 1  # the first page is available before the second is fetched
+    records = first + [r for page in stream for r in page]
+
+    assert [r.full_name for r in records] == ["org/a", "org/old", "org/b"]
+    assert records[1] == RepoRecord("org/old", "old", "main", "2025-01-01T00:00:00Z", 2, True)
+    assert "cursor=C1" not in calls[0]
+    assert "cursor=C1" in calls[1]
+    assert "owner=org" in calls[0]
+
+
+def test_iter_repo_pages_stops_on_error(monkeypatch):
+    monkeypatch.setattr(
+        github_client,
+        "run_cmd_combined",
+        lambda cmd, cwd=None: (True, json.dumps({"errors": [{"message": "nope"}]})),
+    )
+    assert list(iter_repo_pages("org")) == []
@@ -0,0 +1,90 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from gh_pr_manager import github_client
+from gh_pr_manager.github_client import _api_get_json, _graphql, configure_backend
+from gh_pr_manager.http_backend import HTTPBackend, resolve_token
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, status, payload, headers=()):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("X-RateLimit-Limit", "5000")
+        self.send_header("X-RateLimit-Remaining", "4990")
+        self.send_header("X-RateLimit-Reset", "9999999999")
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self.server.requests.append(("GET", self.path, dict(self.headers)))
+        if self.path == "/user":
+            self._reply(200, {"login": "octo"}, [("ETag", '"v1"')])
+        else:
+            self._reply(404, {"message": "Not Found"})
+
+    def do_POST(self):
+        length = int(self.headers["Content-Length"])
+        payload = json.loads(self.rfile.read(length))
+        self.server.requests.append(("POST", self.path, payload))
+        self._reply(200, {"data": {"echo": payload["variables"]}})
+
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    server.connections = 0
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_requests_reuse_one_connection(stub_server):
+    backend = HTTPBackend(f"http://127.0.0.1:{stub_server.server_port}", token="t0k")
+    for _ in range(3):
+        ok, output = backend.request("GET", "user")
+        assert ok and output.startswith("HTTP/1.1 200")
+    ok, output = backend.request("GET", "missing")
+    assert not ok and '"Not Found"' in output
+    assert stub_server.connections == 1
+    assert stub_server.requests[0][2]["Authorization"] == "Bearer t0k"
+    backend.close()
+
+
+def test_github_client_uses_configured_backend(stub_server, monkeypatch, tmp_path):
+    monkeypatch.setattr(github_client, "response_cache", None)
+    monkeypatch.setattr(github_client, "run_cmd_combined", lambda cmd, cwd=None: pytest.fail("gh was spawned"))
+    configure_backend("http", base_url=f"http://127.0.0.1:{stub_server.server_port}", token="t")
+    try:
+        assert _api_get_json("user") == {"login": "octo"}
+        assert _graphql("query { x }", owner="org", cursor=None) == {"echo": {"owner": "org"}}
+        assert stub_server.requests[1][:2] == ("POST", "/graphql")
+    finally:
+        configure_backend("gh")
+    assert github_client.http_backend is None
+    with pytest.raises(ValueError):
+        configure_backend("carrier-pigeon")
+
+
+def test_resolve_token_prefers_environment(monkeypatch):
+    monkeypatch.setenv("GH_TOKEN", "from-env")
+    assert resolve_token() == "from-env"
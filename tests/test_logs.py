@@ -0,0 +1,53 @@
+import logging
+import queue
+
+import pytest
+
+from gh_pr_manager import logs
+
+
+@pytest.fixture
+def root_logger():
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    yield root
+    logs.shutdown_logging()
+    root.handlers[:] = handlers
+    root.setLevel(level)
+
+
+def test_setup_writes_rotating_file_off_thread(tmp_path, monkeypatch, root_logger):
+    monkeypatch.delenv(logs.LOG_LEVEL_ENV, raising=False)
+    formatted = []
+
+    class Costly:
+        def __str__(self):
+            formatted.append(True)
+            return "costly"
+
+    path = logs.setup_logging("info", tmp_path)
+    assert logs.setup_logging("debug", tmp_path / "other") == path
+    assert root_logger.level == logging.DEBUG
+    root_logger.setLevel(logging.INFO)
+    logging.info("found %d repos", 3)
+    logging.debug("details: %s", Costly())
+    logs.shutdown_logging()
+
+    assert path == tmp_path / logs.LOG_FILE
+    text = path.read_text()
+    assert "INFO [MainThread] root: found 3 repos" in text
+    assert "details" not in text and not formatted
+
+
+def test_env_overrides_level(tmp_path, monkeypatch, root_logger):
+    monkeypatch.setenv(logs.LOG_LEVEL_ENV, "warning")
+    logs.setup_logging("debug", tmp_path)
+    assert root_logger.level == logging.WARNING
+
+
+def test_full_queue_drops_records():
+    handler = logs._DroppingQueueHandler(queue.Queue(1))
+    record = logging.LogRecord("x", logging.INFO, __file__, 1, "msg", None, None)
+    handler.handle(record)
+    handler.handle(record)
+    assert handler.queue.qsize() == 1 and handler.dropped == 1
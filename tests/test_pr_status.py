@@ -0,0 +1,96 @@
+import json
+
+from gh_pr_manager import github_client, pr_status
+from gh_pr_manager.github_client import PullStatus, get_pull_statuses
+from gh_pr_manager.pr_status import FAST_INTERVAL, NORMAL_INTERVAL, StatusPoller
+
+
+def _pr(number, branch, checks=None, review=None, fork=False):
+    rollup = {"state": checks} if checks else None
+    return {
+        "number": number,
+        "headRefName": branch,
+        "isCrossRepository": fork,
+        "state": "OPEN",
+        "isDraft": False,
+        "reviewDecision": review,
+        "commits": {"nodes": [{"commit": {"statusCheckRollup": rollup}}]},
+    }
+
+
+def test_get_pull_statuses_single_paginated_query(monkeypatch):
+    pages = [
+        {"pageInfo": {"hasNextPage": True, "endCursor": "C1"}, "nodes": [_pr(3, "a", fork=True), _pr(1, "a", "SUCCESS", "APPROVED")]},
+        {"pageInfo": {"hasNextPage": False, "endCursor": None}, "nodes": [_pr(2, "b", "PENDING")]},
+    ]
+    calls = []
+
+    def fake_run(cmd, cwd=None):
+        calls.append(cmd)
+        return True, json.dumps({"data": {"repository": {"pullRequests": pages[len(calls) - 1]}}})
+
+    monkeypatch.setattr(github_client, "run_cmd_combined", fake_run)
+    statuses = get_pull_statuses("org/repo")
+    assert statuses["a"] == PullStatus("a", 1, "OPEN", "APPROVED", "SUCCESS")
+    assert statuses["a"].describe() == "#1 checks passing, approved"
+    assert statuses["b"].pending
+    assert len(calls) == 2
+    assert "owner=org" in calls[0] and "name=repo" in calls[0] and "cursor=C1" in calls[1]
+
+
+def test_merged_pr_heads_only_fetches_updates(monkeypatch):
+    def merged(branch, sha, updated, fork=False):
+        return {"headRefName": branch, "headRefOid": sha, "isCrossRepository": fork, "updatedAt": updated}
+
+    responses = [
+        [
+            {"pageInfo": {"hasNextPage": True, "endCursor": "C1"}, "nodes": [merged("a", "a1", "2025-03-01T00:00:00Z")]},
+            {"pageInfo": {"hasNextPage": False, "endCursor": None}, "nodes": [
+                merged("b", "f1", "2025-02-01T00:00:00Z", fork=True), merged("b", "b1", "2025-01-01T00:00:00Z"),
+            ]},
+        ],
+        [
+            {"pageInfo": {"hasNextPage": True, "endCursor": "C2"}, "nodes": [
+                merged("c", "c1", "2025-04-01T00:00:00Z"), merged("a", "a1", "2025-03-01T00:00:00Z"),
+                merged("b", "b1", "2025-01-01T00:00:00Z"),
+            ]},
+        ],
+    ]
+    calls = []
+
+    def fake_run(cmd, cwd=None):
+        calls.append(cmd)
+        page = responses[0].pop(0)
+        if not responses[0]:
+            responses.pop(0)
+        return True, json.dumps({"data": {"repository": {"pullRequests": page}}})
+
+    monkeypatch.setattr(github_client, "run_cmd_combined", fake_run)
+    monkeypatch.setattr(github_client, "_merged_heads", {})
+    assert github_client.get_merged_pr_heads("org/repo") == {"a": {"a1"}, "b": {"b1"}}
+    assert len(calls) == 2
+    # The second call stops at the first PR older than those already seen.
+    assert github_client.get_merged_pr_heads("org/repo") == {"a": {"a1"}, "b": {"b1"}, "c": {"c1"}}
+    assert len(calls) == 3 and not responses
+
+
+def test_poller_reports_changes_and_adapts_interval(monkeypatch):
+    responses = [
+        {"a": PullStatus("a", 1, checks="PENDING")},
+        {"a": PullStatus("a", 1, checks="SUCCESS"), "b": PullStatus("b", 2)},
+        {"a": PullStatus("a", 1, checks="SUCCESS"), "b": PullStatus("b", 2)},
+        {"b": PullStatus("b", 2)},
+        None,
+    ]
+    monkeypatch.setattr(github_client, "get_pull_statuses", lambda repo: responses.pop(0))
+    poller = StatusPoller("org/repo", lambda changes: None)
+
+    assert poller.poll_once() == {"a": PullStatus("a", 1, checks="PENDING")}
+    assert poller.interval == FAST_INTERVAL
+    assert set(poller.poll_once()) == {"a", "b"}
+    assert poller.interval == NORMAL_INTERVAL
+    assert poller.poll_once() == {}
+    assert poller.interval == NORMAL_INTERVAL * 2
+    assert poller.poll_once() == {"a": None}
+    assert poller.poll_once() is None
+    assert poller.interval == min(NORMAL_INTERVAL * 2, pr_status.SLOW_INTERVAL)
@@ -0,0 +1,136 @@
+import json
+
+from gh_pr_manager import github_client, rate_limit
+from gh_pr_manager.github_client import _api_get
+from gh_pr_manager.rate_limit import RateLimitScheduler
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(round(seconds, 3))
+        self.now += seconds
+
+
+def _scheduler(clock, **kwargs):
+    return RateLimitScheduler(clock=clock, wall_clock=clock, sleep=clock.sleep, **kwargs)
+
+
+def test_token_bucket_and_write_spacing():
+    clock = _Clock()
+    scheduler = _scheduler(clock, rate=2.0, burst=2, write_interval=1.0)
+    for _ in range(4):
+        scheduler.acquire()
+    assert clock.slept == [0.5, 0.5]
+
+    clock.slept.clear()
+    clock.now += 100
+    scheduler.acquire(write=True)
+    scheduler.acquire(write=True)
+    assert clock.slept == [1.0]
+
+
+def test_exhausted_budget_waits_for_reset():
+    clock = _Clock()
+    scheduler = _scheduler(clock)
+    scheduler.observe({
+        "x-ratelimit-resource": "graphql",
+        "x-ratelimit-limit": "5000",
+        "x-ratelimit-remaining": "0",
+        "x-ratelimit-reset": "1030",
+    })
+    assert not scheduler.can_afford(1, "graphql")
+    assert scheduler.can_afford(100, "core")
+    scheduler.acquire("graphql")
+    assert clock.slept == [30.0]
+    assert scheduler.budget("graphql") is None
+
+
+def test_call_retries_after_retry_after(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(rate_limit, "scheduler", _scheduler(clock))
+    responses = [
+        (False, "gh: You have exceeded a secondary rate limit (HTTP 403)"),
+        (True, "HTTP/2.0 429 Too Many Requests\nRetry-After: 7\n\n{}"),
+        (True, "HTTP/2.0 200 OK\nX-Ratelimit-Limit: 5000\nX-Ratelimit-Remaining: 4999\n"
+               "X-Ratelimit-Reset: 5000\nX-Ratelimit-Resource: core\n\n" + json.dumps({"ok": 1})),
+    ]
+    calls = []
+
+    def fake_run(cmd, cwd=None):
+        calls.append(cmd)
+        return responses.pop(0)
+
+    monkeypatch.setattr(github_client, "run_cmd_combined", fake_run)
+    response = _api_get("user")
+    assert json.loads(response.body) == {"ok": 1}
+    assert len(calls) == 3
+    assert clock.slept == [rate_limit.BASE_BACKOFF, 7.0]
+    assert rate_limit.scheduler.budget("core").remaining == 4999
+
+
+def test_failed_include_call_keeps_retry_after(monkeypatch):
+    import sys
+
+    from gh_pr_manager import utils
+
+    script = (
+        "import sys; print('HTTP/2.0 429 Too Many Requests'); print('Retry-After: 4'); print();"
+        "print('{}'); sys.stderr.write('gh: HTTP 429'); sys.exit(1)"
+    )
+    ok, output = utils.run_cmd_combined([sys.executable, "-c", script])
+    assert not ok and output.startswith("HTTP/2.0 429") and output.endswith("gh: HTTP 429")
+    assert not utils.run_cmd([sys.executable, "-c", script])[1].startswith("HTTP/")
+
+    clock = _Clock()
+    monkeypatch.setattr(rate_limit, "scheduler", _scheduler(clock))
+    responses = [(False, output), (True, "HTTP/2.0 200 OK\n\n" + json.dumps({"ok": 1}))]
+    monkeypatch.setattr(github_client, "run_cmd_combined", lambda cmd, cwd=None: responses.pop(0))
+    assert json.loads(_api_get("user").body) == {"ok": 1}
+    assert clock.slept == [4.0]
+
+
+def test_waits_are_bounded_and_reported(monkeypatch):
+    import asyncio
+
+    clock = _Clock()
+    scheduler = _scheduler(clock, max_wait=100.0)
+    monkeypatch.setattr(rate_limit, "scheduler", scheduler)
+    reported = []
+    scheduler.on_wait = lambda resource, seconds: reported.append((resource, seconds))
+    scheduler.observe({"x-ratelimit-limit": "5000", "x-ratelimit-remaining": "0", "x-ratelimit-reset": "1030"})
+    calls = []
+
+    def run():
+        calls.append(1)
+        return True, "{}"
+
+    # A background call waits for the reset and says so.
+    assert scheduler.call(run) == (True, "{}")
+    assert clock.slept == [30.0] and reported == [("core", 30.0)]
+
+    # A reset further away than max_wait fails without sleeping or sending.
+    scheduler.observe({"x-ratelimit-limit": "5000", "x-ratelimit-remaining": "0", "x-ratelimit-reset": "3000"})
+    ok, output = scheduler.call(run)
+    assert not ok and "rate limit" in output
+    assert clock.slept == [30.0] and len(calls) == 1
+
+    # On the event loop even a short wait is refused.
+    scheduler.observe({"x-ratelimit-limit": "5000", "x-ratelimit-remaining": "0", "x-ratelimit-reset": "1040"})
+
+    async def interactive():
+        return scheduler.call(run)
+
+    assert not asyncio.run(interactive())[0]
+    assert scheduler.call(run)[0] and clock.slept == [30.0, 10.0]
+
+    # Retries stop once the next delay would exceed the bound.
+    responses = [(False, "gh: API rate limit exceeded (HTTP 429)")] * 3
+    assert scheduler.call(lambda: responses.pop(0)) == (False, "gh: API rate limit exceeded (HTTP 429)")
+    assert clock.slept == [30.0, 10.0, rate_limit.BASE_BACKOFF] and responses == [responses[0]]
@@ -0,0 +1,93 @@
+from gh_pr_manager import utils
+from gh_pr_manager.refresh import RefreshPipeline
+
+
+def test_clone_refresh_fetches_once_and_lists_refs(tmp_path, monkeypatch):
+    monkeypatch.setattr("pathlib.Path.home", lambda: tmp_path)
+    (tmp_path / ".cache" / "gh_pr_manager" / "org_repo").mkdir(parents=True)
+    calls = []
+
+    def fake_run(cmd, cwd=None):
+        calls.append(cmd)
+        if "fetch" in cmd:
+            return False, "network down"
+        return True, "a1\tHEAD\t0\t\na1\tmain\t1700000000\tAda\nb2\tdev\t1700000100\tBob\n"
+
+    monkeypatch.setattr(utils, "run_cmd", fake_run)
+    pipeline = RefreshPipeline("org/repo")
+    assert pipeline.run() == {"main": "a1", "dev": "b2"}
+    assert [cmd[3] for cmd in calls if cmd[1] == "-C"] == ["fetch", "for-each-ref"]
+    assert pipeline.info[1].author == "Bob" and pipeline.info[1].ahead is None
+    assert [(t.name, t.ok) for t in pipeline.timings] == [("fetch", False), ("for-each-ref", True)]
+    assert "fetch" in pipeline.summary() and "(failed)" in pipeline.summary()
+
+
+def test_without_clone_lists_remote(tmp_path, monkeypatch):
+    monkeypatch.setattr("pathlib.Path.home", lambda: tmp_path)
+    calls = []
+
+    def fake_run(cmd, cwd=None):
+        calls.append(cmd)
+        return True, "a1\trefs/heads/main\n"
+
+    monkeypatch.setattr(utils, "run_cmd", fake_run)
+    pipeline = RefreshPipeline("org/repo")
+    assert pipeline.run() == {"main": "a1"}
+    assert len(calls) == 1 and "ls-remote" in calls[0]
+    assert [t.name for t in pipeline.timings] == ["list-remote"]
+
+
+def test_prefetch_result_and_cancel(tmp_path, monkeypatch):
+    import threading
+
+    from gh_pr_manager.refresh import Prefetcher
+
+    monkeypatch.setattr("pathlib.Path.home", lambda: tmp_path)
+    (tmp_path / ".cache" / "gh_pr_manager" / "org_repo").mkdir(parents=True)
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def fake_run(cmd, cwd=None):
+        calls.append(cmd)
+        if "fetch" in cmd:
+            started.set()
+            release.wait(5)
+        return True, "a1\tmain\t0\tAda\n"
+
+    monkeypatch.setattr(utils, "run_cmd", fake_run)
+    prefetch = Prefetcher("org/repo").start()
+    started.wait(5)
+    prefetch.cancel()
+    release.set()
+    assert prefetch.result(5) is None
+    assert prefetch._done.wait(5)
+    assert [cmd[3] for cmd in calls if cmd[1] == "-C"] == ["fetch"]
+
+    calls.clear()
+    assert Prefetcher("org/repo").start().result(5) == {"main": "a1"}
+
+
+def test_prefetch_wait_ends_when_caller_is_cancelled(tmp_path, monkeypatch):
+    import threading
+
+    from gh_pr_manager.refresh import Prefetcher
+
+    monkeypatch.setattr("pathlib.Path.home", lambda: tmp_path)
+    (tmp_path / ".cache" / "gh_pr_manager" / "org_repo").mkdir(parents=True)
+    release = threading.Event()
+
+    def fake_run(cmd, cwd=None):
+        if "fetch" in cmd:
+            release.wait(5)
+        return True, "a1\tmain\t0\tAda\n"
+
+    monkeypatch.setattr(utils, "run_cmd", fake_run)
+    prefetch = Prefetcher("org/repo").start()
+    assert prefetch.result(0.05) is None and not prefetch.cancelled
+    cancel = threading.Event()
+    threading.Timer(0.05, cancel.set).start()
+    assert prefetch.result(5, cancel=cancel) is None
+    assert prefetch.cancelled
+    release.set()
+    # Let the pool finish before monkeypatch restores HOME.
+    assert prefetch._done.wait(5)
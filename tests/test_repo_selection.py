@@ -4,31 +4,40 @@ from pathlib import Path
 import pytest
 
 from gh_pr_manager import main, utils
-from gh_pr_manager.main import PRManagerApp
+from gh_pr_manager.main import BranchSelector, PRManagerApp
+
+
+LS_REMOTE = "a1\trefs/heads/main\nb2\trefs/heads/feature\n"
+FOR_EACH_REF = "a1\tHEAD\t0\t\na1\tmain\t1700000000\tAda\nc3\tfeature\t1700000000\tBob\n"
+
+
+def _fake_git(calls):
+    def fake_run(cmd, cwd=None):
+        calls.append(cmd)
+        if cmd[:2] == ["git", "init"]:
+            Path(cmd[-1]).mkdir(parents=True)
+        if "ls-remote" in cmd:
+            return True, LS_REMOTE
+        if "for-each-ref" in cmd:
+            return True, FOR_EACH_REF
+        return True, ""
+
+    return fake_run
 
 
 @pytest.mark.asyncio
-async def test_clone_when_missing(tmp_path, monkeypatch):
+async def test_branches_listed_without_clone(tmp_path, monkeypatch):
     conf = tmp_path / "config.json"
     conf.write_text(json.dumps({"selected_repository": ""}))
     monkeypatch.setattr(main, "CONFIG_PATH", conf)
-    monkeypatch.setattr(PRManagerApp, "CONFIG_PATH", conf, raising=False)
 
     home = tmp_path / "home"
     home.mkdir()
     monkeypatch.setattr(Path, "home", lambda: home)
 
-    repo_path = home / ".cache" / "gh_pr_manager" / "org/repo1"
     calls: list[list[str]] = []
-
-    def fake_run(cmd, cwd=None):
-        calls.append(cmd)
-        if cmd[:4] == ["git", "-C", str(repo_path), "for-each-ref"]:
-            return True, ""
-        return True, ""
-
-    monkeypatch.setattr(utils, "run_cmd", fake_run)
-    monkeypatch.setattr(main, "run_cmd", fake_run)
+    monkeypatch.setattr(utils, "run_cmd", _fake_git(calls))
+    monkeypatch.setattr(main, "run_cmd", _fake_git(calls))
 
     app = PRManagerApp()
     async with app.run_test() as pilot:
@@ -36,41 +45,236 @@ async def test_clone_when_missing(tmp_path, monkeypatch):
         pilot.app.on_owner_selected("org")
         await pilot.pause()
         pilot.app.on_repo_selected("org/repo1")
-        await pilot.pause()
+        await app.workers.wait_for_complete()
+        await pilot.pause(0.2)
+        selector = pilot.app.query_one(main.BranchSelector)
+        assert selector.branches == ["feature", "main"]
 
-    assert ["gh", "repo", "clone", "org/repo1", str(repo_path)] in calls
-    assert ["git", "-C", str(repo_path), "pull"] not in calls
+    assert any("ls-remote" in c and "https://github.com/org/repo1.git" in c for c in calls)
+    assert not any(c[:3] == ["gh", "repo", "clone"] for c in calls)
+    assert not (home / ".cache" / "gh_pr_manager" / "org_repo1").exists()
 
 
 @pytest.mark.asyncio
-async def test_pull_when_cloned(tmp_path, monkeypatch):
+async def test_existing_clone_not_pulled_on_select(tmp_path, monkeypatch):
     conf = tmp_path / "config.json"
     conf.write_text(json.dumps({"selected_repository": ""}))
     monkeypatch.setattr(main, "CONFIG_PATH", conf)
-    monkeypatch.setattr(PRManagerApp, "CONFIG_PATH", conf, raising=False)
 
     home = tmp_path / "home"
-    repo_path = home / ".cache" / "gh_pr_manager" / "org/repo1"
+    repo_path = home / ".cache" / "gh_pr_manager" / "org_repo1"
     repo_path.mkdir(parents=True)
     monkeypatch.setattr(Path, "home", lambda: home)
 
     calls: list[list[str]] = []
-
-    def fake_run(cmd, cwd=None):
-        calls.append(cmd)
-        if cmd[:4] == ["git", "-C", str(repo_path), "for-each-ref"]:
-            return True, ""
-        return True, ""
-
-    monkeypatch.setattr(utils, "run_cmd", fake_run)
-    monkeypatch.setattr(main, "run_cmd", fake_run)
+    monkeypatch.setattr(utils, "run_cmd", _fake_git(calls))
+    monkeypatch.setattr(main, "run_cmd", _fake_git(calls))
 
     app = PRManagerApp()
     async with app.run_test() as pilot:
         await pilot.pause()
         pilot.app.on_owner_selected("org")
         await pilot.pause()
-        pilot.app.on_repo_selected("org/repo1")
+        pilot.app.on_repo_selected("org/repo1", "develop")
+        await pilot.pause(0.2)
+        selector = pilot.app.query_one(BranchSelector)
+        assert selector.branches == ["feature", "main"]
+        assert selector.base == "develop"
+
+    assert ["git", "-C", str(repo_path), "pull"] not in calls
+    # Ahead/behind are counted afterwards, not before the list is shown.
+    assert [cmd[3] for cmd in calls if cmd[1] == "-C"][:2] == ["fetch", "for-each-ref"]
+    config = json.loads(conf.read_text())
+    assert (config["selected_repository"], config["default_branch"]) == ("org/repo1", "develop")
+
+
+def test_ensure_clone_is_lazy(tmp_path, monkeypatch):
+    from gh_pr_manager import repo_cache
+
+    monkeypatch.setattr(Path, "home", lambda: tmp_path)
+    calls: list[list[str]] = []
+    monkeypatch.setattr(utils, "run_cmd", _fake_git(calls))
+    path, _ = repo_cache.ensure_clone("org/repo1")
+    # Built next to the final path and renamed into place once fetched.
+    assert calls[0][:4] == ["git", "init", "--bare", "-q"]
+    assert Path(calls[0][4]).parent == path.parent and Path(calls[0][4]).name.startswith(".cloning-")
+    assert calls[-1][-3:] == ["--quiet", "--filter=blob:none", "origin"]
+    assert path.is_dir()
+    count = len(calls)
+    repo_cache.ensure_clone("org/repo1")
+    assert len(calls) == count
+
+
+def test_concurrent_ensure_clone_clones_once(tmp_path, monkeypatch):
+    import threading
+    import time
+
+    from gh_pr_manager import repo_cache
+
+    monkeypatch.setattr(Path, "home", lambda: tmp_path)
+    calls: list[list[str]] = []
+    fake = _fake_git(calls)
+
+    def slow_fetch(cmd, cwd=None):
+        if "fetch" in cmd:
+            time.sleep(0.1)
+        return fake(cmd, cwd)
+
+    monkeypatch.setattr(utils, "run_cmd", slow_fetch)
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(repo_cache.ensure_clone("org/repo1")))
+        for _ in range(2)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    path = repo_cache.clone_path("org/repo1")
+    assert results == [(path, ""), (path, "")]
+    assert sum(cmd[:2] == ["git", "init"] for cmd in calls) == 1
+
+    # A failed clone only removes its own directory.
+    def failing_fetch(cmd, cwd=None):
+        return (False, "boom") if "fetch" in cmd else fake(cmd, cwd)
+
+    monkeypatch.setattr(utils, "run_cmd", failing_fetch)
+    assert repo_cache.ensure_clone("org/repo2") == (None, "boom")
+    clones = [p.name for p in repo_cache.cache_root().iterdir() if p.is_dir()]
+    assert clones == ["org_repo1"]
+
+
+def _git(*args, cwd=None):
+    import subprocess
+
+    env_args = ["-c", "user.name=t", "-c", "user.email=t@example.com", "-c", "init.defaultBranch=main"]
+    subprocess.run(["git", *env_args, *args], cwd=cwd, check=True, capture_output=True)
+
+
+def test_bare_blobless_clone_and_fetch(tmp_path, monkeypatch):
+    import subprocess
+
+    from gh_pr_manager import repo_cache
+
+    origin = tmp_path / "origin"
+    _git("init", "-q", str(origin))
+    (origin / "big.txt").write_text("x" * 10_000)
+    _git("add", ".", cwd=origin)
+    _git("commit", "-qm", "init", cwd=origin)
+    _git("branch", "feature", cwd=origin)
+    _git("config", "uploadpack.allowFilter", "true", cwd=origin)
+
+    monkeypatch.setattr(Path, "home", lambda: tmp_path / "home")
+    monkeypatch.setattr(repo_cache, "remote_url", lambda repo: f"file://{origin}")
+    path, err = repo_cache.ensure_clone("org/repo1")
+    assert path is not None, err
+
+    def git_out(*args):
+        return subprocess.run(["git", "-C", str(path), *args], capture_output=True, text=True).stdout
+
+    assert git_out("rev-parse", "--is-bare-repository").strip() == "true"
+    assert not (path / "big.txt").exists()
+    refs = git_out("for-each-ref", "--format=%(refname)", "refs/remotes/origin/").split()
+    assert refs == ["refs/remotes/origin/feature", "refs/remotes/origin/main"]
+
+    _git("branch", "-D", "feature", cwd=origin)
+    _git("branch", "newer", cwd=origin)
+    ok, out = repo_cache.update_clone("org/repo1")
+    assert ok, out
+    refs = git_out("for-each-ref", "--format=%(refname:lstrip=3)", "refs/remotes/origin/").split()
+    assert refs == ["main", "newer"]
+
+
+@pytest.mark.asyncio
+async def test_repo_pages_render_progressively(monkeypatch):
+    import threading
+
+    from textual.app import App
+    from textual.widgets import Input
+
+    from gh_pr_manager import github_client
+    from gh_pr_manager.main import RepoSelectionWidget
+    from gh_pr_manager.virtual_list import VirtualList
+
+    release = threading.Event()
+
+    def pages(owner):
+        yield [github_client.RepoRecord("org/alpha", "alpha"), github_client.RepoRecord("org/beta", "beta")]
+        release.wait(5)
+        yield [github_client.RepoRecord("org/gamma", "gamma"), github_client.RepoRecord("org/bravo", "bravo")]
+
+    monkeypatch.setattr(github_client, "iter_repo_pages", pages)
+
+    class _RepoApp(App):
+        def compose(self):
+            yield RepoSelectionWidget("org")
+
+    async with _RepoApp().run_test() as pilot:
+        await pilot.pause()
+        widget = pilot.app.query_one(RepoSelectionWidget)
+        assert len(pilot.app.query_one("#repo_list", VirtualList)) == 2
+        pilot.app.query_one("#repo_filter", Input).value = "b"
+        await pilot.pause(0.3)
+        assert [r.full_name for r in widget.filtered_repos] == ["org/beta"]
+        release.set()
+        await pilot.pause(0.3)
+        await pilot.app.workers.wait_for_complete()
+        await pilot.pause()
+        assert [r.full_name for r in widget.filtered_repos] == ["org/beta", "org/bravo"]
+        assert len(pilot.app.query_one("#repo_list", VirtualList)) == 2
+        assert not widget.loading
+
+
+@pytest.mark.asyncio
+async def test_clearing_filter_shows_every_repository(monkeypatch):
+    from textual.app import App
+    from textual.widgets import Input
+
+    from gh_pr_manager import github_client, main
+    from gh_pr_manager.main import RepoSelectionWidget
+    from gh_pr_manager.virtual_list import VirtualList
+
+    records = [github_client.RepoRecord(f"org/repo{i}", f"repo{i}") for i in range(5)]
+    monkeypatch.setattr(github_client, "iter_repo_pages", lambda owner: iter([records]))
+    monkeypatch.setattr(main, "MAX_FILTER_RESULTS", 2)
+
+    class _RepoApp(App):
+        def compose(self):
+            yield RepoSelectionWidget("org")
+
+    async with _RepoApp().run_test() as pilot:
+        await pilot.pause()
+        widget = pilot.app.query_one(RepoSelectionWidget)
+        filter_input = pilot.app.query_one("#repo_filter", Input)
+        filter_input.value = "repo"
+        await pilot.pause(0.3)
+        await pilot.app.workers.wait_for_complete()
         await pilot.pause()
+        assert len(widget.filtered_repos) == 2
+        filter_input.value = ""
+        await pilot.pause(0.3)
+        assert widget.filtered_repos == records
+        assert len(pilot.app.query_one("#repo_list", VirtualList)) == 5
+
+
+@pytest.mark.asyncio
+async def test_last_repository_prefetched_at_launch(tmp_path, monkeypatch):
+    conf = tmp_path / "config.json"
+    conf.write_text(json.dumps({"selected_repository": "org/repo1"}))
+    monkeypatch.setattr(main, "CONFIG_PATH", conf)
+    home = tmp_path / "home"
+    home.mkdir()
+    monkeypatch.setattr(Path, "home", lambda: home)
 
-    assert ["git", "-C", str(repo_path), "pull"] in calls
+    calls: list[list[str]] = []
+    monkeypatch.setattr(utils, "run_cmd", _fake_git(calls))
+
+    app = PRManagerApp()
+    async with app.run_test() as pilot:
+        await pilot.pause()
+        assert app._prefetch.result(5) == {"main": "a1", "feature": "b2"}
+        assert len(calls) == 1
+        await pilot.press("ctrl+r")
+        await pilot.pause(0.2)
+        assert pilot.app.query_one(BranchSelector).branches == ["feature", "main"]
+        assert len(calls) == 1
@@ -0,0 +1,69 @@
+from gh_pr_manager.search import SearchIndex
+
+
+def _names(index, query, limit=None):
+    return [index.names[i] for i in index.search(query, limit)]
+
+
+def test_ranking_prefix_then_boundary_then_substring_then_subsequence():
+    index = SearchIndex([
+        "org/my-api-server",   # word boundary "api"
+        "org/rapid",            # substring "api"
+        "org/api",              # prefix of the short name
+        "org/a-p-i-tools",      # subsequence only
+        "org/unrelated",
+    ])
+    assert _names(index, "api") == [
+        "org/api",
+        "org/my-api-server",
+        "org/rapid",
+        "org/a-p-i-tools",
+    ]
+
+
+def test_empty_query_returns_everything_in_order():
+    index = SearchIndex(["b", "a"])
+    assert _names(index, "") == ["b", "a"]
+    assert _names(index, "  ", limit=1) == ["b"]
+
+
+def test_incremental_add_and_limit():
+    index = SearchIndex(f"org/service-{i}" for i in range(1000))
+    index.add(["org/zeta-service"])
+    results = _names(index, "zeta")
+    assert results == ["org/zeta-service"]
+    assert len(index.search("service", limit=20)) == 20
+
+
+def test_case_insensitive():
+    index = SearchIndex(["Org/CamelRepo"])
+    assert _names(index, "camel") == ["Org/CamelRepo"]
+
+
+
+def test_search_during_add_sees_only_complete_entries():
+    import threading
+
+    index = SearchIndex(["org/alpha"])
+    results, errors, threads = [], [], []
+
+    def search():
+        try:
+            results.append(index.search("o"))
+        except Exception as exc:
+            errors.append(exc)
+
+    class SearchOnAppend(list):
+        def append(self, item):
+            # Search from another thread in the middle of add().
+            thread = threading.Thread(target=search)
+            threads.append(thread)
+            thread.start()
+            thread.join(0.2)
+            super().append(item)
+
+    index._normalized = SearchOnAppend(index._normalized)
+    index.add(["org/beta"])
+    for thread in threads:
+        thread.join(5)
+    assert errors == [] and results and set(results[0]) <= {0, 1}
@@ -0,0 +1,96 @@
+import json
+import time
+
+from gh_pr_manager import github_client
+from gh_pr_manager.github_client import check_auth_status, get_user_login, get_user_orgs
+from gh_pr_manager.session import GitHubSession, SessionState
+
+
+def _counting_resolver(state: SessionState):
+    calls = []
+
+    def resolve():
+        calls.append(1)
+        return SessionState(state.login, list(state.orgs), state.authenticated)
+
+    return resolve, calls
+
+
+def test_resolves_once_and_persists(tmp_path):
+    path = tmp_path / "session.json"
+    resolve, calls = _counting_resolver(SessionState("me", ["org"], True))
+    session = GitHubSession(resolve, path)
+    assert session.state().login == "me"
+    assert session.state().orgs == ["org"]
+    assert len(calls) == 1
+    assert json.loads(path.read_text())["login"] == "me"
+
+    # A new process reads the persisted copy without resolving.
+    fresh = GitHubSession(resolve, path)
+    assert fresh.state().authenticated
+    assert len(calls) == 1
+
+
+def test_stale_state_served_while_refreshing(tmp_path):
+    path = tmp_path / "session.json"
+    path.write_text(json.dumps({"login": "old", "orgs": [], "authenticated": True,
+                                "resolved_at": time.time() - 3600}))
+    resolve, calls = _counting_resolver(SessionState("new", [], True))
+    session = GitHubSession(resolve, path, ttl=60)
+    assert session.state().login == "old"
+    session._refresh_task.wait(5)
+    assert session.state().login == "new"
+    assert len(calls) == 1
+
+
+def test_unauthenticated_state_not_persisted(tmp_path):
+    path = tmp_path / "session.json"
+    resolve, calls = _counting_resolver(SessionState())
+    session = GitHubSession(resolve, path)
+    assert not session.state().authenticated
+    assert not path.exists()
+
+
+def test_client_functions_share_session(tmp_path, monkeypatch):
+    resolve, calls = _counting_resolver(SessionState("me", ["a", "b"], True))
+    monkeypatch.setattr(github_client, "session", GitHubSession(resolve, tmp_path / "s.json"))
+    assert check_auth_status()
+    assert get_user_login() == "me"
+    assert get_user_orgs() == ["a", "b"]
+    assert len(calls) == 1
+
+
+def test_failed_refresh_keeps_authenticated_state(tmp_path):
+    path = tmp_path / "session.json"
+    path.write_text(json.dumps({"login": "me", "orgs": ["org"], "authenticated": True,
+                                "resolved_at": time.time() - 3600}))
+    resolve, calls = _counting_resolver(SessionState())
+    session = GitHubSession(resolve, path, ttl=60)
+    assert session.state().login == "me"
+    session._refresh_task.wait(5)
+    assert len(calls) == 1
+    assert session.state().authenticated and session.state().login == "me"
+    assert json.loads(path.read_text())["login"] == "me"
+
+
+def test_rejected_credentials_invalidate_session(tmp_path):
+    path = tmp_path / "session.json"
+    path.write_text(json.dumps({"login": "me", "orgs": [], "authenticated": True,
+                                "resolved_at": time.time() - 3600}))
+    session = GitHubSession(lambda: SessionState(rejected=True), path, ttl=60)
+    assert session.state().login == "me"
+    session._refresh_task.wait(5)
+    assert not session.state().authenticated
+    assert not path.exists()
+
+
+def test_resolver_tells_rejection_from_network_failure(monkeypatch):
+    monkeypatch.setattr(github_client, "response_cache", None)
+    for output, rejected in [
+        ("HTTP/2.0 401 Unauthorized\n\n{}\ngh: Bad credentials (HTTP 401)", True),
+        ("To get started with GitHub CLI, please run:  gh auth login", True),
+        ("error connecting to api.github.com", False),
+    ]:
+        monkeypatch.setattr(github_client, "run_cmd_combined", lambda cmd, cwd=None, output=output: (False, output))
+        state = github_client._resolve_session()
+        assert not state.authenticated and state.rejected == rejected
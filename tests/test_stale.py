@@ -0,0 +1,63 @@
+import subprocess
+
+from gh_pr_manager.stale import ACTIVE, INACTIVE, MERGED, SQUASH_MERGED, classify_branches
+
+
+def _git(*args, cwd=None, date="2025-01-01T00:00:00"):
+    env = {"GIT_AUTHOR_DATE": date, "GIT_COMMITTER_DATE": date, "PATH": "/usr/bin:/bin"}
+    env_args = ["-c", "user.name=t", "-c", "user.email=t@example.com", "-c", "init.defaultBranch=main"]
+    subprocess.run(["git", *env_args, *args], cwd=cwd, check=True, capture_output=True, env=env)
+
+
+def _rev(cwd, ref):
+    return subprocess.run(["git", "rev-parse", ref], cwd=cwd, capture_output=True, text=True).stdout.strip()
+
+
+def test_classify_merged_squashed_inactive_active(tmp_path):
+    origin = tmp_path / "origin"
+    _git("init", "-q", str(origin))
+    _git("commit", "-q", "--allow-empty", "-m", "base", cwd=origin)
+    _git("checkout", "-q", "-b", "merged", cwd=origin)
+    _git("commit", "-q", "--allow-empty", "-m", "merge me", cwd=origin)
+    _git("checkout", "-q", "-b", "squashed", "main", cwd=origin)
+    _git("commit", "-q", "--allow-empty", "-m", "squash me", cwd=origin)
+    _git("checkout", "-q", "-b", "old", "main", cwd=origin)
+    _git("commit", "-q", "--allow-empty", "-m", "old work", cwd=origin, date="2020-01-01T00:00:00")
+    _git("checkout", "-q", "-b", "fresh", "main", cwd=origin)
+    _git("commit", "-q", "--allow-empty", "-m", "new work", cwd=origin, date="2025-06-01T00:00:00")
+    _git("checkout", "-q", "main", cwd=origin)
+    _git("merge", "-q", "--no-ff", "-m", "merge", "merged", cwd=origin, date="2025-06-01T00:00:00")
+    # Created from main without commits: reachable from it, but nothing landed.
+    _git("branch", "empty", cwd=origin)
+
+    clone = tmp_path / "clone.git"
+    _git("clone", "-q", "--bare", str(origin), str(clone))
+    _git("-C", str(clone), "fetch", "-q", "origin", "+refs/heads/*:refs/remotes/origin/*")
+
+    now = 1751328000  # 2025-07-01
+    report = classify_branches(
+        clone,
+        merged_pr_heads={
+            "merged": {_rev(origin, "merged")},
+            "squashed": {_rev(origin, "squashed")},
+            "fresh": {"0" * 40},
+        },
+        inactive_days=90,
+        now=now,
+    )
+    assert report.base == "main"
+    assert report.categories == {
+        "merged": MERGED,
+        "squashed": SQUASH_MERGED,
+        "old": INACTIVE,
+        "fresh": ACTIVE,
+        "empty": ACTIVE,
+    }
+    assert report.prunable == ["merged", "old", "squashed"]
+    assert report.summary() == "1 merged, 1 squash-merged, 1 inactive, 2 active"
+    assert report.merged_prs_known
+
+    # An open PR protects its head branch; a failed PR lookup is recorded.
+    report = classify_branches(clone, merged_pr_heads=None, inactive_days=90, now=now, open_prs=["old"])
+    assert report.categories["old"] == INACTIVE and "old" not in report.prunable
+    assert not report.merged_prs_known
@@ -0,0 +1,101 @@
+import sys
+import threading
+import time
+
+import pytest
+
+from gh_pr_manager import main
+from gh_pr_manager.main import PRManagerApp, TaskMonitor
+from gh_pr_manager.tasks import CANCELLED, DONE, FAILED, RUNNING, TIMED_OUT, TaskPool
+
+
+def test_fixed_workers_run_fifo():
+    pool = TaskPool(max_workers=2)
+    release = threading.Event()
+    order = []
+
+    def job(n):
+        release.wait(5)
+        order.append(n)
+        return n
+
+    submitted = [pool.submit(job, n, name=f"job {n}") for n in range(5)]
+    time.sleep(0.05)
+    assert [t.state for t in pool.snapshot()[:3]] == [RUNNING, RUNNING, "queued"]
+    assert "2 running, 3 queued" in pool.describe()
+    release.set()
+    assert [t.result(5) for t in submitted] == list(range(5))
+    assert len(pool._threads) == 3  # two workers and the supervisor
+
+
+def test_delay_cancel_and_failure():
+    pool = TaskPool(max_workers=1)
+    ran = []
+    delayed = pool.submit(ran.append, "late", delay=0.1)
+    skipped = pool.submit(ran.append, "never", delay=0.05)
+    skipped.cancel()
+    failing = pool.submit(lambda: 1 / 0)
+    assert delayed.state == "scheduled"
+    assert delayed.wait(5) and skipped.wait(5) and skipped.future.cancelled()
+    assert failing.wait(5) and failing.state == FAILED
+    assert ran == ["late"] and delayed.state == DONE and skipped.state == CANCELLED
+
+
+def test_deadlines_enforced_by_pool():
+    pool = TaskPool(max_workers=1)
+    release = threading.Event()
+    timeouts = []
+
+    def slow(task_cancel):
+        task_cancel.wait(5)
+        release.wait(5)
+        return "late"
+
+    cancel = threading.Event()
+    running = pool.submit(slow, cancel, deadline=0.1, on_timeout=timeouts.append, cancel=cancel)
+    queued = pool.submit(lambda: "never", deadline=0.1, on_timeout=timeouts.append)
+    time.sleep(0.3)
+    assert running.state == TIMED_OUT and running.cancelled
+    assert queued.state == TIMED_OUT and queued.future.cancelled()
+    assert set(timeouts) == {running, queued}
+    release.set()
+    assert running.result(5) == "late" and running.state == TIMED_OUT
+
+
+def test_cancelled_task_does_not_time_out():
+    pool = TaskPool(max_workers=1)
+    timeouts = []
+    task = pool.submit(time.sleep, 0.5, deadline=0.2, on_timeout=timeouts.append)
+    time.sleep(0.05)
+    task.cancel()
+    assert task.wait(5)
+    time.sleep(0.1)
+    assert timeouts == [] and task.state != TIMED_OUT
+
+
+def test_deadline_kills_child_process():
+    from gh_pr_manager import utils
+
+    pool = TaskPool(max_workers=1)
+    cmd = [sys.executable, "-c", "import time; time.sleep(30)"]
+    start = time.monotonic()
+    task = pool.submit(utils.run_cmd, cmd, deadline=0.2)
+    ok, output = task.result(5)
+    assert not ok and output.startswith("Command cancelled")
+    assert time.monotonic() - start < 5 and task.state == TIMED_OUT
+    ok, output = utils.run_cmd(cmd, timeout=0.2)
+    assert not ok and "timed out" in output
+
+
+@pytest.mark.asyncio
+async def test_task_monitor_screen(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "CONFIG_PATH", tmp_path / "config.json")
+    app = PRManagerApp()
+    async with app.run_test() as pilot:
+        await pilot.press("ctrl+t")
+        await pilot.pause()
+        assert isinstance(app.screen, TaskMonitor)
+        assert "workers" in str(app.screen.query_one("#task_monitor").render())
+        await pilot.press("escape")
+        await pilot.pause()
+        assert not isinstance(app.screen, TaskMonitor)
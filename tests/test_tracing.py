@@ -0,0 +1,67 @@
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from gh_pr_manager import tracing, utils
+
+
+@pytest.fixture
+def trace_file(tmp_path, monkeypatch):
+    path = tmp_path / "trace.jsonl"
+    monkeypatch.setattr(tracing, "tracer", tracing.Tracer(path))
+    return path
+
+
+def test_run_cmd_records_nested_span(trace_file):
+    with tracing.span("outer", repo="o/r") as outer:
+        ok, _ = utils.run_cmd([sys.executable, "-c", "print('hello')"], cwd=trace_file.parent)
+    assert ok
+    cmd, parent = tracing.read_spans(trace_file)
+    assert parent.span_id == outer.span_id and parent.parent_id is None
+    assert cmd.parent_id == outer.span_id
+    assert cmd.attrs["argv"][1:] == ["-c", "print('hello')"]
+    assert cmd.attrs["cwd"] == str(trace_file.parent)
+    assert cmd.attrs["exit_code"] == 0 and cmd.attrs["bytes"] == len("hello\n")
+    assert cmd.duration > 0 and parent.duration >= cmd.duration
+
+
+def test_propagate_and_errors(trace_file):
+    @tracing.traced("work", "n")
+    def work(n):
+        if n == 2:
+            raise ValueError("boom")
+        return n
+
+    def safe(n):
+        try:
+            return work(n)
+        except ValueError:
+            return None
+
+    with tracing.span("batch") as batch:
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            assert list(pool.map(tracing.propagate(safe), [1, 2])) == [1, None]
+    spans = {s.attrs.get("n"): s for s in tracing.read_spans(trace_file) if s.name == "work"}
+    assert {s.parent_id for s in spans.values()} == {batch.span_id}
+    assert "boom" in spans[2].attrs["error"]
+
+
+def test_disabled_tracer_writes_nothing(tmp_path, monkeypatch):
+    monkeypatch.setattr(tracing, "tracer", tracing.Tracer(None))
+    with tracing.span("quiet"):
+        utils.run_cmd([sys.executable, "-c", "pass"])
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_chrome_trace_conversion(trace_file, tmp_path):
+    with tracing.span("refresh.fetch", repo="o/r"):
+        pass
+    output = tmp_path / "chrome.json"
+    assert tracing.main([str(trace_file), "-o", str(output)]) == 0
+    events = json.loads(output.read_text())["traceEvents"]
+    complete = [e for e in events if e["ph"] == "X"]
+    assert complete[0]["name"] == "refresh.fetch" and complete[0]["cat"] == "refresh"
+    assert complete[0]["args"]["repo"] == "o/r"
+    assert any(e["ph"] == "M" and e["args"]["name"] == "MainThread" for e in events)
@@ -18,13 +18,12 @@ async def test_full_ui_flow(tmp_path, monkeypatch):
     home.mkdir()
     monkeypatch.setattr(Path, "home", lambda: home)
 
-    repo_path = home / ".cache" / "gh_pr_manager" / "org/repo1"
     calls: list[tuple[list[str], str | None]] = []
 
     def fake_run(cmd, cwd=None):
         calls.append((cmd, cwd))
-        if cmd[:4] == ["git", "-C", str(repo_path), "for-each-ref"]:
-            return True, "origin/main\norigin/feature\n"
+        if "ls-remote" in cmd:
+            return True, "a1\trefs/heads/main\nb2\trefs/heads/feature\n"
         return True, ""
 
     monkeypatch.setattr(utils, "run_cmd", fake_run)
@@ -36,8 +35,8 @@ async def test_full_ui_flow(tmp_path, monkeypatch):
         pilot.app.on_owner_selected("org")
         await pilot.pause()
         pilot.app.on_repo_selected("org/repo1")
-        await pilot.pause()
-        assert pilot.app.query_one(BranchSelector)
+        await pilot.pause(0.2)
+        assert pilot.app.query_one(BranchSelector).branches == ["feature", "main"]
 
-    # first call should clone since repo doesn't exist
-    assert ["gh", "repo", "clone", "org/repo1", str(repo_path)] in [c[0] for c in calls]
+    # branches are listed from the remote; nothing is cloned up front
+    assert not any(c[0][:3] == ["gh", "repo", "clone"] for c in calls)
@@ -0,0 +1,75 @@
+import asyncio
+import sys
+import time
+
+import pytest
+
+from gh_pr_manager import utils
+
+
+@pytest.mark.asyncio
+async def test_run_cmd_async_success_and_failure():
+    ok, out = await utils.run_cmd_async([sys.executable, "-c", "print('hi')"])
+    assert ok and out.strip() == "hi"
+
+    ok, out = await utils.run_cmd_async(
+        [sys.executable, "-c", "import sys; sys.stderr.write('boom'); sys.exit(3)"]
+    )
+    assert not ok and out == "boom"
+
+    ok, out = await utils.run_cmd_async(["definitely-not-a-real-command"])
+    assert not ok and "Command not found" in out
+
+
+@pytest.mark.asyncio
+async def test_run_cmd_async_timeout_kills_child():
+    start = time.monotonic()
+    ok, out = await utils.run_cmd_async(
+        [sys.executable, "-c", "import time; time.sleep(30)"], timeout=0.5
+    )
+    assert not ok
+    assert "timed out" in out
+    assert time.monotonic() - start < 10
+
+
+@pytest.mark.asyncio
+async def test_run_cmd_async_cancellation_propagates():
+    task = asyncio.create_task(
+        utils.run_cmd_async([sys.executable, "-c", "import time; time.sleep(30)"])
+    )
+    await asyncio.sleep(0.3)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+
+@pytest.mark.asyncio
+async def test_run_cmd_async_bounded_concurrency(monkeypatch):
+    monkeypatch.setattr(utils, "_semaphores", type(utils._semaphores)())
+    monkeypatch.setattr(utils, "MAX_CONCURRENT_CMDS", 2)
+    in_flight = 0
+    peak = 0
+    real_exec = asyncio.create_subprocess_exec
+
+    async def tracking_exec(*args, **kwargs):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        proc = await real_exec(*args, **kwargs)
+        real_wait = proc.communicate
+
+        async def communicate():
+            nonlocal in_flight
+            try:
+                return await real_wait()
+            finally:
+                in_flight -= 1
+
+        proc.communicate = communicate
+        return proc
+
+    monkeypatch.setattr(asyncio, "create_subprocess_exec", tracking_exec)
+    cmd = [sys.executable, "-c", "import time; time.sleep(0.2)"]
+    results = await asyncio.gather(*(utils.run_cmd_async(cmd) for _ in range(5)))
+    assert all(ok for ok, _ in results)
+    assert peak <= 2
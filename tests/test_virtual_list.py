@@ -0,0 +1,115 @@
+import pytest
+from textual.app import App
+
+from gh_pr_manager.main import BranchSelector
+from gh_pr_manager.virtual_list import VirtualList
+
+
+class _ListApp(App):
+    def __init__(self, multi_select=False):
+        super().__init__()
+        self.multi_select = multi_select
+        self.events = []
+
+    def compose(self):
+        yield VirtualList(multi_select=self.multi_select, id="vl")
+
+    def on_virtual_list_selected(self, event):
+        self.events.append(("selected", event.index))
+
+    def on_virtual_list_selection_changed(self, event):
+        self.events.append(("changed", event.selected))
+
+
+@pytest.mark.asyncio
+async def test_large_list_renders_without_widgets():
+    app = _ListApp()
+    async with app.run_test() as pilot:
+        vl = app.query_one(VirtualList)
+        vl.set_items(f"org/repo-{i}" for i in range(50_000))
+        vl.focus()
+        await pilot.pause()
+        assert len(vl.children) == 0
+        assert vl.virtual_size.height == 50_000
+        assert vl.render_line(0).text.startswith("org/repo-0")
+        await pilot.press("end")
+        assert vl.cursor == 49_999
+        assert vl.scroll_offset.y > 0
+        await pilot.press("up", "enter")
+        assert app.events == [("selected", 49_998)]
+
+
+@pytest.mark.asyncio
+async def test_multi_select_state_is_a_plain_array():
+    app = _ListApp(multi_select=True)
+    async with app.run_test() as pilot:
+        vl = app.query_one(VirtualList)
+        vl.set_items(["a", "b", "c"])
+        vl.focus()
+        await pilot.press("space", "down", "down", "space")
+        await pilot.pause()
+        assert vl.selected == [True, False, True]
+        assert app.events[-1] == ("changed", [0, 2])
+        vl.append_items(["d"])
+        assert vl.selected == [True, False, True, False]
+
+
+@pytest.mark.asyncio
+async def test_branch_selector_tracks_selection():
+    branches = [f"feature/{i}" for i in range(20_000)]
+
+    class _BranchApp(App):
+        def compose(self):
+            yield BranchSelector("org/repo", branches, on_back=lambda: None)
+
+    app = _BranchApp()
+    async with app.run_test() as pilot:
+        selector = app.query_one(BranchSelector)
+        vl = app.query_one("#branch_listview", VirtualList)
+        assert len(vl) == 20_000
+        assert app.query_one("#delete_branch").disabled
+        vl.set_selected(3, True)
+        await pilot.pause()
+        assert selector.selected_branches == {"feature/3"}
+        assert not app.query_one("#delete_branch").disabled
+
+
+def test_diff_keys_reports_inserts_removes_and_moves():
+    from gh_pr_manager.virtual_list import diff_keys
+
+    assert diff_keys(["a", "b", "c"], ["a", "b", "c"]) == []
+    assert diff_keys(["a", "b", "c"], ["a", "c"]) == [("remove", "b", 1)]
+    assert diff_keys(["a", "c"], ["a", "b", "c"]) == [("insert", "b", 1)]
+    assert diff_keys(["a", "b", "c"], ["c", "a", "b"]) == [("move", "c", 2, 0)]
+
+
+@pytest.mark.asyncio
+async def test_reconcile_keeps_cursor_and_selection_by_key():
+    app = _ListApp(multi_select=True)
+    async with app.run_test() as pilot:
+        vl = app.query_one(VirtualList)
+        branches = [f"b{i}" for i in range(10_000)]
+        vl.set_items(branches)
+        vl.move_cursor(5000)
+        vl.set_selected(7000, True)
+        await pilot.pause()
+        refreshed = []
+        vl.refresh_lines = lambda start, count=1: refreshed.append((start, count))
+        ops = vl.reconcile([b for b in branches if b != "b10"])
+        assert ops == [("remove", "b10", 10)]
+        assert vl.keys[vl.cursor] == "b5000"
+        assert vl.selected_indices == [6999]
+        assert refreshed == [(10, 9_990)]
+
+
+@pytest.mark.asyncio
+async def test_select_keys_notifies_once():
+    app = _ListApp(multi_select=True)
+    async with app.run_test() as pilot:
+        vl = app.query_one(VirtualList)
+        vl.set_items(f"b{i}" for i in range(20_000))
+        vl.select_keys(f"b{i}" for i in range(0, 20_000, 2))
+        vl.select_keys(f"b{i}" for i in range(0, 20_000, 2))
+        await pilot.pause()
+        assert len(vl.selected_indices) == 10_000
+        assert len(app.events) == 1